@@ -2,11 +2,19 @@ from functools import lru_cache
 
 from github import Github, GithubIntegration, Auth
 from github.GithubException import GithubException, UnknownObjectException
+from urllib3.util.retry import Retry
 
 import logging
 
+from .transport import install_transport
+
 logger = logging.getLogger(__name__)
 
+# Rate-limited responses (403/429) are retried by the scheduler (see rate_limit) outside its
+# concurrency slots.  PyGithub's default GithubRetry would retry and sleep on them inside a
+# slot as well, so the session only retries server errors.
+_RETRY = Retry(total=3, backoff_factor=1, status_forcelist=(500, 502, 503, 504), raise_on_status=False)
+
 
 # https://github.com/PyGithub/PyGithub/blob/main/doc/examples/Authentication.rst
 # https://docs.github.com/en/apps/creating-github-apps/authenticating-with-a-github-app/about-authentication-with-a-github-app
@@ -15,7 +23,7 @@ def __get_app_auth__(api_url: str, app_id: int, private_key: str) -> GithubInteg
     if not isinstance(app_id, str) or not isinstance(private_key, str):
         raise TypeError("app_id and private_key must be provided when attempting to authenticate as an installed app")
     auth = Auth.AppAuth(app_id=app_id, private_key=private_key)
-    return GithubIntegration(auth=auth, base_url=api_url)
+    return GithubIntegration(auth=auth, base_url=api_url, retry=_RETRY)
 
 
 def __run_as_installed_app__(api_url: str, app_id: int, private_key: str, owner: str) -> tuple[Github, dict]:
@@ -46,11 +54,12 @@ def get_github_client(
     **kwargs,
 ) -> tuple[Github, dict, str | None]:
     """Returns an instantiated interface with the GitHub API"""
+    install_transport()
     if token is None:
         return __run_as_installed_app__(api_url, app_id, private_key, owner)
     else:
         auth = Auth.Token(token)
-        return Github(auth=auth, base_url=api_url), {}, None
+        return Github(auth=auth, base_url=api_url, retry=_RETRY), {}, None
 
 
 __all__ = ["get_github_client", "GithubException", "UnknownObjectException"]
@@ -3,8 +3,10 @@ from typing import Any
 
 from actions_toolkit import core as actions_toolkit
 
+from github.Branch import Branch
 from github.Consts import mediaTypeRequireMultipleApprovingReviews
 from github.GithubException import GithubException
+from github.GithubException import UnknownObjectException
 from github.GithubObject import NotSet
 from github.Repository import Repository
 
@@ -13,6 +15,9 @@ from repo_manager.schemas.branch_protection import ProtectionOptions
 from repo_manager.utils import attr_to_kwarg
 from repo_manager.utils import objary_to_list
 
+from .object_store import get_object_store
+from .snapshot import get_snapshot
+
 
 def __diff_option__(key: str, expected: Any, repo_value: Any) -> str | None:
     if expected is not None:
@@ -21,6 +26,36 @@ def __diff_option__(key: str, expected: Any, repo_value: Any) -> str | None:
     return None
 
 
+def __get_branches__(repo: Repository, names: list[str]) -> dict[str, Branch]:
+    """Get only the named branches, from the snapshot when it has them; missing branches are left out"""
+    store = get_object_store()
+    snapshot = get_snapshot(repo)
+    if snapshot is not None and snapshot.branches is not None and set(names) <= snapshot.branches.keys():
+        found = {name: snapshot.branches[name] for name in names}
+    else:
+        found = {}
+        for name in names:
+            try:
+                found[name] = repo.get_branch(name)
+            except UnknownObjectException:
+                found[name] = None
+    for name, branch in found.items():
+        store.put(repo, "branch", name, branch)
+    return {name: branch for name, branch in found.items() if branch is not None}
+
+
+def __get_protection__(repo: Repository, branch: Branch):
+    snapshot = get_snapshot(repo)
+    if snapshot is not None and snapshot.branch_protections is not None and branch.name in snapshot.branch_protections:
+        return snapshot.branch_protections[branch.name]
+    return branch.get_protection()
+
+
+def __get_branch__(repo: Repository, name: str) -> Branch:
+    """The branch object read during the check, so updates do not fetch it again"""
+    return get_object_store().get(repo, "branch", name, lambda: repo.get_branch(name))
+
+
 def __update_branch_protection__(repo: Repository, branch: str, protection_config: ProtectionOptions):  # noqa: C901
     # Copied from https://github.com/PyGithub/PyGithub/blob/001970d4a828017f704f6744a5775b4207a6523c/github/Branch.py#L112
     # Until pygithub supports this, we need to do it manually
@@ -175,7 +210,7 @@ def __update_branch_protection__(repo: Repository, branch: str, protection_confi
             input=post_parameters,
         )
 
-    this_branch = repo.get_branch(branch)
+    this_branch = __get_branch__(repo, branch)
     kwargs = {}
     status_check_kwargs = {}
     extra_kwargs = {}
@@ -258,6 +293,7 @@ def __update_branch_protection__(repo: Repository, branch: str, protection_confi
     )
 
     try:
+        get_object_store().invalidate(repo, "branch", branch)
         edit_protection(branch=this_branch, **kwargs, **extra_kwargs)
     except GithubException as exc:
         raise ValueError(f"{exc.data['message']} {exc.data['documentation_url']}")
@@ -287,7 +323,7 @@ def check_repo_branch_protections(
         secrets (List[Secret]): [description]
 
     """
-    repo_branches = {branch.name: branch for branch in repo.get_branches()}
+    repo_branches = __get_branches__(repo, [config_bp.name for config_bp in config_branch_protections])
 
     missing_protections = []
     extra_protections = []
@@ -311,7 +347,7 @@ def check_repo_branch_protections(
             continue
 
         try:
-            this_protection = repo_bp.get_protection()
+            this_protection = __get_protection__(repo, repo_bp)
         except Exception as exc:
             actions_toolkit.info(f"Repo {repo.full_name} does not currently have any branch protections defined?")
             actions_toolkit.info(f"error: {exc}")
@@ -502,7 +538,8 @@ def update_branch_protections(
             try:
                 if issue_type == "extra":
                     # remove branch protection
-                    this_branch = repo.get_branch(branch_name)
+                    this_branch = __get_branch__(repo, branch_name)
+                    get_object_store().invalidate(repo, "branch", branch_name)
                     this_branch.remove_protection()
                 else:
                     # update or create branch protection
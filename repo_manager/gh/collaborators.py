@@ -3,20 +3,15 @@ from actions_toolkit import core as actions_toolkit
 
 from github.Repository import Repository
 
-from repo_manager.utils import get_organization
 from repo_manager.schemas.collaborator import Collaborator
 
+from .snapshot import get_snapshot
+from .team_index import get_team_index
 
-def _get_team(collaborator: Collaborator):
-    """Get a team object, handling nested teams if parent_team_slug is set."""
-    org = get_organization()
-    if collaborator.parent_team_slug:
-        parent = org.get_team_by_slug(collaborator.parent_team_slug)
-        for child in parent.get_teams():
-            if child.slug == collaborator.name:
-                return child
-        raise ValueError(f"Child team '{collaborator.name}' not found under parent '{collaborator.parent_team_slug}'")
-    return org.get_team_by_slug(collaborator.name)
+
+def _get_team(repo: Repository, collaborator: Collaborator):
+    """Get a team object from the repo's org, handling nested teams if parent_team_slug is set."""
+    return get_team_index().get_team(repo.owner.login, collaborator.name, collaborator.parent_team_slug)
 
 
 def diff_option(key: str, expected: Any, repo_value: Any) -> str | None:
@@ -55,7 +50,11 @@ def check_collaborators(
             collaborators,
         )
     }
-    repo_collab_users = repo.get_collaborators()
+    snapshot = get_snapshot(repo)
+    if snapshot is not None and snapshot.collaborators is not None:
+        repo_collab_users = snapshot.collaborators
+    else:
+        repo_collab_users = repo.get_collaborators()
     repo_collab_teams = repo.get_teams()  # __get_teams__(repo)
     repo_collab_usernames = {collaborator.login for collaborator in repo_collab_users}
     repo_collab_teamnames = {collaborator.slug for collaborator in repo_collab_teams}
@@ -175,13 +174,13 @@ def update_collaborators(
             if collaborator.type == "User":
                 repo.add_to_collaborators(collaborator.name, collaborator.permission)
             elif collaborator.type == "Team":
-                _get_team(collaborator).update_team_repository(repo, collaborator.permission)
+                _get_team(repo, collaborator).update_team_repository(repo, collaborator.permission)
             actions_toolkit.info(f"Added collaborator {collaborator.name} with permission {collaborator.permission}.")
         elif diff_type == "extra":
             if collaborator.type == "User":
                 repo.remove_from_collaborators(collaborator.name)
             elif collaborator.type == "Team":
-                _get_team(collaborator).remove_from_repos(repo)
+                _get_team(repo, collaborator).remove_from_repos(repo)
             else:
                 raise Exception(f"Modifying collaborators of type {collaborator.type} not currently supported")
             actions_toolkit.info(f"Removed collaborator {collaborator.name}.")
@@ -189,7 +188,7 @@ def update_collaborators(
             if collaborator.type == "User":
                 repo.add_to_collaborators(collaborator.name, collaborator.permission)
             elif collaborator.type == "Team":
-                _get_team(collaborator).update_team_repository(repo, collaborator.permission)
+                _get_team(repo, collaborator).update_team_repository(repo, collaborator.permission)
             else:
                 raise Exception(f"Modifying collaborators of type {collaborator.type} not currently supported")
             actions_toolkit.info(f"Updated collaborator {collaborator.name} with permission {collaborator.permission}.")
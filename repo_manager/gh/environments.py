@@ -1,4 +1,5 @@
 import json
+from functools import partial
 from typing import Any
 
 from actions_toolkit import core as actions_toolkit
@@ -11,11 +12,16 @@ from repo_manager.schemas.environment import (
     Reviewer,
     DeploymentBranchPolicy,
 )
+from repo_manager.schemas.secret import Secret
+from repo_manager.utils import get_parallelism
+from repo_manager.utils.concurrency import run_concurrently
 
 from .secrets import check_repo_secrets
 from .secrets import update_secrets
 from .variables import check_variables
 from .variables import update_variables
+from .object_store import get_object_store
+from .snapshot import get_snapshot
 
 
 def __get_environment_deployment_branch_policies(repo: Repository, environment: str) -> set[str]:
@@ -89,7 +95,9 @@ def create_environment(repo: Repository, env: Environment) -> bool:
 
 
 def check_environment_settings(repo: Repository, config_env: Environment) -> tuple[bool, dict[str, Any]]:
-    repo_env = repo.get_environment(config_env.name)
+    repo_env = get_object_store().get(
+        repo, "environment", config_env.name, lambda: repo.get_environment(config_env.name)
+    )
     repo_protection_rules_dict = {
         protection_rule.type: protection_rule for protection_rule in repo_env.protection_rules
     }
@@ -170,8 +178,15 @@ def check_branch_policies(repo: Repository, env: Environment) -> tuple[bool, dic
                 branch_patterns["extra"] = extra_patterns
         if len(branch_patterns) > 0:
             return False, branch_patterns
-    else:
-        return True, None
+    return True, None
+
+
+def __scoped__(items: list[Secret] | None, env_name: str) -> list[Secret] | None:
+    """An environment's secrets or variables, all addressed to that environment"""
+    if items is None:
+        return None
+    scope = f"environments/{env_name}"
+    return [item if item.type == scope else item.model_copy(update={"type": scope}) for item in items]
 
 
 def check_repo_environments(
@@ -187,15 +202,19 @@ def check_repo_environments(
         Tuple[bool, Optional[List[str]]]: [description]
     """
 
-    repo_environments = repo.get_environments()
-    try:
-        repo_environment_names = {environment.name for environment in repo_environments}
-    except GithubException as exc:
-        # GitHub throws 404 if there are no environments, 403 if the token lacks permission
-        if exc.status == 404:
-            repo_environment_names = set()
-        else:
-            raise exc
+    snapshot = get_snapshot(repo)
+    if snapshot is not None and snapshot.environment_names is not None:
+        repo_environment_names = snapshot.environment_names
+    else:
+        repo_environments = repo.get_environments()
+        try:
+            repo_environment_names = {environment.name for environment in repo_environments}
+        except GithubException as exc:
+            # GitHub throws 404 if there are no environments, 403 if the token lacks permission
+            if exc.status == 404:
+                repo_environment_names = set()
+            else:
+                raise exc
 
     expected_environment_names = {
         environment.name for environment in filter(lambda environment: environment.exists, environments)
@@ -215,26 +234,27 @@ def check_repo_environments(
 
     environments_to_check_values_on = list(expected_environment_names.intersection(repo_environment_names))
     config_env_dict = {environment.name: environment for environment in environments}
-    env_diffs = {}
+    # every check of every environment is independent, so they all run at once
+    to_check = []
     for env_name in environments_to_check_values_on:
         config_env = config_env_dict.get(env_name, None)
-        diffs_by_env = {}
-        check_result = True
-        for check, to_check in {
-            check_environment_settings: ("settings", config_env),
-            check_branch_policies: ("branch_policies", config_env),
-            check_repo_secrets: ("secrets", config_env.secrets),
-            check_variables: ("variables", config_env.variables),
-        }.items():
-            check_name, to_check = to_check
-            if to_check is not None:
-                this_check, this_diffs = check(repo, to_check)
-                check_result &= this_check
-                if this_diffs is not None:
-                    diffs_by_env[check_name] = this_diffs
-
-        if len(diffs_by_env) > 0:
-            env_diffs[env_name] = diffs_by_env
+        for check, check_name, config in (
+            (check_environment_settings, "settings", config_env),
+            (check_branch_policies, "branch_policies", config_env),
+            (check_repo_secrets, "secrets", __scoped__(config_env.secrets, env_name)),
+            (check_variables, "variables", __scoped__(config_env.variables, env_name)),
+        ):
+            if config is not None:
+                to_check.append((env_name, check_name, partial(check, repo, config)))
+    outcomes = run_concurrently([check for _, _, check in to_check], max_workers=get_parallelism())
+
+    env_diffs = {}
+    for (env_name, check_name, _), (outcome, exc) in zip(to_check, outcomes):
+        if exc is not None:
+            raise exc
+        _, this_diffs = outcome
+        if this_diffs is not None:
+            env_diffs.setdefault(env_name, {})[check_name] = this_diffs
 
     if len(env_diffs) > 0:
         diff["diff"] = env_diffs
@@ -279,7 +299,8 @@ def update_environments(repo: Repository, environments: list[Environment], diffs
                         kwargs["deployment_branch_policy"] = config_env_dict[
                             env_name
                         ].get_EnvironmentDeploymentBranchPolicyParams()
-                    repo.create_environment(**kwargs)
+                    get_object_store().invalidate(repo, "environment", env_name)
+                    get_object_store().put(repo, "environment", env_name, repo.create_environment(**kwargs))
                     components = ["secrets", "variables"]
                     for env_component in components:
                         if env_component == "secrets" and config_env_dict[env_name].secrets is not None:
@@ -287,7 +308,9 @@ def update_environments(repo: Repository, environments: list[Environment], diffs
                                 secret_diffs = {"missing": [secret.key for secret in config_env_dict[env_name].secrets]}
                             else:
                                 secret_diffs = diffs[issue_type][env_name][env_component]
-                            pErrors, pMessages = update_secrets(repo, config_env_dict[env_name].secrets, secret_diffs)
+                            pErrors, pMessages = update_secrets(
+                                repo, __scoped__(config_env_dict[env_name].secrets, env_name), secret_diffs
+                            )
                         elif env_component == "variables" and config_env_dict[env_name].variables is not None:
                             if issue_type == "missing":
                                 var_diffs = {
@@ -298,7 +321,7 @@ def update_environments(repo: Repository, environments: list[Environment], diffs
                             if var_diffs is not None:
                                 pErrors, pMessages = update_variables(
                                     repo,
-                                    config_env_dict[env_name].variables,
+                                    __scoped__(config_env_dict[env_name].variables, env_name),
                                     var_diffs,
                                 )
                     if len(pErrors) > 0:
@@ -307,6 +330,7 @@ def update_environments(repo: Repository, environments: list[Environment], diffs
                         actions_toolkit.info(f"Synced {env_component} for environment {env_name}")
                 elif issue_type == "extra":
                     try:
+                        get_object_store().invalidate(repo, "environment", env_name)
                         repo.delete_environment(env_name)
                         actions_toolkit.info(f"Deleted Deployment Environment {env_name}")
                     except GithubException as exc:
@@ -2,7 +2,12 @@ import sys
 import os
 import re
 import shutil
+import base64
+import hashlib
+import json
+import threading
 
+from functools import partial
 from pathlib import Path
 from typing import Any
 
@@ -14,21 +19,23 @@ from actions_toolkit import core as actions_toolkit
 from git.exc import GitCommandError
 
 from github.GithubException import GithubException
+from github.InputGitTreeElement import InputGitTreeElement
+from github.PullRequest import PullRequest
 from github.Repository import Repository
 
 from repo_manager.schemas.file import BranchFiles, FileConfig
-from repo_manager.utils import get_inputs
+from repo_manager.utils import get_inputs, get_parallelism
+from repo_manager.utils.concurrency import run_concurrently
 from repo_manager.utils.markdown import generate
 
+from .git_data import blob_sha, file_blob_sha, get_ref, get_tree_index, line_stats, read_blob, tree_path
+from .object_store import get_object_store
+
 # Marker embedded in sync commit messages so we can detect already-synced source SHAs
 _SYNC_SHA_MARKER = "synced-from-sha"
 _SYNC_SHA_RE = re.compile(rf"\[{_SYNC_SHA_MARKER}:([a-f0-9]+)\]")
 
 
-commitChanges: Commit = None
-commitCleanup: Commit = None
-
-
 def _safe_path(base: Path, relative: Path) -> Path:
     """Resolve ``base / relative`` and raise ValueError if it escapes ``base``.
 
@@ -116,11 +123,85 @@ def __aggregate_git_diff_multiple_commits__(
     return diff
 
 
-def __clone_repo__(repo: Repository, branch: str) -> Repo:
-    """Clone a repository to the local filesystem"""
+def __sparse_paths__(branches: list[BranchFiles]) -> list[str]:
+    """Sparse-checkout patterns for every repo path the file configs read or write"""
+    paths = set()
+    for branch in branches:
+        for file_config in branch.files or []:
+            candidates = [file_config.dest_file]
+            if file_config.remote_src and file_config.src_file is not None:
+                candidates.append(file_config.src_file)
+            for candidate in candidates:
+                if candidate is not None:
+                    path = os.path.normpath(str(candidate)).replace(os.sep, "/").lstrip("/")
+                    # anchored and escaped, so "README.md" does not also match every nested README.md
+                    paths.add("/" + re.sub(r"([*?\[\]\\!#])", r"\\\1", path))
+    return sorted(paths)
+
+
+def __local_repo_path__(repo: Repository) -> tuple[Path, bool]:
+    """Where the target repo is cloned, and whether the clone is a mirror kept between runs (in cache_dir)"""
+    inputs = get_inputs()
+    if inputs.get("cache_dir"):
+        return Path(inputs["cache_dir"]) / "git" / repo.owner.login / repo.name, True
+    return Path(inputs["workspace_path"]) / repo.owner.login / repo.name, False
+
 
+def __git_auth_env__() -> dict[str, str]:
+    """Credentials for git as an http.extraheader passed through the environment.
+
+    Unlike credentials in the remote URL, this keeps the token out of .git/config, which
+    matters for the mirror saved to cache_dir.
+    """
     inputs = get_inputs()
-    repo_dir = Path(inputs["workspace_path"]) / repo.name
+    basic = base64.b64encode(f"{inputs['username']}:{inputs['token']}".encode()).decode()
+    return {
+        "GIT_CONFIG_COUNT": "1",
+        "GIT_CONFIG_KEY_0": "http.extraheader",
+        "GIT_CONFIG_VALUE_0": f"AUTHORIZATION: basic {basic}",
+    }
+
+
+def __open_local_repo__(path: Path) -> Repo:
+    local_repo = Repo(path)
+    local_repo.git.update_environment(**__git_auth_env__())
+    return local_repo
+
+
+def __refresh_mirror__(local_repo: Repo, branch: str, paths: list[str]) -> Repo:
+    """Fetch what changed since the last run and reset the mirror to a clean ``branch``"""
+    __remove_worktrees__(local_repo)
+    if paths:
+        local_repo.git.sparse_checkout("set", "--no-cone", *paths)
+    # full history (without blobs): sync markers can be in any earlier commit
+    unshallow = ["--unshallow"] if (Path(local_repo.git_dir) / "shallow").exists() else []
+    local_repo.git.fetch("--filter=blob:none", *unshallow, "--prune", "origin")
+    local_repo.git.checkout("-f", "-B", branch, f"origin/{branch}")
+    local_repo.git.clean("-fd")
+    # sync branches left over from the last run are recreated from origin
+    for head in local_repo.heads:
+        if head.name != branch:
+            local_repo.delete_head(head, force=True)
+    return local_repo
+
+
+def __clone_repo__(repo: Repository, branch: str, paths: list[str] | None = None) -> Repo:
+    """Clone a repository to the local filesystem.
+
+    The clone is partial (``--filter=blob:none``) and, when ``paths`` are given, sparse, so
+    only the blobs of the synced files are downloaded; the full commit history is kept so
+    that sync markers in older commits are still found.  With ``cache_dir`` set,
+    the clone is kept there and only fetched incrementally on the next run.
+    """
+
+    paths = paths or []
+    repo_dir, reusable = __local_repo_path__(repo)
+    if reusable and (repo_dir / ".git").is_dir():
+        actions_toolkit.info(f"Fetching {repo.full_name} into cached clone {repo_dir}")
+        try:
+            return __refresh_mirror__(__open_local_repo__(repo_dir), branch, paths)
+        except GitCommandError as exc:
+            actions_toolkit.warning(f"Unable to reuse cached clone of {repo.full_name}, cloning again: {exc}")
     if repo_dir.is_dir():
         actions_toolkit.debug(f"Directory {repo_dir} already exists, removing before clone")
         shutil.rmtree(repo_dir)
@@ -128,10 +209,20 @@ def __clone_repo__(repo: Repository, branch: str) -> Repo:
     # https://docs.github.com/en/apps/creating-github-apps/authenticating-with-a-github-app/authenticating-as-a-github-app-installation#about-authentication-as-a-github-app-installation
     try:
         cloned_repo = Repo.clone_from(
-            repo.clone_url.replace("https://", f"https://{inputs['username']}:{inputs['token']}@"),
+            repo.clone_url,
             str(repo_dir),
             branch=branch,
+            env=__git_auth_env__(),
+            multi_options=[
+                "--filter=blob:none",
+                # sync branches from earlier runs must be visible as origin/<name>
+                "--no-single-branch",
+                "--sparse",
+            ],
         )
+        cloned_repo.git.update_environment(**__git_auth_env__())
+        if paths:
+            cloned_repo.git.sparse_checkout("set", "--no-cone", *paths)
     except GitCommandError as exc:
         if "did not match any file" in str(exc) or "Remote branch" in str(exc) or "empty" in str(exc).lower():
             actions_toolkit.warning(
@@ -144,24 +235,249 @@ def __clone_repo__(repo: Repository, branch: str) -> Repo:
     return cloned_repo
 
 
+class SourceShaResolver:
+    """Last commit touching each source file, resolved for many files in one ``git log``.
+
+    Results are memoized for the whole run, so every branch and target repo syncing the
+    same workspace files shares them, and each source repository is opened once.  Paths
+    queued with ``expect`` are resolved together on the first ``get``, so a run in which no
+    file differs never walks the source history at all.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._repos: dict[Path, Repo | None] = {}  # directory -> repository containing it
+        self._shas: dict[Path, str | None] = {}
+        self._expected: set[Path] = set()
+
+    def expect(self, paths: list[str | Path]) -> None:
+        with self._lock:
+            self._expected.update(Path(p).resolve() for p in paths)
+
+    def _repo_for(self, path: Path) -> Repo | None:
+        directory = path.parent
+        if directory not in self._repos:
+            try:
+                self._repos[directory] = Repo(directory, search_parent_directories=True)
+            except Exception:
+                self._repos[directory] = None
+        return self._repos[directory]
+
+    def resolve(self, paths: list[str | Path]) -> None:
+        """Resolve every path not resolved yet, with one history walk per source repository"""
+        with self._lock:
+            by_repo: dict[str, tuple[Repo, dict[str, Path]]] = {}
+            for path in {Path(p).resolve() for p in paths} - self._shas.keys():
+                source_repo = self._repo_for(path)
+                self._shas[path] = None
+                if source_repo is None:
+                    continue
+                root = Path(source_repo.working_tree_dir).resolve()
+                if not path.is_relative_to(root):
+                    continue
+                by_repo.setdefault(str(root), (source_repo, {}))[1][path.relative_to(root).as_posix()] = path
+            for source_repo, pending in by_repo.values():
+                try:
+                    log = source_repo.git.log(
+                        "--format=%x00%H",
+                        "--name-only",
+                        "--",
+                        *(f":(literal){relative}" for relative in pending),
+                        env={
+                            "GIT_CONFIG_COUNT": "1",
+                            "GIT_CONFIG_KEY_0": "core.quotePath",
+                            "GIT_CONFIG_VALUE_0": "false",
+                        },
+                    )
+                except GitCommandError as exc:
+                    actions_toolkit.debug(f"Unable to read source history: {exc}")
+                    continue
+                commit = None
+                # newest first, so the first commit listing a path is the last one that touched it
+                for line in log.splitlines():
+                    if line.startswith("\x00"):
+                        commit = line[1:]
+                    elif line in pending:
+                        self._shas[pending.pop(line)] = commit
+                        if not pending:
+                            break
+
+    def get(self, path: str | Path) -> str | None:
+        with self._lock:
+            expected, self._expected = self._expected, set()
+        self.resolve([path, *expected])
+        with self._lock:
+            return self._shas.get(Path(path).resolve())
+
+
+_source_sha_resolver = SourceShaResolver()
+
+
 def __get_source_file_sha__(src_path: str | Path) -> str | None:
     """Return the last commit SHA that touched src_path in its own git repo (the runner workspace).
     Returns None if the path is not tracked or the repo cannot be found."""
     try:
-        src_path = Path(src_path).resolve()
-        source_repo = Repo(src_path, search_parent_directories=True)
-        sha = source_repo.git.log("--format=%H", "-n", "1", "--", str(src_path))
-        return sha.strip() or None
+        return _source_sha_resolver.get(src_path)
     except Exception:
         return None
 
 
+def __resolve_target_branches__(repo: Repository, branches: list[BranchFiles]) -> list[BranchFiles]:
+    """Copies of ``branches`` targeting ``repo``'s default branch where none is configured.
+
+    The config is shared by every repository of a fleet, so it is never written to.
+    """
+    return [
+        branch if branch.target_branch is not None else branch.model_copy(update={"target_branch": repo.default_branch})
+        for branch in branches
+    ]
+
+
+def __expect_source_shas__(branches: list[BranchFiles]) -> None:
+    """Queue every local source file of every branch, so they are resolved in one pass when first needed"""
+    _source_sha_resolver.expect(
+        [
+            __local_source_path__(file_config)
+            for branch in branches
+            if not branch.skip
+            for file_config in branch.files or []
+            if file_config.exists and not file_config.remote_src
+        ]
+    )
+
+
+class SyncedShaIndex:
+    """Source SHAs recorded by sync commits, per destination branch.
+
+    The first lookup on a branch reads the sync markers of its whole history in one
+    ``git log``; later lookups only read the commits added since the indexed tip, so each
+    membership check is a set lookup.  With a cache directory, the index of every branch is
+    saved with the tip it was built for and resumed from there by the next run.
+    """
+
+    def __init__(self, cache_dir: Path | None = None):
+        self.cache_dir = cache_dir
+        self._lock = threading.Lock()
+        # (git dir, branch) -> (indexed tip, synced source SHAs)
+        self._indexes: dict[tuple[str, str], tuple[str, set[str]]] = {}
+
+    def _cache_path(self, dest_repo: Repo, branch: str) -> Path | None:
+        return self._origin_cache_path(dest_repo.remotes[0].url if dest_repo.remotes else dest_repo.git_dir, branch)
+
+    def _origin_cache_path(self, origin: str, branch: str) -> Path | None:
+        if self.cache_dir is None:
+            return None
+        key = hashlib.sha256(f"{origin}\n{branch}".encode()).hexdigest()
+        return Path(self.cache_dir) / "sync-index" / f"{key}.json"
+
+    def _load(self, path: Path | None) -> tuple[str, set[str]] | None:
+        if path is None:
+            return None
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+            return data["tip"], set(data["shas"])
+        except OSError, ValueError, KeyError:
+            return None
+
+    def _save(self, path: Path | None, tip: str, shas: set[str]) -> None:
+        if path is None:
+            return
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(".tmp")
+            tmp.write_text(json.dumps({"tip": tip, "shas": sorted(shas)}), encoding="utf-8")
+            os.replace(tmp, path)
+        except OSError as exc:
+            actions_toolkit.debug(f"Unable to save synced SHA index to {path}: {exc}")
+
+    @staticmethod
+    def _read_markers(dest_repo: Repo, revisions: str) -> set[str]:
+        return set(_SYNC_SHA_RE.findall(dest_repo.git.log(revisions, "--format=%B", "--")))
+
+    def _index(self, dest_repo: Repo, branch: str) -> set[str]:
+        tip = dest_repo.git.rev_parse(branch)
+        key = (dest_repo.git_dir, branch)
+        indexed = self._indexes.get(key)
+        cache_path = None
+        if indexed is None:
+            cache_path = self._cache_path(dest_repo, branch)
+            indexed = self._load(cache_path)
+        if indexed is not None and indexed[0] == tip:
+            self._indexes[key] = indexed
+            return indexed[1]
+
+        shas = None
+        if indexed is not None:
+            try:
+                dest_repo.git.merge_base("--is-ancestor", indexed[0], tip)
+                shas = indexed[1] | self._read_markers(dest_repo, f"{indexed[0]}..{tip}")
+            except GitCommandError:
+                pass  # history was rewritten (or the old tip is not in this clone): rebuild
+        if shas is None:
+            shas = self._read_markers(dest_repo, tip)
+        self._indexes[key] = (tip, shas)
+        self._save(cache_path or self._cache_path(dest_repo, branch), tip, shas)
+        return shas
+
+    def contains(self, dest_repo: Repo, branch: str, source_sha: str) -> bool:
+        with self._lock:
+            return source_sha in self._index(dest_repo, branch)
+
+    def _remote_index(self, repo: Repository, branch: str, tip: str) -> set[str]:
+        """``_index`` for the Git Data API engine: the markers are read from the commits API"""
+        key = (repo.clone_url, branch)
+        cache_path = self._origin_cache_path(repo.clone_url, branch)
+        indexed = self._indexes.get(key) or self._load(cache_path)
+        if indexed is not None and indexed[0] == tip:
+            self._indexes[key] = indexed
+            return indexed[1]
+
+        shas = None
+        if indexed is not None:
+            try:
+                comparison = repo.compare(indexed[0], tip)
+                if comparison.status in ("ahead", "identical"):
+                    shas = indexed[1] | {
+                        sha for commit in comparison.commits for sha in _SYNC_SHA_RE.findall(commit.commit.message)
+                    }
+            except GithubException:
+                pass  # history was rewritten (or the old tip is gone): rebuild
+        if shas is None:
+            shas = {sha for commit in repo.get_commits(sha=tip) for sha in _SYNC_SHA_RE.findall(commit.commit.message)}
+        self._indexes[key] = (tip, shas)
+        self._save(cache_path, tip, shas)
+        return shas
+
+    def contains_remote(self, repo: Repository, branch: str, tip: str, source_sha: str) -> bool:
+        with self._lock:
+            return source_sha in self._remote_index(repo, branch, tip)
+
+
+_synced_sha_index: SyncedShaIndex | None = None
+
+
+def __get_synced_sha_index__() -> SyncedShaIndex:
+    global _synced_sha_index
+    if _synced_sha_index is None:
+        cache_dir = get_inputs().get("cache_dir")
+        _synced_sha_index = SyncedShaIndex(Path(cache_dir) if cache_dir else None)
+    return _synced_sha_index
+
+
 def __has_source_sha_in_history__(dest_repo: Repo, branch: str, source_sha: str) -> bool:
     """Return True if any commit on *branch* in dest_repo has already recorded source_sha
     in its message (i.e. the file was synced from that source version before)."""
     try:
-        log = dest_repo.git.log(branch, "--format=%B", "--")
-        return f"[{_SYNC_SHA_MARKER}:{source_sha}]" in log
+        return __get_synced_sha_index__().contains(dest_repo, branch, source_sha)
+    except Exception:
+        return False
+
+
+def __has_source_sha_in_remote_history__(repo: Repository, branch: str, tip: str, source_sha: str) -> bool:
+    """``__has_source_sha_in_history__`` for a branch read through the API, at commit ``tip``"""
+    try:
+        return __get_synced_sha_index__().contains_remote(repo, branch, tip, source_sha)
     except Exception:
         return False
 
@@ -173,35 +489,47 @@ def __append_sync_sha__(commit_msg: str, source_sha: str | None) -> str:
     return commit_msg
 
 
-def __checkout_or_create_branch__(repo_dir: Repo, new_branch_name: str, base_branch: str) -> bool:
-    """Checkout an existing local/remote branch or create it from base_branch.
-    Returns True if the branch already existed (i.e. we may be updating a prior sync)."""
+def __worktrees_dir__(repo_dir: Repo) -> Path:
+    # inside .git, so worktrees never show up in (or get committed from) the main working tree
+    return Path(repo_dir.git_dir) / "repomgr-worktrees"
+
+
+def __remove_worktrees__(repo_dir: Repo) -> None:
+    shutil.rmtree(__worktrees_dir__(repo_dir), ignore_errors=True)
+    repo_dir.git.worktree("prune")
+
+
+def __close_worktrees__(worktrees: list[tuple[BranchFiles, Repo]]) -> None:
+    for _, worktree in worktrees:
+        worktree.close()
+
+
+def __add_sync_worktree__(repo_dir: Repo, new_branch_name: str, base_branch: str) -> tuple[Repo, bool]:
+    """Check out an existing local/remote sync branch, or create it from base_branch, in a worktree of its own.
+    Returns the worktree and True if the branch already existed (i.e. we may be updating a prior sync)."""
     local_branches = [h.name for h in repo_dir.heads]
     remote_refs = [r.name for r in repo_dir.remotes[0].refs] if repo_dir.remotes else []
+    path = __worktrees_dir__(repo_dir) / re.sub(r"[^\w.-]", "-", new_branch_name)
 
     remote_branch_ref = f"origin/{new_branch_name}"
     if new_branch_name in local_branches:
-        repo_dir.git.checkout(new_branch_name)
-        return True
+        repo_dir.git.worktree("add", str(path), new_branch_name)
+        existed = True
     elif remote_branch_ref in remote_refs:
-        repo_dir.git.checkout("-b", new_branch_name, "--track", remote_branch_ref)
-        return True
+        repo_dir.git.worktree("add", "--track", "-b", new_branch_name, str(path), remote_branch_ref)
+        existed = True
     else:
-        base = repo_dir.heads[base_branch] if base_branch in local_branches else repo_dir.create_head(base_branch)
-        new_branch = repo_dir.create_head(new_branch_name, base)
-        new_branch.checkout()
-        return False
-
-
-def __check_files__(
-    repo: Repo, commit_msg: str, files: list[FileConfig]
-) -> tuple[bool, dict[str, list[str] | dict[str, Any]]]:
-    """Check files in a repository"""
+        base = base_branch if base_branch in local_branches else f"origin/{base_branch}"
+        repo_dir.git.worktree("add", "--no-track", "-b", new_branch_name, str(path), base)
+        existed = False
+    worktree = Repo(path)
+    # same credentials, for the blobs a partial clone fetches on demand
+    worktree.git.update_environment(**repo_dir.git.environment())
+    return worktree, existed
 
-    # if no files are provided, return True
-    if files is None:
-        return True, None
 
+def __commit_messages__(commit_msg: str) -> tuple[str, str]:
+    """The (cleanup, update) commit messages derived from a BranchFiles commit_msg"""
     if re.search(r"\((\w+)\):", commit_msg):
         commitCleanupMsg = re.sub(r"\((\w+)\):", r"(\1-maint):", commit_msg)
         commitUpdateMsg = re.sub(r"\((\w+)\):", r"(\1-update):", commit_msg)
@@ -211,6 +539,27 @@ def __check_files__(
     else:
         commitCleanupMsg = f"chore:(maint): {commit_msg}"
         commitUpdateMsg = f"chore:(update): {commit_msg}"
+    return commitCleanupMsg, commitUpdateMsg
+
+
+def __local_source_path__(file_config: FileConfig) -> Path:
+    srcPath = file_config.src_file
+    if not Path(srcPath).is_absolute():
+        github_workspace = os.environ.get("GITHUB_WORKSPACE") or str(Path.cwd())
+        srcPath = Path(github_workspace) / srcPath
+    return Path(srcPath)
+
+
+def __check_files__(
+    repo: Repo, commit_msg: str, files: list[FileConfig]
+) -> tuple[bool, dict[str, list[str] | dict[str, Any]]]:
+    """Check files in a repository"""
+
+    # if no files are provided, return True
+    if files is None:
+        return True, None
+
+    commitCleanupMsg, commitUpdateMsg = __commit_messages__(commit_msg)
 
     diffs = {}
     extra = {}
@@ -277,13 +626,16 @@ def __check_files__(
                     actions_toolkit.info(f"Moved {str(oldPath)} to {str(newPath)}")
 
     # we commit these changes so that deleted files and renamed files are accounted for
-    global commitCleanup
-    repo.git.add("-A")
-    if repo.index.diff("HEAD") == []:
-        commitCleanup = None
-        actions_toolkit.debug("No files to delete or move")
+    # kept local so repositories can be checked from several threads
+    commitCleanup: Commit | None = None
+    if not (extra or missing or changed):
+        actions_toolkit.debug("No files to delete or move")  # nothing touched the working tree, no need for git
     else:
-        commitCleanup = repo.index.commit(commitCleanupMsg)
+        repo.git.add("-A")
+        if repo.index.diff("HEAD") == []:
+            actions_toolkit.debug("No files to delete or move")
+        else:
+            commitCleanup = repo.index.commit(commitCleanupMsg)
 
     # get the list of files that were re-organized
     if commitCleanup is not None:
@@ -308,15 +660,16 @@ def __check_files__(
                 for metric in d.keys():
                     changed[str(f)][metric] = d[metric]
 
-    # now we handle file content changes
+    # now we handle file content changes; identical files (same git blob hash) are left untouched
+    content_changes: dict[str, Files_TD] = {}
     for file_config in files:
         if not file_config.exists or file_config.remote_src:
             continue  # we already handled this file
-        srcPath = file_config.src_file
-        if not Path(srcPath).is_absolute():
-            github_workspace = os.environ.get("GITHUB_WORKSPACE") or str(Path.cwd())
-            srcPath = Path(github_workspace) / srcPath
+        srcPath = __local_source_path__(file_config)
         destPath = _safe_path(repo_root, file_config.dest_file)
+        if destPath.is_file() and file_blob_sha(srcPath) == file_blob_sha(destPath):
+            actions_toolkit.debug(f"Skipping {str(srcPath)} — identical to {str(destPath)}")
+            continue
 
         # Check if this source file's current commit SHA has already been synced into
         # this branch's history — if so, skip it (already up to date from source).
@@ -331,32 +684,42 @@ def __check_files__(
             source_shas.append(source_sha)
 
         if file_config.exists:
+            old_content = None
             if destPath.exists():
+                old_content = destPath.read_bytes()
                 os.remove(destPath)  # Delete the file
             else:
                 missing[str(file_config.dest_file)] = {"insertions": 0, "deletions": 0, "lines": 0}
             destPath.parent.mkdir(parents=True, exist_ok=True)  # Create the directory if it does not exist
             shutil.copyfile(srcPath, destPath)
             actions_toolkit.info(f"Copied {str(srcPath)} to {str(destPath)}")
+            # the same counts git reports in commit stats, computed here instead of by git
+            content_changes[str(file_config.dest_file)] = {
+                **line_stats(old_content, srcPath.read_bytes()),
+                "change_type": "A" if old_content is None else "M",
+            }
 
     # Embed collected source SHAs into the commit message so future runs can detect them
     if source_shas:
         sha_tags = " ".join(f"[{_SYNC_SHA_MARKER}:{sha}]" for sha in source_shas)
         commitUpdateMsg = f"{commitUpdateMsg} {sha_tags}"
 
-    # we commit the file updates (e.g. content changes)
-    global commitChanges
-    repo.git.add("-A")
-    if repo.index.diff("HEAD") == []:
-        commitChanges = None
+    # we commit the file updates (e.g. content changes); git is only run when something was copied
+    commitChanges: Commit | None = None
+    if not content_changes:
         actions_toolkit.debug("No files changed")
     else:
-        commitChanges = repo.index.commit(commitUpdateMsg)
+        repo.git.add("-A", "--", *content_changes.keys())
+        if repo.index.diff("HEAD") == []:  # e.g. only line endings differed and .gitattributes normalised them
+            content_changes = {}
+            actions_toolkit.debug("No files changed")
+        else:
+            commitChanges = repo.index.commit(commitUpdateMsg)
 
     # get the list of files that changed content
     if commitChanges is not None:
         actions_toolkit.info(f"File Change Commit SHA: {commitChanges.hexsha}")
-        commitChgs = {str(f): commitChanges.stats.files[f] for f in commitChanges.stats.files}
+        commitChgs = content_changes
         for f, v in commitChgs.items():
             if str(Path(f)) in missing.keys():
                 for m, c in v.items():
@@ -395,6 +758,199 @@ def __check_files__(
     return True, None
 
 
+def __sync_branch_name__(target_branch: str) -> str:
+    return f"repomgr/updates-to-{target_branch}"
+
+
+def __check_branch_via_api__(
+    repo: Repository, branch: BranchFiles
+) -> tuple[bool, dict[str, list[str] | dict[str, Any]] | None]:
+    """Compare one BranchFiles entry with the remote tree and plan the commit, without a clone.
+
+    The plan (changed tree entries, parent commit and message) is kept in the object store
+    for __update_branch_via_api__, so the apply does not read the tree again.
+    """
+    sync_branch = __sync_branch_name__(branch.target_branch)
+    sync_ref = get_ref(repo, sync_branch)
+    base_ref = sync_ref or get_ref(repo, branch.target_branch)
+    # the branch whose history the sync commit extends: the sync branch, or the target it starts from
+    base_branch = sync_branch if sync_ref is not None else branch.target_branch
+    if base_ref is None:
+        actions_toolkit.warning(
+            f"Skipping file sync for {repo.full_name}: repository is empty or branch "
+            f"'{branch.target_branch}' does not exist yet."
+        )
+        return True, None
+    if sync_ref is not None:
+        actions_toolkit.info(
+            f"Branch {sync_branch} already exists in {repo.full_name} — adding a new commit on top of it"
+        )
+    parent = repo.get_git_commit(base_ref.object.sha)
+    base_tree, index = get_tree_index(repo, parent.tree.sha)
+    commitCleanupMsg, commitUpdateMsg = __commit_messages__(branch.commit_msg)
+
+    extra, missing, changed = {}, {}, {}
+    # tree path -> (mode, blob sha, new content); a None sha and content deletes the path
+    entries: dict[str, tuple[str, str | None, bytes | None]] = {}
+    source_shas: list[str] = []
+
+    def current(path: str) -> str | None:
+        if path in entries:
+            return entries[path][1]
+        return index[path].sha if path in index else None
+
+    # file movement and removal first, as the git engine does
+    for file_config in branch.files:
+        if not file_config.exists:
+            candidates = [file_config.dest_file]
+            if file_config.remote_src and file_config.src_file is not None:
+                candidates.append(file_config.src_file)
+            path = next((p for p in map(tree_path, candidates) if p is not None), None)
+            if path is None:
+                actions_toolkit.warning(f"Skipping delete: no repo-internal delete target for {file_config.dest_file}")
+            elif current(path) is not None:
+                extra[path] = line_stats(read_blob(repo, current(path)), None)
+                entries[path] = (index[path].mode if path in index else "100644", None, None)
+                actions_toolkit.info(f"Deleting {path}")
+            else:
+                actions_toolkit.warning(
+                    f"{path} does not exist in {base_ref.ref} branch." + "Because this is a delete, not failing run"
+                )
+        elif file_config.remote_src:
+            src, dest = tree_path(file_config.src_file), tree_path(file_config.dest_file)
+            if src is None or dest is None:
+                raise ValueError(f"Path {file_config.src_file} or {file_config.dest_file} is outside the repo root")
+            if current(src) is None:
+                raise FileNotFoundError(f"File {file_config.src_file} does not exist in target repo")
+            if src == dest or current(dest) is not None:
+                continue  # already applied on this branch
+            mode = index[src].mode if src in index else "100644"
+            entries[dest] = (mode, current(src), None)
+            if file_config.move:
+                entries[src] = (mode, None, None)
+                changed[dest] = {"renamed": f"from {src}", "insertions": 0, "deletions": 0, "lines": 0}
+            else:
+                missing[dest] = line_stats(None, read_blob(repo, current(src)))
+
+    # then content from the workspace, compared by blob SHA
+    for file_config in branch.files:
+        if not file_config.exists or file_config.remote_src:
+            continue
+        srcPath = __local_source_path__(file_config)
+        dest = tree_path(file_config.dest_file)
+        if dest is None:
+            raise ValueError(f"Path {file_config.dest_file} is outside the repo root")
+        content = srcPath.read_bytes()
+        sha = blob_sha(content)
+        if current(dest) == sha:
+            continue
+        # as the git engine does: a source version already synced into this branch is not synced again
+        source_sha = __get_source_file_sha__(srcPath)
+        if source_sha and __has_source_sha_in_remote_history__(repo, base_branch, base_ref.object.sha, source_sha):
+            actions_toolkit.debug(
+                f"Skipping {str(srcPath)} — source SHA {source_sha[:12]} already present in branch history"
+            )
+            continue
+        if source_sha:
+            source_shas.append(source_sha)
+        if current(dest) is None:
+            missing[dest] = line_stats(None, content)
+        else:
+            stats = line_stats(read_blob(repo, current(dest)), content)
+            target = changed if dest not in missing else missing
+            target.setdefault(dest, {}).update(stats)
+        mode = index[dest].mode if dest in index else "100644"
+        entries[dest] = (mode, sha, content)
+
+    if not entries:
+        return True, None
+
+    has_content = any(content is not None for _, _, content in entries.values())
+    message = commitUpdateMsg if has_content else commitCleanupMsg
+    if source_shas:
+        message = f"{message} " + " ".join(f"[{_SYNC_SHA_MARKER}:{sha}]" for sha in source_shas)
+    plan = {
+        "parent": parent,
+        "base_tree": base_tree,
+        "sync_branch": sync_branch,
+        "sync_ref": sync_ref,
+        "entries": entries,
+        "message": message,
+    }
+    get_object_store().put(repo, "file-sync-plan", branch.target_branch, plan)
+
+    diffs = {}
+    if len(extra) > 0:
+        diffs["extra"] = extra
+    if len(missing) > 0:
+        diffs["missing"] = missing
+    if len(changed) > 0:
+        diffs["diff"] = changed
+    return False, diffs
+
+
+def __update_branch_via_api__(repo: Repository, branch: BranchFiles) -> tuple[str, str] | None:
+    """Write the planned changes as one commit on the sync branch; returns (commit sha, title)"""
+    known, plan = get_object_store().lookup(repo, "file-sync-plan", branch.target_branch)
+    if not known or plan is None:
+        __check_branch_via_api__(repo, branch)
+        known, plan = get_object_store().lookup(repo, "file-sync-plan", branch.target_branch)
+        if not known or plan is None:
+            return None
+
+    to_upload = [(path, content) for path, (_, _, content) in plan["entries"].items() if content is not None]
+    outcomes = run_concurrently(
+        [
+            lambda content=content: repo.create_git_blob(base64.b64encode(content).decode("ascii"), "base64")
+            for _, content in to_upload
+        ],
+        max_workers=get_parallelism(),
+    )
+    uploaded = {}
+    for (path, _), (blob, exc) in zip(to_upload, outcomes):
+        if exc is not None:
+            raise exc
+        uploaded[path] = blob.sha
+
+    tree = repo.create_git_tree(
+        [
+            InputGitTreeElement(path, mode, "blob", sha=uploaded.get(path, sha))
+            for path, (mode, sha, _) in plan["entries"].items()
+        ],
+        base_tree=plan["base_tree"],
+    )
+    commit = repo.create_git_commit(plan["message"], tree, [plan["parent"]])
+    get_object_store().invalidate(repo, "file-sync-plan", branch.target_branch)
+    if plan["sync_ref"] is not None:
+        # not forced: fails if the sync branch moved since the check
+        plan["sync_ref"].edit(commit.sha)
+    else:
+        repo.create_git_ref(f"refs/heads/{plan['sync_branch']}", commit.sha)
+    return commit.sha, plan["message"].splitlines()[0]
+
+
+def __open_or_update_pull__(
+    repo: Repository, branch: BranchFiles, diff: dict[str, Any], head_branch: str, title: str
+) -> PullRequest:
+    """Open the sync pull request, or refresh the body of the one already open for ``head_branch``"""
+    inputs = get_inputs()
+    body = generate({"files": {branch.target_branch: diff}}, {"files": []})
+    body += f"\n\nGenerated by [Repo Manager]({inputs['github_server_url']}/{os.getenv('GITHUB_REPOSITORY')}/actions/runs/{os.getenv('GITHUB_RUN_ID')})"
+
+    # Find an existing open PR for this sync branch rather than creating a duplicate
+    existing_prs = list(
+        repo.get_pulls(state="open", head=f"{repo.owner.login}:{head_branch}", base=branch.target_branch)
+    )
+    if existing_prs:
+        pr = existing_prs[0]
+        pr.edit(body=body)
+        actions_toolkit.info(f"Updated existing PR #{pr.number} for branch {head_branch} → {branch.target_branch}")
+    else:
+        pr = repo.create_pull(title=title, body=body, head=head_branch, base=branch.target_branch)
+        actions_toolkit.info(f"Created pull request for branch {head_branch} → {branch.target_branch}")
+    return pr
+
+
 def check_files(repo: Repository, branches: list[BranchFiles]) -> tuple[bool, dict[str, list[str] | dict[str, Any]]]:
     """Check files in a repository"""
 
@@ -403,46 +959,71 @@ def check_files(repo: Repository, branches: list[BranchFiles]) -> tuple[bool, di
         return True, None
 
     inputs = get_inputs()
+    branches = __resolve_target_branches__(repo, branches)
+    __expect_source_shas__(branches)
+    if inputs.get("file_sync_engine") == "api":
+        diffs = {}
+        for branch in branches:
+            if branch.skip:
+                actions_toolkit.info(f"Skipping file sync to branch {branch.target_branch}")
+                continue
+            success, diff = __check_branch_via_api__(repo, branch)
+            if not success:
+                diffs[branch.target_branch] = diff
+        if len(diffs) > 0:
+            return False, diffs
+        return True, None
+
     if inputs["repo"] == "self":
         repo_dir = Repo(".")
+        # Fetch latest remote state once so we can detect existing branches (a clone already has it)
+        if repo_dir.remotes:
+            repo_dir.remotes[0].fetch()
     else:
         # clone the repo
-        repo_dir = __clone_repo__(repo, repo.default_branch)
+        repo_dir = __clone_repo__(repo, repo.default_branch, __sparse_paths__(branches))
         if repo_dir is None:
             return True, None
 
+    # every sync branch gets a worktree of its own, so the branches are checked in parallel
+    __remove_worktrees__(repo_dir)
+    to_check = []
     diffs = {}
-    for branch in branches:
-        if branch.skip:
-            actions_toolkit.info(f"Skipping file sync to branch {branch.target_branch}")
-            continue
-
-        branch.target_branch = repo.default_branch if branch.target_branch is None else branch.target_branch
-        new_branch_name = f"repomgr/updates-to-{branch.target_branch}"
+    try:
+        for branch in branches:
+            if branch.skip:
+                actions_toolkit.info(f"Skipping file sync to branch {branch.target_branch}")
+                continue
 
-        # Fetch latest remote state so we can detect existing branches
-        if repo_dir.remotes:
-            repo_dir.remotes[0].fetch()
+            new_branch_name = __sync_branch_name__(branch.target_branch)
 
-        # Checkout the target base branch first (so we branch from the right place)
-        base_branch = branch.target_branch
-        if base_branch in [h.name for h in repo_dir.heads]:
-            repo_dir.git.checkout(base_branch)
-        elif f"origin/{base_branch}" in [r.name for r in repo_dir.remotes[0].refs]:
-            repo_dir.git.checkout("-b", base_branch, "--track", f"origin/{base_branch}")
-
-        # Checkout existing sync branch or create a new one from base
-        branch_existed = __checkout_or_create_branch__(repo_dir, new_branch_name, base_branch)
-        if branch_existed:
-            actions_toolkit.info(
-                f"Branch {new_branch_name} already exists in {repo.full_name} — "
-                "adding new commits on top of existing sync branch"
-            )
+            # Checkout existing sync branch or create a new one from base
+            worktree, branch_existed = __add_sync_worktree__(repo_dir, new_branch_name, branch.target_branch)
+            if branch_existed:
+                actions_toolkit.info(
+                    f"Branch {new_branch_name} already exists in {repo.full_name} — "
+                    "adding new commits on top of existing sync branch"
+                )
+            to_check.append((branch, worktree))
 
         # Check the files (will skip files whose source SHA is already in branch history)
-        success, diff = __check_files__(repo_dir, branch.commit_msg, branch.files)
-        if not success:
-            diffs[branch.target_branch] = diff
+        outcomes = run_concurrently(
+            [partial(__check_files__, worktree, branch.commit_msg, branch.files) for branch, worktree in to_check],
+            max_workers=get_parallelism(),
+        )
+        first_exc = next((exc for _, exc in outcomes if exc is not None), None)
+        if first_exc is not None:
+            raise first_exc
+        for (branch, _), (outcome, _) in zip(to_check, outcomes):
+            success, diff = outcome
+            if not success:
+                diffs[branch.target_branch] = diff
+    except Exception:
+        # a failed check leaves no worktree behind for the next run to trip over
+        __close_worktrees__(to_check)
+        __remove_worktrees__(repo_dir)
+        raise
+    __close_worktrees__(to_check)
 
     if len(diffs) > 0:
         return False, diffs
@@ -459,64 +1040,78 @@ def update_files(
     if not isinstance(diffs, (tuple, dict)):
         return errors, messages
     inputs = get_inputs()
+    branches = __resolve_target_branches__(repo, branches)
 
+    if inputs.get("file_sync_engine") == "api":
+        for branch in branches:
+            if branch.skip or branch.target_branch not in set(diffs.keys()):
+                continue
+            try:
+                written = __update_branch_via_api__(repo, branch)
+                if written is None:
+                    continue
+                sha, prTitle = written
+                actions_toolkit.info(
+                    f"Committed {sha} to {repo.full_name} branch {__sync_branch_name__(branch.target_branch)}"
+                )
+                pr = __open_or_update_pull__(
+                    repo, branch, diffs[branch.target_branch], __sync_branch_name__(branch.target_branch), prTitle
+                )
+                messages.append(f"PR @ {repo.full_name} - [#{pr.number} {prTitle}]({pr.html_url})\n\n")
+            except GithubException as exc:
+                errors.append({"type": "file-update", "key": branch.target_branch, "error": f"{exc}"})
+        return errors, messages
+
+    keep_clone = False
     if inputs["repo"] == "self":
         repo_dir = Repo.init(".")
     else:
-        repoPath = Path(inputs["workspace_path"]) / repo.name
+        repoPath, keep_clone = __local_repo_path__(repo)
         if not repoPath.exists:
             raise FileExistsError(f"Directory {repoPath} does not exist!")
         if not repoPath.is_dir():
             raise NotADirectoryError(f"{repoPath} is not a directory!")
-        repo_dir = Repo(repoPath)
+        repo_dir = __open_local_repo__(repoPath)
 
+    to_sync = []
     for branch in branches:
         if branch.skip:
             actions_toolkit.info(f"Skipping file sync to branch {branch.target_branch}")
             continue
         if branch.target_branch in set(diffs.keys()):
-            diff = diffs[branch.target_branch]
-            target_branch = f"repomgr/updates-to-{branch.target_branch}"
-            repo_dir.git.checkout(target_branch)
-            prTitle = repo_dir.active_branch.commit.message.splitlines()[0]
-
-            origin = repo_dir.remote()
-            pushInfo = origin.push(repo_dir.active_branch.name)
-
-            push_errors = [info for info in pushInfo if info.flags & info.ERROR]
-            if push_errors:
-                for info in push_errors:
-                    errors.append(
-                        {
-                            "type": "file-update",
-                            "key": info.local_ref.commit.hexsha,
-                            "error": f"{GithubException(info.ERROR, message=info.summary)}",
-                        }
-                    )
-            else:
-                actions_toolkit.info(f"Pushed changes to remote {repo.full_name} branch {repo_dir.active_branch.name}")
-                body = generate({"files": {branch.target_branch: diff}}, {"files": []})
-                body += f"\n\nGenerated by [Repo Manager]({inputs['github_server_url']}/{os.getenv('GITHUB_REPOSITORY')}/actions/runs/{os.getenv('GITHUB_RUN_ID')})"
-
-                # Find an existing open PR for this sync branch rather than creating a duplicate
-                existing_prs = list(
-                    repo.get_pulls(state="open", head=f"{repo.owner.login}:{target_branch}", base=branch.target_branch)
+            to_sync.append(branch)
+
+    # every sync branch was committed in its own worktree; they all go up in one push
+    sync_branches = [__sync_branch_name__(branch.target_branch) for branch in to_sync]
+    failed = set()
+    if sync_branches:
+        pushInfo = repo_dir.remote().push([f"refs/heads/{name}:refs/heads/{name}" for name in sync_branches])
+        for info in pushInfo:
+            if info.flags & info.ERROR:
+                failed.add(info.remote_ref_string.removeprefix("refs/heads/"))
+                errors.append(
+                    {
+                        "type": "file-update",
+                        "key": info.local_ref.commit.hexsha,
+                        "error": f"{GithubException(info.ERROR, message=info.summary)}",
+                    }
                 )
-                if existing_prs:
-                    pr = existing_prs[0]
-                    pr.edit(body=body)
-                    actions_toolkit.info(
-                        f"Updated existing PR #{pr.number} for branch {target_branch} → {branch.target_branch}"
-                    )
-                else:
-                    pr = repo.create_pull(title=prTitle, body=body, head=target_branch, base=branch.target_branch)
-                    actions_toolkit.info(f"Created pull request for branch {target_branch} → {branch.target_branch}")
 
-                messages.append(f"PR @ {repo.full_name} - [#{pr.number} {prTitle}]({pr.html_url})\n\n")
+    for branch, target_branch in zip(to_sync, sync_branches):
+        if target_branch in failed:
+            continue
+        diff = diffs[branch.target_branch]
+        prTitle = repo_dir.heads[target_branch].commit.message.splitlines()[0]
+        actions_toolkit.info(f"Pushed changes to remote {repo.full_name} branch {target_branch}")
+        pr = __open_or_update_pull__(repo, branch, diff, target_branch, prTitle)
+
+        messages.append(f"PR @ {repo.full_name} - [#{pr.number} {prTitle}]({pr.html_url})\n\n")
 
     dir = Path(repo_dir.working_tree_dir)
+    __remove_worktrees__(repo_dir)
     repo_dir.close()
-    if dir.exists() and sys.platform != "win32":
+    # the cached clone is reused (and fetched incrementally) by the next run
+    if dir.exists() and sys.platform != "win32" and not keep_clone:
         shutil.rmtree(dir)
 
     return errors, messages
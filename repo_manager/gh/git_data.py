@@ -0,0 +1,82 @@
+"""Git Data API helpers for syncing files without a local clone.
+
+A branch's whole file listing comes from one recursive tree fetch, and local files are
+compared by their git blob SHA, computed locally.  Writing a change takes one blob per
+changed file, one tree, one commit and one ref update.
+"""
+
+import base64
+import difflib
+import hashlib
+import os
+import posixpath
+from pathlib import Path
+
+from github.GithubException import UnknownObjectException
+from github.GitRef import GitRef
+from github.GitTree import GitTree
+from github.GitTreeElement import GitTreeElement
+from github.Repository import Repository
+
+
+def blob_sha(content: bytes) -> str:
+    """The SHA git gives a blob with this content (``git hash-object``)"""
+    return hashlib.sha1(b"blob %d\0" % len(content) + content, usedforsecurity=False).hexdigest()
+
+
+def file_blob_sha(path: Path | str, chunk_size: int = 1024 * 1024) -> str:
+    """``blob_sha`` of a file's content, read in chunks so large files are never loaded whole"""
+    digest = hashlib.sha1(b"blob %d\0" % os.path.getsize(path), usedforsecurity=False)
+    with open(path, "rb") as f:
+        while chunk := f.read(chunk_size):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def tree_path(path: Path | str) -> str | None:
+    """Normalise a repo-relative path to a tree path, or None if it escapes the repo root"""
+    normalised = posixpath.normpath(str(path).replace(os.sep, "/"))
+    if normalised.startswith("/") or normalised == ".." or normalised.startswith("../") or normalised == ".":
+        return None
+    return normalised
+
+
+def get_ref(repo: Repository, branch: str) -> GitRef | None:
+    try:
+        return repo.get_git_ref(f"heads/{branch}")
+    except UnknownObjectException:
+        return None
+
+
+def get_tree_index(repo: Repository, tree_sha: str) -> tuple[GitTree, dict[str, GitTreeElement]]:
+    """Fetch a whole tree in one request, indexed by path (blobs only)"""
+    tree = repo.get_git_tree(tree_sha, recursive=True)
+    if tree.truncated:
+        raise RuntimeError(
+            f"The tree of {repo.full_name} is too large for one recursive fetch; use file_sync_engine 'git'"
+        )
+    return tree, {element.path: element for element in tree.tree if element.type == "blob"}
+
+
+def read_blob(repo: Repository, sha: str) -> bytes:
+    blob = repo.get_git_blob(sha)
+    return base64.b64decode(blob.content) if blob.encoding == "base64" else blob.content.encode("utf-8")
+
+
+def line_stats(old: bytes | None, new: bytes | None) -> dict[str, int]:
+    """Line insertions/deletions between two versions, like ``git diff --numstat`` (0 for binary files)"""
+    try:
+        old_lines = (old or b"").decode("utf-8").splitlines()
+        new_lines = (new or b"").decode("utf-8").splitlines()
+    except UnicodeDecodeError:
+        return {"insertions": 0, "deletions": 0, "lines": 0}
+    insertions = deletions = 0
+    for tag, i1, i2, j1, j2 in difflib.SequenceMatcher(None, old_lines, new_lines, autojunk=False).get_opcodes():
+        if tag in ("replace", "delete"):
+            deletions += i2 - i1
+        if tag in ("replace", "insert"):
+            insertions += j2 - j1
+    return {"insertions": insertions, "deletions": deletions, "lines": insertions + deletions}
+
+
+__all__ = ["blob_sha", "file_blob_sha", "get_ref", "get_tree_index", "line_stats", "read_blob", "tree_path"]
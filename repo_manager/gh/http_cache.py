@@ -0,0 +1,169 @@
+"""On-disk conditional-request cache for GET responses from the GitHub REST API.
+
+Every cached response is stored with its ``ETag``/``Last-Modified`` validators.  The next
+time the same URL is requested by the same identity, the validators are sent as
+``If-None-Match``/``If-Modified-Since``; GitHub answers an unchanged resource with
+``304 Not Modified``, which does not count against the primary rate limit, and the body
+is served from disk.  Every request is still revalidated, so a cached body is never
+served for a resource that changed.
+
+Entries are evicted least-recently-used first once the cache grows past its size limit.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+# hop-by-hop or per-response headers that must not be replayed from the cache
+_SKIPPED_HEADERS = {"set-cookie", "content-encoding", "content-length", "transfer-encoding", "connection"}
+
+
+class HttpCache:
+    """Size-bounded, thread-safe cache of GET responses keyed by URL and auth identity.
+
+    Args:
+        directory: Where the entries are written; created if it does not exist
+        max_bytes: Entries are evicted (oldest use first) once their total size exceeds this
+        identity: Stable name for the credentials in use (never the token itself), so
+            responses fetched with one set of permissions are not revalidated with another
+    """
+
+    def __init__(self, directory: Path, max_bytes: int, identity: str):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.identity = identity
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._total_bytes: int | None = None  # computed on first write
+
+    def key(self, url: str, headers: dict[str, str]) -> str:
+        accept = next((v for k, v in headers.items() if k.lower() == "accept"), "")
+        return hashlib.sha256(f"{self.identity}\n{accept}\n{url}".encode()).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def lookup(self, key: str) -> dict[str, Any] | None:
+        """Return the stored entry for ``key``, or None when missing or unreadable"""
+        try:
+            with open(self._path(key), encoding="utf-8") as f:
+                return json.load(f)
+        except OSError, ValueError:
+            return None
+
+    @staticmethod
+    def conditional_headers(entry: dict[str, Any]) -> dict[str, str]:
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def replay(self, key: str, entry: dict[str, Any], not_modified: requests.Response) -> requests.Response:
+        """Build a 200 response from a stored entry after the server answered 304.
+
+        Headers from the 304 (rate limit counters, a refreshed ETag, ...) take precedence
+        over the stored ones.
+        """
+        with self._lock:
+            self.hits += 1
+        try:
+            os.utime(self._path(key))  # mark as recently used for eviction
+        except OSError:
+            pass
+        response = requests.Response()
+        response.status_code = 200
+        response.url = entry["url"]
+        response.encoding = "utf-8"
+        response._content = entry["body"].encode("utf-8")
+        response.headers = CaseInsensitiveDict(entry["headers"])
+        response.headers.update({k: v for k, v in not_modified.headers.items() if k.lower() not in _SKIPPED_HEADERS})
+        return response
+
+    def store(self, key: str, response: requests.Response) -> None:
+        """Record a miss and, when the response carries validators, write it to disk"""
+        with self._lock:
+            self.misses += 1
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if response.status_code != 200 or (etag is None and last_modified is None):
+            return
+        data = json.dumps(
+            {
+                "url": response.url,
+                "etag": etag,
+                "last_modified": last_modified,
+                "headers": {k: v for k, v in response.headers.items() if k.lower() not in _SKIPPED_HEADERS},
+                "body": response.text,
+            }
+        ).encode("utf-8")
+        path = self._path(key)
+        # write to a temp file first so concurrent readers never see a partial entry
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        with self._lock:
+            total = self._total()
+            try:
+                total -= path.stat().st_size
+            except OSError:
+                pass
+            os.replace(tmp, path)
+            self._total_bytes = total + len(data)
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+
+    def _total(self) -> int:
+        if self._total_bytes is None:
+            self._total_bytes = sum(p.stat().st_size for p in self.directory.glob("*.json"))
+        return self._total_bytes
+
+    def _evict(self) -> None:
+        """Delete least recently used entries until the cache is back under 90% of its limit"""
+        entries = sorted(self.directory.glob("*.json"), key=lambda p: p.stat().st_mtime)
+        for entry in entries:
+            if self._total_bytes <= self.max_bytes * 0.9:
+                break
+            try:
+                size = entry.stat().st_size
+                entry.unlink()
+            except OSError:
+                continue
+            self._total_bytes -= size
+            self.evictions += 1
+
+    def report(self) -> str:
+        requests_seen = self.hits + self.misses
+        rate = f"{self.hits / requests_seen:.0%}" if requests_seen else "n/a"
+        return (
+            f"HTTP cache: {self.hits} hits (304 Not Modified), {self.misses} misses, hit rate {rate}, "
+            f"{self.evictions} evicted, {self._total() / 1024 / 1024:.1f} MiB on disk"
+        )
+
+
+_http_cache: HttpCache | None = None
+
+
+def configure_http_cache(directory: str | Path, max_bytes: int, identity: str) -> HttpCache:
+    """Enable the cache for every GET sent through the transport from now on"""
+    global _http_cache
+    _http_cache = HttpCache(Path(directory) / "http", max_bytes, hashlib.sha256(identity.encode()).hexdigest())
+    return _http_cache
+
+
+def get_http_cache() -> HttpCache | None:
+    return _http_cache
+
+
+__all__ = ["HttpCache", "configure_http_cache", "get_http_cache"]
@@ -1,3 +1,4 @@
+from functools import partial
 from typing import Any
 
 from actions_toolkit import core as actions_toolkit
@@ -5,6 +6,11 @@ from github.Organization import Organization
 from github.Repository import Repository
 
 from repo_manager.schemas.label import Label
+from repo_manager.utils import get_parallelism
+from repo_manager.utils.concurrency import run_concurrently
+
+from .object_store import get_object_store
+from .snapshot import get_snapshot
 
 
 def _assert_not_org(target: Repository | Organization, operation: str) -> None:
@@ -21,13 +27,20 @@ def _assert_not_org(target: Repository | Organization, operation: str) -> None:
 
 def _label_exists(repo: Repository, name: str) -> bool:
     """Returns True if a label with the given name currently exists in the repo."""
+    known, label = get_object_store().lookup(repo, "label", name)
+    if known:
+        return label is not None
     try:
-        repo.get_label(name)
+        get_object_store().put(repo, "label", name, repo.get_label(name))
         return True
     except Exception:
         return False
 
 
+def __get_label__(repo: Repository, name: str):
+    return get_object_store().get(repo, "label", name, lambda: repo.get_label(name))
+
+
 def check_repo_labels(
     repo: Repository, config_labels: list[Label]
 ) -> tuple[bool, dict[str, list[str] | dict[str, Any]]]:
@@ -39,11 +52,13 @@ def check_repo_labels(
 
     """
     _assert_not_org(repo, "check")
-    repo_labels = {label.name: label for label in repo.get_labels()}
-    config_label_dict = {label.name: label for label in config_labels}
-    config_label_dict.update(
-        {label.expected_name: label for label in config_labels if label.expected_name != label.name}
-    )
+    snapshot = get_snapshot(repo)
+    found_labels = snapshot.labels if snapshot is not None and snapshot.labels is not None else repo.get_labels()
+    repo_labels = {label.name: label for label in found_labels}
+    get_object_store().put_all(repo, "label", repo_labels)
+    # a label's own name wins over another label's rename target (A->B while B->C)
+    config_label_dict = {label.expected_name: label for label in config_labels if label.expected_name != label.name}
+    config_label_dict.update({label.name: label for label in config_labels})
 
     diffs = {}
 
@@ -125,11 +140,66 @@ def check_repo_labels(
     return True, None
 
 
+def __delete_label__(repo: Repository, name: str) -> None:
+    store = get_object_store()
+    this_label = __get_label__(repo, name)
+    store.invalidate(repo, "label", name)
+    this_label.delete()
+    store.put(repo, "label", name, None)
+
+
+def __edit_label__(repo: Repository, name: str, config: Label) -> None:
+    store = get_object_store()
+    this_label = __get_label__(repo, name)
+    store.invalidate(repo, "label", name)
+    store.invalidate(repo, "label", config.expected_name)
+    this_label.edit(
+        config.expected_name,
+        this_label.color if config.color_no_hash is None else config.color_no_hash,
+        this_label.description if config.description is None else config.description,
+    )
+    # edit() refreshes the object from the response
+    if config.expected_name != name:
+        store.put(repo, "label", name, None)
+    store.put(repo, "label", config.expected_name, this_label)
+
+
+def __create_label__(repo: Repository, config: Label) -> None:
+    store = get_object_store()
+    store.invalidate(repo, "label", config.expected_name)
+    created = repo.create_label(
+        config.expected_name,
+        "ffffff" if config.color_no_hash is None else config.color_no_hash,
+        config.description if config.description is not None else config.expected_name,
+    )
+    store.put(repo, "label", config.expected_name, created)
+
+
+def __plan_rename__(repo: Repository, name: str, config: Label) -> tuple:
+    """The operation renaming label ``name``, planned against the labels as they are now"""
+    # When renaming a label to a name that already exists, GitHub's edit API
+    # errors with "already exists". In that case, drop the old label instead so
+    # the labels converge on the single existing target.
+    if _label_exists(repo, config.expected_name):
+        return (
+            "label-delete",
+            name,
+            partial(__delete_label__, repo, name),
+            f"Deleted label {name}; rename target {config.expected_name} already exists",
+        )
+    return ("label-update", name, partial(__edit_label__, repo, name, config), f"Updated label {name}")
+
+
 def update_labels(
     repo: Repository, labels: list[Label], diffs: tuple[dict[str, list[str] | dict[str, Any]]]
 ) -> tuple[set[str], set[str]]:
     """Updates a repo's labels to match the expected settings
 
+    The changes are applied in phases, each one ``parallelism`` labels at a time: deletes,
+    then edits, then renames in dependency order (a rename onto a name that still exists
+    deletes the old label instead), then creates, so no create or rename collides with a
+    name that is about to be freed.
+
     Args:
         repo (Repository): [description]
         labels (List[Label]): [description]
@@ -139,76 +209,62 @@ def update_labels(
     """
     _assert_not_org(repo, "update")
     errors = []
-    label_dict = {label.name: label for label in labels}
-    label_dict.update({label.expected_name: label for label in labels})
-    for issue_type in diffs.keys():
-        label_names = diffs[issue_type] if issue_type != "diff" else diffs[issue_type].keys()
-        for label_name in label_names:
-            if issue_type == "extra":
-                try:
-                    this_label = repo.get_label(label_name)
-                    this_label.delete()
-                    actions_toolkit.info(f"Deleted {label_name}")
-                except Exception as exc:  # this should be tighter
-                    errors.append({"type": "label-delete", "name": label_name, "error": f"{exc}"})
-            elif issue_type == "missing":
-                try:
-                    repo.create_label(
-                        label_dict[label_name].expected_name,
-                        "ffffff"
-                        if label_dict[label_name].color_no_hash is None
-                        else label_dict[label_name].color_no_hash,
-                        label_dict[label_name].description
-                        if label_dict[label_name].description is not None
-                        else label_dict[label_name].expected_name,
-                    )
-                    actions_toolkit.info(f"Created label {label_name}")
-                except Exception as exc:  # this should be tighter
-                    errors.append(
-                        {
-                            "type": "label-create",
-                            "name": label_name,
-                            "error": f"{exc}",
-                        }
-                    )
-            elif issue_type == "diff":
-                expected_name = label_dict[label_name].expected_name
-                # When renaming a label to a name that already exists, GitHub's edit API
-                # errors with "already exists". In that case, drop the old label instead so
-                # the labels converge on the single existing target.
-                if expected_name != label_name and _label_exists(repo, expected_name):
-                    try:
-                        repo.get_label(label_name).delete()
-                        actions_toolkit.info(
-                            f"Deleted label {label_name}; rename target {expected_name} already exists"
-                        )
-                    except Exception as exc:  # this should be tighter
-                        errors.append(
-                            {
-                                "type": "label-delete",
-                                "name": label_name,
-                                "error": f"{exc}",
-                            }
-                        )
-                    continue
-                try:
-                    this_label = repo.get_label(label_name)
-                    this_label.edit(
-                        expected_name,
-                        this_label.color
-                        if label_dict[label_name].color_no_hash is None
-                        else label_dict[label_name].color_no_hash,
-                        this_label.description
-                        if label_dict[label_name].description is None
-                        else label_dict[label_name].description,
-                    )
-                    actions_toolkit.info(f"Updated label {label_name}")
-                except Exception as exc:  # this should be tighter
-                    errors.append(
-                        {
-                            "type": "label-update",
-                            "name": label_name,
-                            "error": f"{exc}",
-                        }
-                    )
+    # a label's own name wins over another label's rename target (A->B while B->C)
+    label_dict = {label.expected_name: label for label in labels}
+    label_dict.update({label.name: label for label in labels})
+
+    # (error type, label name, operation, success message) per phase
+    deletes, edits, creates = [], [], []
+    renames = []
+    for label_name in diffs.get("extra", []):
+        deletes.append(
+            ("label-delete", label_name, partial(__delete_label__, repo, label_name), f"Deleted {label_name}")
+        )
+    for label_name in diffs.get("diff", {}).keys():
+        if label_dict[label_name].expected_name != label_name:
+            renames.append(label_name)
+        else:
+            edits.append(
+                (
+                    "label-update",
+                    label_name,
+                    partial(__edit_label__, repo, label_name, label_dict[label_name]),
+                    f"Updated label {label_name}",
+                )
+            )
+    for label_name in diffs.get("missing", []):
+        creates.append(
+            (
+                "label-create",
+                label_name,
+                partial(__create_label__, repo, label_dict[label_name]),
+                f"Created label {label_name}",
+            )
+        )
+
+    def _run(phase: list[tuple]) -> None:
+        outcomes = run_concurrently([operation for _, _, operation, _ in phase], max_workers=get_parallelism())
+        for (error_type, label_name, _, message), (_, exc) in zip(phase, outcomes):
+            if exc is not None:  # this should be tighter
+                errors.append({"type": error_type, "name": label_name, "error": f"{exc}"})
+            else:
+                actions_toolkit.info(message)
+
+    _run(deletes)
+    _run(edits)
+    # A rename waits for every pending rename away from its target (A->B after B->C), and
+    # only one rename per target runs at a time, so the target is looked up just before it
+    # is taken.  A cycle (A->B, B->A) is broken by running its first rename on its own.
+    while renames:
+        sources = set(renames)
+        wave, targets = [], set()
+        for label_name in renames:
+            target = label_dict[label_name].expected_name
+            if target not in sources and target not in targets:
+                wave.append(label_name)
+                targets.add(target)
+        wave = wave or renames[:1]
+        renames = [label_name for label_name in renames if label_name not in wave]
+        _run([__plan_rename__(repo, label_name, label_dict[label_name]) for label_name in wave])
+    _run(creates)
     return errors, []
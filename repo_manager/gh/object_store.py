@@ -0,0 +1,102 @@
+"""Per-run store of the GitHub objects read by the check_* functions.
+
+The check phase already fetches every label, environment and branch it compares.  It puts
+them here so the matching update_* function can edit or delete the same objects instead of
+fetching them again, and an apply never issues more GETs than the check before it.
+
+Objects are stored per repository under a kind ("label", "environment", "branch") and a
+key (usually the name).  A kind can be recorded as a complete listing, in which case a key
+that is not in the store is known not to exist.  Every write invalidates the keys it
+touches; an invalidated key is unknown again (even in a complete listing) until the
+result of the write is put back or it is fetched anew.
+"""
+
+import threading
+from collections.abc import Callable
+from typing import Any, TypeVar
+
+from github.Repository import Repository
+
+T = TypeVar("T")
+
+
+class _Entries:
+    def __init__(self):
+        self.objects: dict[str, Any] = {}
+        self.complete = False
+        self.stale: set[str] = set()
+
+
+class ObjectStore:
+    """Thread-safe map of (repository, kind, key) to the object last read or written"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: dict[tuple[str, str], _Entries] = {}
+        self.hits = 0
+
+    def _kind(self, repo: Repository, kind: str) -> _Entries:
+        return self._entries.setdefault((repo.full_name, kind), _Entries())
+
+    def put(self, repo: Repository, kind: str, key: str, obj: Any) -> None:
+        """Remember ``obj`` for ``key``; None records that the object does not exist"""
+        with self._lock:
+            entries = self._kind(repo, kind)
+            entries.objects[key] = obj
+            entries.stale.discard(key)
+
+    def put_all(self, repo: Repository, kind: str, objects: dict[str, Any]) -> None:
+        """Remember a complete listing: keys missing from ``objects`` do not exist"""
+        with self._lock:
+            entries = self._kind(repo, kind)
+            entries.objects = dict(objects)
+            entries.complete = True
+            entries.stale.clear()
+
+    def lookup(self, repo: Repository, kind: str, key: str) -> tuple[bool, Any]:
+        """Return (known, object); object is None for a key known not to exist"""
+        with self._lock:
+            entries = self._entries.get((repo.full_name, kind))
+            if entries is None or key in entries.stale:
+                return False, None
+            if key in entries.objects:
+                self.hits += 1
+                return True, entries.objects[key]
+            if entries.complete:
+                self.hits += 1
+                return True, None
+            return False, None
+
+    def get(self, repo: Repository, kind: str, key: str, fetch: Callable[[], T]) -> T:
+        """Return the stored object for ``key``, fetching (and storing) it if it is not known.
+
+        A key known not to exist is fetched too, so the caller gets the API's own error.
+        """
+        known, obj = self.lookup(repo, kind, key)
+        if known and obj is not None:
+            return obj
+        obj = fetch()
+        self.put(repo, kind, key, obj)
+        return obj
+
+    def invalidate(self, repo: Repository, kind: str, key: str | None = None) -> None:
+        """Forget ``key`` (or every object of ``kind``) after a write changed it"""
+        with self._lock:
+            entries = self._entries.get((repo.full_name, kind))
+            if entries is None:
+                return
+            if key is None:
+                del self._entries[(repo.full_name, kind)]
+            else:
+                entries.objects.pop(key, None)
+                entries.stale.add(key)
+
+
+_object_store = ObjectStore()
+
+
+def get_object_store() -> ObjectStore:
+    return _object_store
+
+
+__all__ = ["ObjectStore", "get_object_store"]
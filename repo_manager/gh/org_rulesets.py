@@ -8,6 +8,7 @@ from repo_manager.gh.rulesets import (
     _ruleset_to_api_payload,
     _diff_ruleset,
 )
+from repo_manager.gh.ruleset_cache import get_ruleset_cache
 
 
 def _org_ruleset_payload(rs: Ruleset) -> dict:
@@ -41,6 +42,7 @@ def check_org_rulesets(org: Organization, config_rulesets: list[Ruleset]) -> tup
     missing: list[str] = []
     extra: list[dict] = []
     diff_map: dict[str, Any] = {}
+    to_diff: list[tuple[Ruleset, dict]] = []
 
     for config_rs in config_rulesets:
         matches = existing_by_name.get(config_rs.name, [])
@@ -54,14 +56,12 @@ def check_org_rulesets(org: Organization, config_rulesets: list[Ruleset]) -> tup
             missing.append(config_rs.name)
             continue
 
-        match = matches[0]
-        try:
-            _, full_actual = org._requester.requestJsonAndCheck("GET", f"{org.url}/rulesets/{match['id']}")
-        except Exception as exc:
-            actions_toolkit.warning(f"Unable to fetch ruleset detail '{config_rs.name}' (id={match['id']}): {exc}")
-            full_actual = match
+        to_diff.append((config_rs, matches[0]))
 
-        ruleset_diffs = _diff_ruleset(config_rs, full_actual)
+    # full bodies, refetched (concurrently) only for rulesets whose updated_at moved
+    bodies = get_ruleset_cache().get_all(org._requester, org.url, [match for _, match in to_diff])
+    for config_rs, match in to_diff:
+        ruleset_diffs = _diff_ruleset(config_rs, bodies[match["id"]])
         if ruleset_diffs:
             diff_map[config_rs.name] = {**ruleset_diffs, "_id": match["id"]}
 
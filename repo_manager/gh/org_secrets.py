@@ -1,11 +1,17 @@
 """Manage org-level Actions and Dependabot secrets/variables."""
 
+from functools import partial
 from typing import Any
 
 from actions_toolkit import core as actions_toolkit
 from github.Organization import Organization
 
 from repo_manager.schemas.org_settings import OrgSecret, OrgSecretVisibility, SecretEnvError
+from repo_manager.utils import get_parallelism
+from repo_manager.utils.concurrency import run_concurrently
+
+from .public_keys import put_secret
+from .repo_index import get_repo_index
 
 
 # --------------------------------------------------------------------------- #
@@ -45,15 +51,8 @@ def _get_existing_variable_names(org: Organization) -> set[str]:
 
 
 def _resolve_selected_repo_ids(org: Organization, names: list[str]) -> list[int]:
-    ids = []
-    for name in names:
-        full = name if "/" in name else f"{org.login}/{name}"
-        try:
-            _, repo_data = org._requester.requestJsonAndCheck("GET", f"/repos/{full}")
-            ids.append(repo_data["id"])
-        except Exception as exc:
-            actions_toolkit.warning(f"Could not resolve repo '{full}': {exc}")
-    return ids
+    # served from one listing of the org, shared by every secret and variable in the run
+    return get_repo_index().resolve(org, names)
 
 
 # --------------------------------------------------------------------------- #
@@ -100,43 +99,30 @@ def update_org_secrets(
     # Build lookup keyed by (name, type)
     config_by_key: dict[tuple[str, str], OrgSecret] = {(s.key, s.type): s for s in config_secrets}
 
-    for entry in diffs.get("missing", []):
-        name, stype = entry["name"], entry["type"]
-        s = config_by_key.get((name, stype))
-        if s is None:
-            continue
-        try:
-            value = s.expected_value
-            if value is None:
-                actions_toolkit.warning(f"Skipping org secret '{name}' (env var not set, required=false)")
-                continue
-            # Encrypt via GitHub public key
-            base = _secret_api_base(org, stype)
-            _, key_data = org._requester.requestJsonAndCheck("GET", f"{base}/public-key")
-            from nacl import encoding, public
-
-            pub_key = public.PublicKey(key_data["key"].encode(), encoding.Base64Encoder())
-            box = public.SealedBox(pub_key)
-            encrypted = box.encrypt(value.encode())
-            import base64
-
-            encrypted_b64 = base64.b64encode(encrypted).decode()
-
-            payload: dict[str, Any] = {
-                "encrypted_value": encrypted_b64,
-                "key_id": key_data["key_id"],
-                "visibility": s.visibility.value,
-            }
-            if s.visibility == OrgSecretVisibility.selected and s.selected_repositories:
-                payload["selected_repository_ids"] = _resolve_selected_repo_ids(org, s.selected_repositories)
-
-            org._requester.requestJsonAndCheck("PUT", f"{base}/{name}", input=payload)
-            actions_toolkit.info(f"Set org {stype} secret '{name}'")
-            messages.append(f"Set org {stype} secret '{name}'")
-        except SecretEnvError as exc:
-            errors.append({"type": "org-secret-create", "name": name, "error": str(exc)})
-        except Exception as exc:
+    def _set_secret(name: str, stype: str, s: OrgSecret) -> str | None:
+        value = s.expected_value
+        if value is None:
+            actions_toolkit.warning(f"Skipping org secret '{name}' (env var not set, required=false)")
+            return None
+        payload: dict[str, Any] = {"visibility": s.visibility.value}
+        if s.visibility == OrgSecretVisibility.selected and s.selected_repositories:
+            payload["selected_repository_ids"] = _resolve_selected_repo_ids(org, s.selected_repositories)
+        # Sealed with the org's public key, fetched once per type for the whole run
+        put_secret(org._requester, _secret_api_base(org, stype), name, value, payload)
+        actions_toolkit.info(f"Set org {stype} secret '{name}'")
+        return f"Set org {stype} secret '{name}'"
+
+    to_set = [
+        (entry["name"], entry["type"], config_by_key[(entry["name"], entry["type"])])
+        for entry in diffs.get("missing", [])
+        if (entry["name"], entry["type"]) in config_by_key
+    ]
+    outcomes = run_concurrently([partial(_set_secret, *entry) for entry in to_set], max_workers=get_parallelism())
+    for (name, _, _), (message, exc) in zip(to_set, outcomes):
+        if exc is not None:
             errors.append({"type": "org-secret-create", "name": name, "error": str(exc)})
+        elif message is not None:
+            messages.append(message)
 
     for entry in diffs.get("extra", []):
         name, stype = entry["name"], entry["type"]
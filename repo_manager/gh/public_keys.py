@@ -0,0 +1,78 @@
+"""Per-run cache of the public keys secrets are sealed with.
+
+Every secret write needs the public key of its scope: the repository's Actions or Dependabot
+secrets, one environment, or the organisation's Actions or Dependabot secrets.  The key of a
+scope only changes when GitHub rotates it, so it is fetched once per run and shared by every
+write to that scope, even when the writes run concurrently.
+"""
+
+import threading
+from typing import Any
+
+from github.GithubException import GithubException
+from github.PublicKey import PublicKey
+from github.Requester import Requester
+
+
+class PublicKeyCache:
+    """Thread-safe map of a scope's ``.../secrets/public-key`` URL to its key"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._keys: dict[str, PublicKey] = {}
+        self._fetching: dict[str, threading.Lock] = {}
+        self.fetches = 0
+
+    def get(self, requester: Requester, url: str) -> PublicKey:
+        """Return the key at ``url``, fetching it only if no other write has yet"""
+        with self._lock:
+            key = self._keys.get(url)
+            if key is not None:
+                return key
+            fetching = self._fetching.setdefault(url, threading.Lock())
+        # one fetch per scope: concurrent writers to the same scope wait for the first one
+        with fetching:
+            with self._lock:
+                key = self._keys.get(url)
+            if key is None:
+                _, data = requester.requestJsonAndCheck("GET", url)
+                key = PublicKey(requester, {}, attributes=data, completed=True)
+                with self._lock:
+                    self._keys[url] = key
+                    self.fetches += 1
+        return key
+
+    def invalidate(self, url: str) -> None:
+        """Forget the key at ``url``, e.g. after GitHub rejected it as rotated"""
+        with self._lock:
+            self._keys.pop(url, None)
+
+
+_public_keys = PublicKeyCache()
+
+
+def get_public_key_cache() -> PublicKeyCache:
+    return _public_keys
+
+
+def put_secret(
+    requester: Requester, secrets_url: str, name: str, value: str, payload: dict[str, Any] | None = None
+) -> None:
+    """Seal ``value`` with the cached key of ``secrets_url`` and PUT it as secret ``name``.
+
+    A key GitHub rejects (it was rotated during the run) is fetched again once.
+    """
+    key_url = f"{secrets_url}/public-key"
+    for attempt in range(2):
+        key = _public_keys.get(requester, key_url)
+        body = {**(payload or {}), "encrypted_value": key.encrypt(value), "key_id": key.key_id}
+        try:
+            requester.requestJsonAndCheck("PUT", f"{secrets_url}/{name}", input=body)
+            return
+        except GithubException as exc:
+            if exc.status != 422 or attempt == 1:
+                raise
+            _public_keys.invalidate(key_url)
+
+
+__all__ = ["PublicKeyCache", "get_public_key_cache", "put_secret"]
@@ -0,0 +1,202 @@
+"""Rate-limit aware scheduling of every request sent through the transport.
+
+GitHub publishes the remaining budget of each rate-limit bucket (``core`` for REST,
+``graphql``) in the ``X-RateLimit-*`` headers of every response.  The scheduler keeps the
+latest values and, once a bucket drops below a low-water mark, spreads the remaining
+requests over the time left until the reset instead of running into a 403 mid-apply.
+Rate-limited responses (429, or a 403 for the primary/secondary limit) are retried after
+``Retry-After`` (or the reset time), and every other request waits while that back-off
+is in progress.
+
+Reads and mutations get separate concurrency limits: GitHub's secondary limits are far
+stricter for concurrent writes than for reads.  Requests are counted per settings
+category (see ``api_category``) so a run can report where its budget went.
+"""
+
+import contextvars
+import json
+import re
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from typing import Any
+
+import requests
+from actions_toolkit import core as actions_toolkit
+
+# Below this share of a bucket's limit, requests are paced to last until the reset
+_LOW_WATER_MARK = 0.1
+# Longest the scheduler will sleep for a reset or Retry-After before giving up on a request
+_MAX_WAIT = 900
+# GitHub asks to wait at least a minute after a secondary rate limit without Retry-After
+_SECONDARY_LIMIT_WAIT = 60
+_MAX_RETRIES = 3
+
+# the operation type, after any leading whitespace and comments
+_MUTATION = re.compile(r"(?:\s|#[^\n]*)*mutation\b")
+
+_category: contextvars.ContextVar[str] = contextvars.ContextVar("api_category", default="other")
+
+
+@contextmanager
+def api_category(name: str) -> Iterator[None]:
+    """Attribute the requests made inside this block (in this thread/context) to ``name``"""
+    token = _category.set(name)
+    try:
+        yield
+    finally:
+        _category.reset(token)
+
+
+def __is_read__(verb: str, url: str, body: Any = None) -> bool:
+    if url.endswith("/graphql"):
+        # queries and mutations are both POSTs to /graphql; only the operation type tells them apart
+        return not __is_mutation__(body)
+    return verb in ("GET", "HEAD")
+
+
+def __is_mutation__(body: Any) -> bool:
+    """Whether a GraphQL request body is a mutation; a body that cannot be read counts as one"""
+    try:
+        query = json.loads(body)["query"]
+    except TypeError, ValueError, KeyError:
+        return True
+    return _MUTATION.match(query) is not None
+
+
+def __resource__(url: str) -> str:
+    return "graphql" if url.endswith("/graphql") else "core"
+
+
+class RateLimitScheduler:
+    """Paces, bounds and retries requests according to GitHub's rate-limit headers.
+
+    Args:
+        max_reads: Maximum number of read requests in flight at once
+        max_writes: Maximum number of mutating requests in flight at once
+    """
+
+    def __init__(self, max_reads: int = 8, max_writes: int = 2):
+        self.max_reads = max_reads
+        self.max_writes = max_writes
+        self._slots = {True: threading.BoundedSemaphore(max_reads), False: threading.BoundedSemaphore(max_writes)}
+        self._lock = threading.Lock()
+        # resource -> (remaining, limit, reset epoch seconds)
+        self._budget: dict[str, tuple[int, int, float]] = {}
+        self._blocked_until = 0.0
+        self.usage: dict[str, dict[str, int]] = {}
+        self.retries = 0
+        self.waited = 0.0
+
+    def run(self, verb: str, url: str, send: Callable[[], requests.Response], body: Any = None) -> requests.Response:
+        """Send a request through ``send`` once a slot and the budget allow, retrying when rate limited.
+
+        ``body`` is only read to tell GraphQL queries from mutations.
+        """
+        is_read = __is_read__(verb, url, body)
+        resource = __resource__(url)
+        for attempt in range(_MAX_RETRIES + 1):
+            self._wait(resource)
+            with self._slots[is_read]:
+                response = send()
+            self._observe(resource, response)
+            delay = self._retry_delay(response)
+            self._count(is_read, response, delay is not None)
+            if delay is None or attempt == _MAX_RETRIES or delay > _MAX_WAIT:
+                return response
+            actions_toolkit.warning(
+                f"Rate limited ({response.status_code}) on {verb} {url}; retrying in {delay:.0f}s "
+                f"(attempt {attempt + 1} of {_MAX_RETRIES})"
+            )
+            with self._lock:
+                self.retries += 1
+                self._blocked_until = max(self._blocked_until, time.time() + delay)
+        return response
+
+    def _wait(self, resource: str) -> None:
+        """Sleep through an active back-off, then pace the request if the bucket is running low"""
+        with self._lock:
+            now = time.time()
+            delay = max(self._blocked_until - now, 0.0)
+            remaining, limit, reset = self._budget.get(resource, (None, None, 0.0))
+            if remaining is not None and limit and remaining < limit * _LOW_WATER_MARK and reset > now:
+                # spread what is left evenly over the window so the last request lands at the reset
+                delay = max(delay, (reset - now) / max(remaining, 1))
+            delay = min(delay, _MAX_WAIT)
+            self.waited += delay
+        if delay > 0:
+            actions_toolkit.debug(f"Rate limit scheduler: waiting {delay:.1f}s before the next {resource} request")
+            time.sleep(delay)
+
+    def _observe(self, resource: str, response: requests.Response) -> None:
+        headers = response.headers
+        try:
+            remaining = int(headers["X-RateLimit-Remaining"])
+            limit = int(headers["X-RateLimit-Limit"])
+            reset = float(headers["X-RateLimit-Reset"])
+        except KeyError, TypeError, ValueError:
+            return
+        resource = headers.get("X-RateLimit-Resource", resource)
+        with self._lock:
+            # responses can arrive out of order; keep the lowest count seen for the current window
+            current = self._budget.get(resource)
+            if current is None or reset != current[2] or remaining < current[0]:
+                self._budget[resource] = (remaining, limit, reset)
+
+    def _count(self, is_read: bool, response: requests.Response, rate_limited: bool) -> None:
+        category = _category.get()
+        with self._lock:
+            usage = self.usage.setdefault(category, {"reads": 0, "writes": 0, "not_modified": 0, "rate_limited": 0})
+            usage["reads" if is_read else "writes"] += 1
+            if response.status_code == 304:
+                usage["not_modified"] += 1
+            if rate_limited:
+                usage["rate_limited"] += 1
+
+    @staticmethod
+    def _retry_delay(response: requests.Response) -> float | None:
+        """Seconds to wait before retrying a rate-limited response, or None if it was not rate limited"""
+        if response.status_code not in (403, 429):
+            return None
+        headers = response.headers
+        if response.status_code == 403:
+            if headers.get("X-RateLimit-Remaining") != "0" and "rate limit" not in response.text.lower():
+                return None  # an ordinary permission error
+        if headers.get("Retry-After", "").isdigit():
+            return float(headers["Retry-After"])
+        if headers.get("X-RateLimit-Remaining") == "0" and headers.get("X-RateLimit-Reset", "").isdigit():
+            return max(float(headers["X-RateLimit-Reset"]) - time.time(), 0.0) + 1
+        return float(_SECONDARY_LIMIT_WAIT)
+
+    def report(self) -> str:
+        lines = ["API requests by category:"]
+        with self._lock:
+            for category, usage in sorted(self.usage.items()):
+                lines.append(
+                    f"  {category}: {usage['reads']} reads, {usage['writes']} writes"
+                    + (f", {usage['not_modified']} not modified (free)" if usage["not_modified"] else "")
+                    + (f", {usage['rate_limited']} rate limited" if usage["rate_limited"] else "")
+                )
+            for resource, (remaining, limit, _) in sorted(self._budget.items()):
+                lines.append(f"  {resource} budget remaining: {remaining}/{limit}")
+            if self.retries or self.waited:
+                lines.append(f"  {self.retries} retries after rate limiting, {self.waited:.0f}s spent waiting")
+        return "\n".join(lines)
+
+
+_scheduler = RateLimitScheduler()
+
+
+def configure_scheduler(max_reads: int, max_writes: int) -> RateLimitScheduler:
+    """Replace the scheduler used by the transport from now on"""
+    global _scheduler
+    _scheduler = RateLimitScheduler(max_reads, max_writes)
+    return _scheduler
+
+
+def get_scheduler() -> RateLimitScheduler:
+    return _scheduler
+
+
+__all__ = ["RateLimitScheduler", "api_category", "configure_scheduler", "get_scheduler"]
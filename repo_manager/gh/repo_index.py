@@ -0,0 +1,167 @@
+"""Per-run index of an organisation's repository IDs by name.
+
+Org secrets and variables with ``selected`` visibility name their repositories, but the API
+takes IDs.  Instead of one ``GET /repos/{owner}/{repo}`` per name (and per secret), the whole
+organisation is listed once at ``per_page=100`` and every lookup in the run is served from
+that listing.  With ``cache_dir`` set the listing is also kept on disk for
+``repo_index_ttl_minutes``, so back-to-back runs do not list the organisation again.
+
+A name the listing does not know (a repository created since, or one of another owner) is
+resolved on its own and added to the index.
+"""
+
+import json
+import threading
+import time
+from pathlib import Path
+
+from actions_toolkit import core as actions_toolkit
+from github.Organization import Organization
+
+from repo_manager.utils import __positive_int_input__, get_inputs
+
+
+class RepoIndex:
+    """Thread-safe map of (org, repository name) to repository ID.
+
+    Args:
+        cache_dir: Directory the listings are kept in between runs; None keeps them in memory only
+        ttl: Seconds a listing kept on disk stays valid
+    """
+
+    def __init__(self, cache_dir: Path | str | None = None, ttl: float = 3600):
+        self.cache_dir = Path(cache_dir) / "repo-index" if cache_dir else None
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._orgs: dict[str, dict[str, int]] = {}
+        self._fresh: set[str] = set()  # orgs listed during this run
+        self._listing: dict[str, threading.Lock] = {}
+        self.listings = 0
+        self.lookups = 0
+
+    def resolve(self, org: Organization, names: list[str]) -> list[int]:
+        """IDs of ``names`` (bare names belong to ``org``), in order; unresolvable names are warned about and skipped"""
+        ids = []
+        for name in names:
+            full = name if "/" in name else f"{org.login}/{name}"
+            repo_id = self._lookup(org, full)
+            if repo_id is None:
+                actions_toolkit.warning(f"Could not resolve repo '{full}'")
+            else:
+                ids.append(repo_id)
+        return ids
+
+    def _lookup(self, org: Organization, full: str) -> int | None:
+        owner, name = full.lower().split("/", 1)
+        if owner == org.login.lower():
+            index = self._index(org, owner)
+            if name in index:
+                return index[name]
+            if owner not in self._fresh:
+                # the listing came from disk and predates this repository
+                index = self._index(org, owner, refresh=True)
+                if name in index:
+                    return index[name]
+        with self._lock:
+            known = self._orgs.get(owner, {}).get(name)
+        if known is not None:
+            return known
+        try:
+            _, data = org._requester.requestJsonAndCheck("GET", f"/repos/{full}")
+        except Exception as exc:
+            actions_toolkit.debug(f"Could not get repo '{full}': {exc}")
+            return None
+        with self._lock:
+            self.lookups += 1
+            self._orgs.setdefault(owner, {})[name] = data["id"]
+        return data["id"]
+
+    def _index(self, org: Organization, owner: str, refresh: bool = False) -> dict[str, int]:
+        with self._lock:
+            if owner in self._orgs and (not refresh or owner in self._fresh):
+                return self._orgs[owner]
+            listing = self._listing.setdefault(owner, threading.Lock())
+        # one listing per org: concurrent lookups wait for the first one
+        with listing:
+            with self._lock:
+                if owner in self._orgs and (not refresh or owner in self._fresh):
+                    return self._orgs[owner]
+            index = None if refresh else self._load(owner)
+            fresh = index is None
+            if fresh:
+                index = self._list(org)
+            with self._lock:
+                self._orgs[owner] = {**self._orgs.get(owner, {}), **index}
+                if fresh:
+                    self._fresh.add(owner)
+                return self._orgs[owner]
+
+    def _list(self, org: Organization) -> dict[str, int]:
+        index = {}
+        url = f"/orgs/{org.login}/repos"
+        params = {"per_page": 100, "type": "all"}
+        while url:
+            headers, data = org._requester.requestJsonAndCheck("GET", url, parameters=params)
+            index.update({repo["name"].lower(): repo["id"] for repo in data})
+            url, params = __next_link__(headers.get("link", "")), None
+        with self._lock:
+            self.listings += 1
+        self._save(org.login.lower(), index)
+        return index
+
+    def _path(self, owner: str) -> Path:
+        return self.cache_dir / f"{owner}.json"
+
+    def _load(self, owner: str) -> dict[str, int] | None:
+        if self.cache_dir is None:
+            return None
+        try:
+            cached = json.loads(self._path(owner).read_text())
+        except OSError, ValueError:
+            return None
+        if time.time() - cached.get("listed_at", 0) > self.ttl:
+            return None
+        return cached.get("repos")
+
+    def _save(self, owner: str, index: dict[str, int]) -> None:
+        if self.cache_dir is None:
+            return
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp = self._path(owner).with_suffix(".tmp")
+            tmp.write_text(json.dumps({"listed_at": time.time(), "repos": index}))
+            tmp.replace(self._path(owner))
+        except OSError as exc:
+            actions_toolkit.debug(f"Could not cache the repository index of {owner}: {exc}")
+
+
+def __next_link__(link: str) -> str | None:
+    """The ``rel="next"`` URL of a ``Link`` header, if there is one"""
+    for part in link.split(","):
+        url, _, rel = part.partition(";")
+        if 'rel="next"' in rel:
+            return url.strip().strip("<>")
+    return None
+
+
+_repo_index: RepoIndex | None = None
+_repo_index_lock = threading.Lock()
+
+
+def get_repo_index() -> RepoIndex:
+    global _repo_index
+    with _repo_index_lock:
+        if _repo_index is None:
+            ttl = __positive_int_input__("repo_index_ttl_minutes", 60) * 60
+            _repo_index = RepoIndex(get_inputs().get("cache_dir"), ttl)
+    return _repo_index
+
+
+def configure_repo_index(index: RepoIndex | None) -> None:
+    """Replace the index used from now on (None builds a new one from the inputs)"""
+    global _repo_index
+    with _repo_index_lock:
+        _repo_index = index
+
+
+__all__ = ["RepoIndex", "configure_repo_index", "get_repo_index"]
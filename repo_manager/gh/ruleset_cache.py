@@ -0,0 +1,138 @@
+"""Cache of full ruleset bodies, keyed by each ruleset's ``updated_at``.
+
+The ruleset listing (``GET .../rulesets``) only has a summary, so every check used to fetch
+``GET .../rulesets/{id}`` for each configured ruleset.  The listing does carry ``updated_at``,
+which changes whenever the ruleset does, so a body fetched before is still current as long
+as its ``updated_at`` matches the listing.  Only rulesets whose ``updated_at`` moved (or that
+were never seen) are fetched, concurrently.  With ``cache_dir`` set the bodies are kept under
+``cache_dir/rulesets`` between runs, keyed by the same auth identity as the HTTP cache: a
+ruleset body depends on what the caller may see (``bypass_actors`` is left out for callers
+who cannot read it), so a body fetched with one token is never served to another.
+"""
+
+import hashlib
+import json
+import threading
+from functools import partial
+from pathlib import Path
+from typing import Any
+
+from actions_toolkit import core as actions_toolkit
+from github.Requester import Requester
+
+from repo_manager.utils import get_inputs, get_parallelism
+from repo_manager.utils.concurrency import run_concurrently
+
+from .http_cache import get_http_cache
+
+
+class RulesetCache:
+    """Thread-safe map of a ruleset URL to its last fetched body and that body's ``updated_at``.
+
+    Args:
+        cache_dir: Directory the bodies are kept in between runs; None keeps them in memory only
+        identity: Stable name for the credentials in use (never the token itself), so bodies
+            fetched with different permissions never share a file
+    """
+
+    def __init__(self, cache_dir: Path | str | None = None, identity: str = ""):
+        self.cache_dir = Path(cache_dir) / "rulesets" if cache_dir else None
+        self.identity = identity
+        self._lock = threading.Lock()
+        self._bodies: dict[str, dict[str, Any]] = {}
+        self.hits = 0
+        self.fetches = 0
+
+    def get_all(self, requester: Requester, base: str, listed: list[dict[str, Any]]) -> dict[int, dict[str, Any]]:
+        """Full body of every ruleset in ``listed`` (entries of the ``{base}/rulesets`` listing), by id.
+
+        A ruleset that cannot be fetched is warned about and represented by its listing entry.
+        """
+        bodies = {}
+        to_fetch = []
+        for summary in listed:
+            url = f"{base}/rulesets/{summary['id']}"
+            cached = self._lookup(url)
+            if cached is not None and summary.get("updated_at") and cached["updated_at"] == summary["updated_at"]:
+                bodies[summary["id"]] = cached["body"]
+            else:
+                to_fetch.append((summary, url))
+        with self._lock:
+            self.hits += len(bodies)
+
+        def _fetch(url: str) -> dict[str, Any]:
+            _, body = requester.requestJsonAndCheck("GET", url)
+            return body
+
+        outcomes = run_concurrently([partial(_fetch, url) for _, url in to_fetch], max_workers=get_parallelism())
+        for (summary, url), (body, exc) in zip(to_fetch, outcomes):
+            if exc is not None:
+                actions_toolkit.warning(
+                    f"Unable to fetch ruleset detail for '{summary.get('name')}' (id={summary['id']}): {exc}"
+                )
+                bodies[summary["id"]] = summary
+                continue
+            bodies[summary["id"]] = body
+            self._store(url, body.get("updated_at") or summary.get("updated_at"), body)
+        return bodies
+
+    def _path(self, url: str) -> Path:
+        key = hashlib.sha256(f"{self.identity}\n{url}".encode()).hexdigest()
+        return self.cache_dir / f"{key}.json"
+
+    def _lookup(self, url: str) -> dict[str, Any] | None:
+        with self._lock:
+            cached = self._bodies.get(url)
+        if cached is not None or self.cache_dir is None:
+            return cached
+        try:
+            cached = json.loads(self._path(url).read_text())
+        except OSError, ValueError:
+            return None
+        with self._lock:
+            self._bodies.setdefault(url, cached)
+        return cached
+
+    def _store(self, url: str, updated_at: str | None, body: dict[str, Any]) -> None:
+        with self._lock:
+            self.fetches += 1
+            if updated_at is None:
+                return
+            entry = {"updated_at": updated_at, "body": body}
+            self._bodies[url] = entry
+        if self.cache_dir is None:
+            return
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp = self._path(url).with_suffix(f".{threading.get_ident()}.tmp")
+            tmp.write_text(json.dumps(entry))
+            tmp.replace(self._path(url))
+        except OSError as exc:
+            actions_toolkit.debug(f"Could not cache ruleset {url}: {exc}")
+
+
+_ruleset_cache: RulesetCache | None = None
+_ruleset_cache_lock = threading.Lock()
+
+
+def get_ruleset_cache() -> RulesetCache:
+    global _ruleset_cache
+    with _ruleset_cache_lock:
+        if _ruleset_cache is None:
+            # bodies are only kept on disk under the identity the HTTP cache was configured with
+            http_cache = get_http_cache()
+            if http_cache is None:
+                _ruleset_cache = RulesetCache()
+            else:
+                _ruleset_cache = RulesetCache(get_inputs().get("cache_dir"), http_cache.identity)
+    return _ruleset_cache
+
+
+def configure_ruleset_cache(cache: RulesetCache | None) -> None:
+    """Replace the cache used from now on (None builds a new one from the inputs)"""
+    global _ruleset_cache
+    with _ruleset_cache_lock:
+        _ruleset_cache = cache
+
+
+__all__ = ["RulesetCache", "configure_ruleset_cache", "get_ruleset_cache"]
@@ -1,3 +1,5 @@
+import hashlib
+import json
 import re as _re
 from typing import Any
 
@@ -6,6 +8,8 @@ from github.Repository import Repository
 
 from repo_manager.schemas.ruleset import Ruleset
 
+from .ruleset_cache import get_ruleset_cache
+
 # API-only fields that must be stripped before diffing
 _IGNORE_FIELDS = {
     "id",
@@ -135,80 +139,99 @@ def _normalize_status_checks(checks: list[dict]) -> list[dict]:
     return result
 
 
-def _rule_satisfied(config_rule: dict, actual_rules: list[dict]) -> bool:
-    """Return True if config_rule is satisfied by any rule in actual_rules.
+def _canonical_params(params: dict[str, Any], actual_params: dict[str, Any] | None = None) -> dict[str, Any]:
+    """Config-specified rule parameters (looked up in ``actual_params`` if given) in comparable form.
     Only config-specified parameters are compared; GitHub may add extras
     (e.g. required_reviewers: []) that we should not flag as a diff.
     required_status_checks contexts are compared ignoring integration_id:null."""
-    for actual in actual_rules:
-        if actual.get("type") != config_rule.get("type"):
+    source = params if actual_params is None else actual_params
+    canonical = {}
+    for k, v in params.items():
+        value = source.get(k)
+        if k == "required_status_checks" and isinstance(v, list) and isinstance(value, list):
+            value = _normalize_status_checks(value)
+        canonical[k] = value
+    return canonical
+
+
+def _canonical_rules(config_rules: list[dict], actual_rules: list[dict] | None = None) -> list[dict]:
+    """The config rules in comparable form, or their counterparts in ``actual_rules`` if given.
+
+    GitHub's rule list is a superset: it may auto-add ``code_quality`` and
+    ``copilot_code_review`` rules, so each config rule is matched against the actual
+    rules of its own type only (indexed by type) and the others are ignored.
+    """
+    by_type: dict[str, list[dict]] = {}
+    for rule in actual_rules or []:
+        by_type.setdefault(rule.get("type"), []).append(rule.get("parameters") or {})
+    canonical = []
+    for rule in config_rules:
+        params = rule.get("parameters") or {}
+        wanted = _canonical_params(params)
+        if actual_rules is None:
+            canonical.append({"type": rule.get("type"), "parameters": wanted})
             continue
-        config_params = config_rule.get("parameters", {}) or {}
-        actual_params = actual.get("parameters", {}) or {}
-        matched = True
-        for k, v in config_params.items():
-            av = actual_params.get(k)
-            if k == "required_status_checks" and isinstance(v, list) and isinstance(av, list):
-                if _normalize_status_checks(v) != _normalize_status_checks(av):
-                    matched = False
-                    break
-            elif av != v:
-                matched = False
-                break
-        if matched:
-            return True
-    return False
+        candidates = [_canonical_params(params, actual) for actual in by_type.get(rule.get("type"), [])]
+        found = next((c for c in candidates if c == wanted), candidates[0] if candidates else None)
+        canonical.append({"type": rule.get("type"), "parameters": found} if found is not None else None)
+    return canonical
 
 
-def _diff_ruleset(expected: Ruleset, actual: dict[str, Any]) -> dict[str, Any]:
-    """Return a dict of field-level differences between expected config and the API response.
+def _canonical_ruleset(expected_payload: dict[str, Any], actual: dict[str, Any] | None = None) -> dict[str, Any]:
+    """Canonical form of a ruleset restricted to the fields the config specifies.
 
-    Comparison rules that avoid false-positive diffs caused by GitHub normalisation:
+    Without ``actual`` this is the config's own form; with it, the same projection of the
+    API response, so the two are equal exactly when the ruleset needs no update:
     - bypass_actors: OrganizationAdmin actor_id is always null in API responses.
     - conditions: only compare keys present in the config; GitHub auto-adds
       ``repository_name: {include: ['~ALL']}`` to org-level rulesets.
-    - rules: treat GitHub's rule list as a superset; GitHub may auto-add
-      ``code_quality`` and ``copilot_code_review`` rules.  Only flag if a
-      config rule is missing or has wrong parameters.  Per-rule parameters
-      are also compared as a subset (GitHub adds ``required_reviewers: []").
+    - rules: see ``_canonical_rules``.
     """
-    diffs: dict[str, Any] = {}
-    expected_payload = _ruleset_to_api_payload(expected)
-    actual_clean = _strip_api_fields(actual)
-
+    canonical: dict[str, Any] = {}
     for key, expected_val in expected_payload.items():
-        actual_val = actual_clean.get(key)
-
+        value = expected_val if actual is None else actual.get(key)
         if key == "bypass_actors":
-            exp_norm = _normalize_actors(expected_val)
-            act_norm = _normalize_actors(actual_val)
-            if exp_norm != act_norm:
-                diffs[key] = {"expected": exp_norm, "found": act_norm}
-
+            canonical[key] = _normalize_actors(value)
         elif key == "conditions":
-            # Only compare condition keys the config specifies.
-            # GitHub auto-adds repository_name and potentially others.
-            actual_cond = actual_val or {}
-            cond_diffs: dict[str, Any] = {}
-            for cond_key, exp_cond_val in (expected_val or {}).items():
-                act_cond_val = actual_cond.get(cond_key)
-                if _normalize_ref_condition(exp_cond_val) != _normalize_ref_condition(act_cond_val):
-                    cond_diffs[cond_key] = {"expected": exp_cond_val, "found": act_cond_val}
-            if cond_diffs:
-                diffs[key] = {"expected": expected_val, "found": actual_val}
+            conditions = value or {}
+            canonical[key] = {
+                cond_key: _normalize_ref_condition(conditions.get(cond_key)) for cond_key in (expected_val or {})
+            }
+        elif key == "rules":
+            canonical[key] = _canonical_rules(expected_val or [], None if actual is None else value or [])
+        else:
+            canonical[key] = value
+    return canonical
+
+
+def _canonical_hash(canonical: dict[str, Any]) -> str:
+    return hashlib.sha256(json.dumps(canonical, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
 
+def _diff_ruleset(expected: Ruleset, actual: dict[str, Any]) -> dict[str, Any]:
+    """Return a dict of field-level differences between expected config and the API response.
+
+    Both sides are reduced to the canonical form of ``_canonical_ruleset``, which avoids
+    false-positive diffs caused by GitHub normalisation.  A ruleset that matches is
+    confirmed by one hash comparison; only a mismatch is diffed key by key.
+    """
+    expected_payload = _ruleset_to_api_payload(expected)
+    wanted = _canonical_ruleset(expected_payload)
+    found = _canonical_ruleset(expected_payload, actual)
+    if _canonical_hash(wanted) == _canonical_hash(found):
+        return {}
+
+    diffs: dict[str, Any] = {}
+    for key, expected_val in expected_payload.items():
+        if wanted[key] == found[key]:
+            continue
+        actual_val = _strip_api_fields(actual.get(key))
+        if key == "bypass_actors":
+            diffs[key] = {"expected": wanted[key], "found": found[key]}
         elif key == "rules":
-            # Every config rule must be present and satisfied in GitHub's rules.
-            # GitHub may add extra rules (code_quality, copilot_code_review) — ignore them.
-            actual_rules_clean = _strip_api_fields(actual_val or [])
-            expected_rules_clean = _strip_api_fields(expected_val or [])
-            unsatisfied = [r for r in expected_rules_clean if not _rule_satisfied(r, actual_rules_clean)]
-            if unsatisfied:
-                diffs[key] = {"expected": expected_rules_clean, "found": actual_rules_clean}
-
-        elif expected_val != actual_val:
+            diffs[key] = {"expected": _strip_api_fields(expected_val or []), "found": actual_val or []}
+        else:
             diffs[key] = {"expected": expected_val, "found": actual_val}
-
     return diffs
 
 
@@ -241,6 +264,7 @@ def check_repo_rulesets(repo: Repository, config_rulesets: list[Ruleset]) -> tup
     missing: list[str] = []
     extra: list[dict] = []
     diff_map: dict[str, Any] = {}
+    to_diff: list[tuple[Ruleset, dict]] = []
 
     for config_rs in config_rulesets:
         matches = existing_by_name.get(config_rs.name, [])
@@ -254,15 +278,12 @@ def check_repo_rulesets(repo: Repository, config_rulesets: list[Ruleset]) -> tup
             missing.append(config_rs.name)
             continue
 
-        # Fetch full detail for the first match (names should be unique per target in practice)
-        match = matches[0]
-        try:
-            _, full_actual = repo._requester.requestJsonAndCheck("GET", f"{repo.url}/rulesets/{match['id']}")
-        except Exception as exc:
-            actions_toolkit.warning(f"Unable to fetch ruleset detail for '{config_rs.name}' (id={match['id']}): {exc}")
-            full_actual = match
+        to_diff.append((config_rs, matches[0]))
 
-        ruleset_diffs = _diff_ruleset(config_rs, full_actual)
+    # full bodies, refetched (concurrently) only for rulesets whose updated_at moved
+    bodies = get_ruleset_cache().get_all(repo._requester, repo.url, [match for _, match in to_diff])
+    for config_rs, match in to_diff:
+        ruleset_diffs = _diff_ruleset(config_rs, bodies[match["id"]])
         if ruleset_diffs:
             diff_map[config_rs.name] = {**ruleset_diffs, "_id": match["id"]}
 
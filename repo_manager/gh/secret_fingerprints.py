@@ -0,0 +1,181 @@
+"""Opt-in fingerprints of the secret values this action applied.
+
+GitHub never returns secret values, so every configured secret that already exists looks
+changed: check always reports drift and apply re-encrypts and re-PUTs all of them.  With
+``secret_fingerprint_key`` set, each value written is recorded as a keyed HMAC together with
+the secret's ``updated_at``.  A secret whose configured value still has the recorded
+fingerprint, and whose ``updated_at`` has not moved since (nobody else wrote it), is left
+alone by both check and apply.
+
+Fingerprints are kept per repository in a companion Actions variable (the default) or in a
+local JSON state file.  The HMAC key never leaves the runner, so the stored fingerprints
+reveal nothing about the values.
+"""
+
+import hashlib
+import hmac
+import json
+import os
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+from actions_toolkit import core as actions_toolkit
+from github.GithubException import UnknownObjectException
+from github.Repository import Repository
+
+from repo_manager.utils import get_inputs
+
+FINGERPRINT_VARIABLE = "REPO_MANAGER_SECRET_FINGERPRINTS"
+
+
+def timestamp(value: datetime | str | None) -> str | None:
+    """``updated_at`` as GitHub writes it in JSON, whether PyGithub parsed it or not"""
+    if isinstance(value, datetime):
+        return value.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    return value
+
+
+class SecretFingerprintStore:
+    """Thread-safe map of (repository, scope, secret name) to the fingerprint of the value applied.
+
+    Args:
+        key: HMAC key the fingerprints are computed with
+        state_file: JSON file holding the fingerprints of every repository; None keeps them
+            in the ``FINGERPRINT_VARIABLE`` Actions variable of each repository instead
+    """
+
+    def __init__(self, key: str, state_file: Path | str | None = None):
+        self._key = key.encode("utf-8")
+        self.state_file = Path(state_file) if state_file else None
+        self._lock = threading.Lock()
+        self._records: dict[str, dict[str, dict[str, str]]] | None = None if self.state_file else {}
+        self._variable_exists: set[str] = set()
+        self._dirty: set[str] = set()
+
+    def fingerprint(self, scope: str, name: str, value: str) -> str:
+        message = "\0".join((scope, name, value)).encode("utf-8")
+        # 128 bits is plenty for a keyed digest and keeps hundreds of records under the 48 KB variable limit
+        return hmac.new(self._key, message, hashlib.sha256).hexdigest()[:32]
+
+    def matches(self, repo: Repository, scope: str, name: str, value: str, updated_at: str | None) -> bool:
+        """True if ``value`` was the last one applied and the secret has not been written since"""
+        record = self._records_for(repo).get(f"{scope}/{name}")
+        if record is None or updated_at is None or record["updated_at"] != updated_at:
+            return False
+        return hmac.compare_digest(record["hmac"], self.fingerprint(scope, name, value))
+
+    def record(self, repo: Repository, scope: str, name: str, value: str, updated_at: str | None) -> None:
+        if updated_at is None:
+            self.forget(repo, scope, name)
+            return
+        records = self._records_for(repo)
+        with self._lock:
+            records[f"{scope}/{name}"] = {"hmac": self.fingerprint(scope, name, value), "updated_at": updated_at}
+            self._dirty.add(repo.full_name)
+
+    def forget(self, repo: Repository, scope: str, name: str) -> None:
+        records = self._records_for(repo)
+        with self._lock:
+            if records.pop(f"{scope}/{name}", None) is not None:
+                self._dirty.add(repo.full_name)
+
+    def save(self, repo: Repository) -> None:
+        """Persist the fingerprints of ``repo`` if they changed; a failed save only costs a re-PUT next run"""
+        with self._lock:
+            if repo.full_name not in self._dirty:
+                return
+            self._dirty.discard(repo.full_name)
+            try:
+                if self.state_file:
+                    # the file holds every repository, so it is written whole and under the lock
+                    self.state_file.parent.mkdir(parents=True, exist_ok=True)
+                    tmp = self.state_file.with_suffix(f".{os.getpid()}.tmp")
+                    tmp.write_text(json.dumps(self._records, sort_keys=True))
+                    os.replace(tmp, self.state_file)
+                    return
+            except OSError as exc:
+                actions_toolkit.warning(f"Could not save the secret fingerprints to {self.state_file}: {exc}")
+                return
+            value = json.dumps(self._records[repo.full_name], sort_keys=True, separators=(",", ":"))
+        try:
+            self._save_variable(repo, value)
+        except Exception as exc:
+            actions_toolkit.warning(f"Could not save the secret fingerprints of {repo.full_name}: {exc}")
+
+    def _records_for(self, repo: Repository) -> dict[str, dict[str, str]]:
+        with self._lock:
+            if self._records is None:
+                self._records = self._load_file()
+            records = self._records.get(repo.full_name)
+        if records is None:
+            # loaded outside the lock so repositories load in parallel; the first load wins
+            loaded = {} if self.state_file else self._load_variable(repo)
+            with self._lock:
+                records = self._records.setdefault(repo.full_name, loaded)
+        return records
+
+    def _load_file(self) -> dict[str, dict[str, dict[str, str]]]:
+        try:
+            return json.loads(self.state_file.read_text())
+        except OSError, ValueError:
+            return {}
+
+    def _load_variable(self, repo: Repository) -> dict[str, dict[str, str]]:
+        try:
+            _, data = repo._requester.requestJsonAndCheck(
+                "GET", f"/repos/{repo.full_name}/actions/variables/{FINGERPRINT_VARIABLE}"
+            )
+        except UnknownObjectException:
+            return {}
+        with self._lock:
+            self._variable_exists.add(repo.full_name)
+        try:
+            return json.loads(data["value"])
+        except KeyError, TypeError, ValueError:
+            return {}
+
+    def _save_variable(self, repo: Repository, value: str) -> None:
+        base = f"/repos/{repo.full_name}/actions/variables"
+        if repo.full_name in self._variable_exists:
+            repo._requester.requestJsonAndCheck("PATCH", f"{base}/{FINGERPRINT_VARIABLE}", input={"value": value})
+        else:
+            repo._requester.requestJsonAndCheck("POST", base, input={"name": FINGERPRINT_VARIABLE, "value": value})
+            with self._lock:
+                self._variable_exists.add(repo.full_name)
+
+
+_store: SecretFingerprintStore | None = None
+_configured = False
+_configure_lock = threading.Lock()
+
+
+def get_secret_fingerprints() -> SecretFingerprintStore | None:
+    """The run's fingerprint store, or None when ``secret_fingerprint_key`` is not set"""
+    global _store, _configured
+    with _configure_lock:
+        if not _configured:
+            inputs: dict[str, Any] = get_inputs()
+            key = inputs.get("secret_fingerprint_key")
+            if key:
+                location = inputs.get("secret_fingerprint_store") or "variable"
+                _store = SecretFingerprintStore(key, None if location == "variable" else location)
+            _configured = True
+    return _store
+
+
+def configure_secret_fingerprints(store: SecretFingerprintStore | None) -> None:
+    """Replace the store used from now on (None disables fingerprinting)"""
+    global _store, _configured
+    with _configure_lock:
+        _store, _configured = store, True
+
+
+__all__ = [
+    "FINGERPRINT_VARIABLE",
+    "SecretFingerprintStore",
+    "configure_secret_fingerprints",
+    "get_secret_fingerprints",
+    "timestamp",
+]
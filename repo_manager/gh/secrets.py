@@ -1,14 +1,18 @@
+from functools import partial
 from typing import Any
 
 from actions_toolkit import core as actions_toolkit
 
 from github import GithubException
 from github.Auth import AppInstallationAuth
-from github.PublicKey import PublicKey
 from github.Repository import Repository
 
-from repo_manager.utils import get_permissions
-from repo_manager.schemas.secret import Secret
+from repo_manager.utils import get_parallelism, get_permissions
+from repo_manager.utils.concurrency import run_concurrently
+from repo_manager.schemas.secret import Secret, SecretEnvError
+
+from .public_keys import put_secret
+from .secret_fingerprints import SecretFingerprintStore, get_secret_fingerprints, timestamp
 
 
 def __verify_dependabot_access__(repo: Repository) -> bool:
@@ -30,34 +34,68 @@ def __verify_secret_access__(repo: Repository) -> bool:
     return True
 
 
-def __get_repo_secret_names__(repo: Repository, path: str = "actions") -> set[str]:
-    """Gets the names of the secrets in a repo"""
+def __get_repo_secrets__(repo: Repository, path: str = "actions") -> dict[str, str | None]:
+    """Gets the names of the secrets in a repo, with when each was last updated"""
     if path == "dependabot":
         __verify_dependabot_access__(repo)
     elif isinstance(repo._requester.auth, AppInstallationAuth):
         __verify_secret_access__(repo)
     if path in ["actions", "dependabot"]:
-        return {secret.name for secret in repo.get_secrets(path)}
+        return {secret.name: timestamp(secret.updated_at) for secret in repo.get_secrets(path)}
     else:
         # Environment secrets require /repositories/{id}/... URL path
         env_name = path.replace("environments/", "") if path.startswith("environments/") else path
         _, data = repo._requester.requestJsonAndCheck("GET", f"/repositories/{repo.id}/environments/{env_name}/secrets")
-        return {s["name"] for s in data.get("secrets", [])}
-
-
-def __create_environment_secret__(repo: Repository, env_name: str, secret_name: str, secret_value: str) -> None:
-    """Creates or updates an environment secret using the repository-ID-based URL required by GitHub API."""
-    # GitHub's environment secrets endpoint requires /repositories/{id}/... not /repos/{owner}/{repo}/...
-    base_url = f"/repositories/{repo.id}/environments/{env_name}"
-    # Fetch the environment public key
-    _, key_data = repo._requester.requestJsonAndCheck("GET", f"{base_url}/secrets/public-key")
-    public_key = PublicKey(repo._requester, {}, attributes=key_data, completed=True)
-    encrypted = public_key.encrypt(secret_value)
-    repo._requester.requestJsonAndCheck(
-        "PUT",
-        f"{base_url}/secrets/{secret_name}",
-        input={"key_id": public_key.key_id, "encrypted_value": encrypted},
-    )
+        return {s["name"]: s.get("updated_at") for s in data.get("secrets", [])}
+
+
+def __secrets_url__(repo: Repository, secret_type: str) -> str:
+    if secret_type in ["actions", "dependabot"]:
+        return f"/repos/{repo.full_name}/{secret_type}/secrets"
+    env_name = secret_type.replace("environments/", "")
+    return f"/repositories/{repo.id}/environments/{env_name}/secrets"
+
+
+def __get_secret_updated_at__(repo: Repository, secret: Secret) -> str | None:
+    """Re-read a secret after writing it; the PUT does not return the new updated_at"""
+    try:
+        _, data = repo._requester.requestJsonAndCheck("GET", f"{__secrets_url__(repo, secret.type)}/{secret.key}")
+    except GithubException:
+        return None
+    return data.get("updated_at")
+
+
+def __is_unchanged__(repo: Repository, secret: Secret, updated_at: str | None) -> bool:
+    """True if fingerprinting is on and the secret still holds the value we last applied"""
+    fingerprints = get_secret_fingerprints()
+    if fingerprints is None:
+        return False
+    try:
+        value = secret.expected_value
+    except SecretEnvError:
+        return False  # the update reports the missing env var
+    return fingerprints.matches(repo, secret.type, secret.key, value, updated_at)
+
+
+def __create_secret__(repo: Repository, secret_type: str, secret_name: str, secret_value: str) -> None:
+    """Creates or updates a secret, sealed with the scope's public key (fetched once per run)"""
+    put_secret(repo._requester, __secrets_url__(repo, secret_type), secret_name, secret_value)
+
+
+def __apply_secret__(
+    repo: Repository, secret: Secret, issue_type: str, fingerprints: SecretFingerprintStore | None
+) -> None:
+    if issue_type in ["missing", "diff"]:
+        value = secret.expected_value
+        __create_secret__(repo, secret.type, secret.key, value)
+        actions_toolkit.info(f"Set {secret.key} to expected value")
+        if fingerprints is not None:
+            fingerprints.record(repo, secret.type, secret.key, value, __get_secret_updated_at__(repo, secret))
+    if issue_type == "extra":
+        repo._requester.requestJsonAndCheck("DELETE", f"{__secrets_url__(repo, secret.type)}/{secret.key}")
+        actions_toolkit.info(f"Deleted {secret.key}")
+        if fingerprints is not None:
+            fingerprints.forget(repo, secret.type, secret.key)
 
 
 def check_repo_secrets(repo: Repository, secrets: list[Secret]) -> tuple[bool, dict[str, list[str] | dict[str, Any]]]:
@@ -71,18 +109,15 @@ def check_repo_secrets(repo: Repository, secrets: list[Secret]) -> tuple[bool, d
         Tuple[bool, Optional[List[str]]]: [description]
     """
     diff = {}
-    repo_secret_names = set[str]()
+    repo_secrets = dict[str, str | None]()
     if any(filter(lambda secret: secret.type == "actions", secrets)):
-        repo_secret_names.update(__get_repo_secret_names__(repo))
+        repo_secrets.update(__get_repo_secrets__(repo))
     if any(filter(lambda secret: secret.type == "dependabot", secrets)):
-        repo_secret_names.update(__get_repo_secret_names__(repo, "dependabot"))
-    if any(filter(lambda secret: secret.type not in {"actions", "dependabot"}, secrets)):
-        first_secret = next(
-            filter(lambda secret: secret.type not in {"actions", "dependabot"}, secrets),
-            None,
-        )
-        if first_secret is not None:
-            repo_secret_names.update(__get_repo_secret_names__(repo, first_secret.type.replace("environments/", "")))
+        repo_secrets.update(__get_repo_secrets__(repo, "dependabot"))
+    # each environment's secrets come from that environment's own listing
+    for env_type in sorted({secret.type for secret in secrets} - {"actions", "dependabot"}):
+        repo_secrets.update(__get_repo_secrets__(repo, env_type.replace("environments/", "")))
+    repo_secret_names = set(repo_secrets)
 
     expected_secrets_names = {secret.key for secret in filter(lambda secret: secret.exists, secrets)}
 
@@ -98,9 +133,14 @@ def check_repo_secrets(repo: Repository, secrets: list[Secret]) -> tuple[bool, d
     if len(extra) > 0:
         diff["extra"] = extra
 
-    existing = list(
-        repo_secret_names.intersection({secret.key for secret in filter(lambda secret: secret.exists, secrets)})
-    )
+    # secrets whose fingerprint shows they still hold the configured value are not drift
+    existing = [
+        secret.key
+        for secret in secrets
+        if secret.exists
+        and secret.key in repo_secret_names
+        and not __is_unchanged__(repo, secret, repo_secrets[secret.key])
+    ]
 
     if len(existing) > 0:
         diff["diff"] = existing
@@ -127,39 +167,25 @@ def update_secrets(
     """
     errors = []
     secret_dict = {secret.key: secret for secret in secrets}
-    for issue_type in diffs.keys():
-        for secret_name in diffs[issue_type]:
-            try:
-                if issue_type in ["missing", "diff"]:
-                    if secret_dict[secret_name].type in ["actions", "dependabot"]:
-                        repo.create_secret(
-                            secret_name, secret_dict[secret_name].expected_value, secret_dict[secret_name].type
-                        )
-                    else:
-                        env_name = secret_dict[secret_name].type.replace("environments/", "")
-                        __create_environment_secret__(
-                            repo, env_name, secret_name, secret_dict[secret_name].expected_value
-                        )
-                    # create_secret(repo, secret.key, secret.expected_value, secret.type)
-                    actions_toolkit.info(f"Set {secret_name} to expected value")
-                if issue_type == "extra":
-                    if secret_dict[secret_name].type in ["actions", "dependabot"]:
-                        repo.delete_secret(secret_name, secret_dict[secret_name].type)
-                    else:
-                        env_name = secret_dict[secret_name].type.replace("environments/", "")
-                        repo._requester.requestJsonAndCheck(
-                            "DELETE",
-                            f"/repositories/{repo.id}/environments/{env_name}/secrets/{secret_name}",
-                        )
-                    # delete_secret(repo, secret.key, secret.type)
-                    actions_toolkit.info(f"Deleted {secret_name}")
-            except Exception as exc:  # this should be tighter
-                if secret_dict[secret_name].required:
-                    errors.append(
-                        {
-                            "type": "secret-update",
-                            "key": secret_name,
-                            "error": f"{exc}",
-                        }
-                    )
+    fingerprints = get_secret_fingerprints()
+    # each task seals and writes one secret; the transport still bounds how many writes are in flight
+    to_apply = [(issue_type, secret_name) for issue_type in diffs.keys() for secret_name in diffs[issue_type]]
+    outcomes = run_concurrently(
+        [
+            partial(__apply_secret__, repo, secret_dict[secret_name], issue_type, fingerprints)
+            for issue_type, secret_name in to_apply
+        ],
+        max_workers=get_parallelism(),
+    )
+    for (_, secret_name), (_, exc) in zip(to_apply, outcomes):
+        if exc is not None and secret_dict[secret_name].required:
+            errors.append(
+                {
+                    "type": "secret-update",
+                    "key": secret_name,
+                    "error": f"{exc}",
+                }
+            )
+    if fingerprints is not None:
+        fingerprints.save(repo)
     return errors, []
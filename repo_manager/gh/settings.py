@@ -1,13 +1,95 @@
+import threading
+from collections.abc import Callable
+from functools import partial
 from typing import Any
 
+from actions_toolkit import core as actions_toolkit
 
 from github.Auth import AppInstallationAuth
-from github.GithubException import GithubException
+from github.GithubException import GithubException, UnknownObjectException
 from github.Repository import Repository
 
-from repo_manager.utils import attr_to_kwarg, get_permissions
+from repo_manager.utils import attr_to_kwarg, get_owner_repos, get_permissions
 from repo_manager.schemas.settings import Settings
 
+from .snapshot import get_snapshot
+
+# Settings every entry of the owner's repository listing carries under the same name.  The
+# merge settings are only listed for some tokens, so a listing without them is not relied on.
+_LISTED_SETTINGS = (
+    "description",
+    "homepage",
+    "topics",
+    "private",
+    "has_issues",
+    "has_projects",
+    "has_wiki",
+    "default_branch",
+    "allow_squash_merge",
+    "allow_merge_commit",
+    "allow_rebase_merge",
+    "delete_branch_on_merge",
+)
+
+_listed: dict[str, dict[str, Any]] = {}
+_listed_lock = threading.Lock()
+
+
+def scan_repo_settings(repos: list[Repository], settings: Settings) -> list[Repository]:
+    """Read the settings of ``repos`` from their owner's repository listing.
+
+    The listing is the one ``get_fleet_repos`` already fetched to expand glob targets, so each
+    owner is listed at most once per run.  ``check_repo_settings`` then compares against the
+    listing instead of reading each repository.
+    Returns the repositories the listing did not cover for every configured setting, which still
+    need the snapshot (or their own requests) for the rest.
+    """
+    wanted = [name for name in _LISTED_SETTINGS if getattr(settings, name) is not None]
+    by_owner: dict[str, list[Repository]] = {}
+    for repo in repos:
+        by_owner.setdefault(repo.owner.login, []).append(repo)
+
+    uncovered = []
+    for owner, owned in by_owner.items():
+        try:
+            # the raw listing entry; reading ``raw_data`` would complete (GET) each repository
+            rows = {listed.full_name.lower(): listed._rawData for listed in get_owner_repos(owner)}
+        except Exception as exc:
+            actions_toolkit.debug(f"Listing the repositories of {owner} failed, reading them one by one: {exc}")
+            uncovered.extend(owned)
+            continue
+        for repo in owned:
+            row = rows.get(repo.full_name.lower(), {})
+            if any(name not in row for name in wanted):
+                uncovered.append(repo)
+            if row:
+                with _listed_lock:
+                    _listed[repo.full_name] = {name: row[name] for name in _LISTED_SETTINGS if name in row}
+    return uncovered
+
+
+def get_listed_settings(repo: Repository) -> dict[str, Any] | None:
+    """Return the settings read for ``repo`` from its owner's repository listing this run, if any"""
+    with _listed_lock:
+        return _listed.get(repo.full_name)
+
+
+def __vulnerability_alerts__(repo: Repository) -> bool | None:
+    """Whether vulnerability alerts are enabled, or None when that cannot be read"""
+    status, _, _ = repo._requester.requestJson("GET", f"{repo.url}/vulnerability-alerts")
+    return {204: True, 404: False}.get(status)
+
+
+def __automated_security_fixes__(repo: Repository) -> bool | None:
+    """Whether automated security fixes are enabled, or None when that cannot be read"""
+    try:
+        return repo.get_automated_security_fixes().get("enabled")
+    except UnknownObjectException:
+        return False
+    except GithubException as exc:
+        actions_toolkit.debug(f"Unable to read automated security fixes of {repo.full_name}: {exc}")
+        return None
+
 
 def check_repo_settings(repo: Repository, settings: Settings) -> tuple[bool, list[str | None]]:
     """Checks a repo's settings vs our expected settings
@@ -30,11 +112,21 @@ def check_repo_settings(repo: Repository, settings: Settings) -> tuple[bool, lis
             403, None, None, f"Unable to access repository settings with OAUTH of {repo._requester.oauth_scopes}"
         )
 
+    snapshot = get_snapshot(repo)
+    snapshot_settings = snapshot.settings if snapshot is not None else None
+    listed_settings = get_listed_settings(repo)
+
     def get_repo_value(setting_name: str, repo: Repository) -> Any | None:
-        """Get a value from the repo object"""
+        """Get a value from the GraphQL snapshot or the owner's repository listing, or else the repo object"""
+        if snapshot_settings is not None and setting_name in snapshot_settings:
+            return snapshot_settings[setting_name]
+        if listed_settings is not None and setting_name in listed_settings:
+            return listed_settings[setting_name]
         getter_val = SETTINGS[setting_name].get("get", setting_name)
         if getter_val is None:
             return None
+        if callable(getter_val):
+            return getter_val(repo)
         getter = getattr(repo, getter_val)
         if not callable(getter):
             return getter
@@ -44,14 +136,14 @@ def check_repo_settings(repo: Repository, settings: Settings) -> tuple[bool, lis
     diffs = {}
     checked = True
     for setting_name in settings.model_dump().keys():
-        repo_value = get_repo_value(setting_name, repo)
         settings_value = getattr(settings, setting_name)
-        # These are dependabot settings and access to them needs to be modified; not part of settings
-        if setting_name in ["enable_automated_security_fixes", "enable_vulnerability_alerts"]:
-            continue
         # We don't want to flag differences omitted in the YAML file
         if settings_value is None:
             continue
+        repo_value = get_repo_value(setting_name, repo)
+        # The dependabot settings need extra access; one that cannot be read is not reported
+        if setting_name in ["enable_automated_security_fixes", "enable_vulnerability_alerts"] and repo_value is None:
+            continue
         if repo_value != settings_value:
             diffs[setting_name] = {
                 "expected": settings_value,
@@ -65,92 +157,99 @@ def check_repo_settings(repo: Repository, settings: Settings) -> tuple[bool, lis
     return checked, None
 
 
+def plan_settings_update(settings: Settings, diffs: dict[str, Any]) -> list[tuple[str, Callable, Any]]:
+    """Turn the diffs of ``check_repo_settings`` into the fewest calls that reconcile them.
+
+    Every drifted setting ``repo.edit`` takes is sent in one edit; the settings with their own
+    endpoint (``SETTINGS[...]["set"]``) are set only when they drifted.
+
+    Returns:
+        List[Tuple[str, Callable, Any]]: (name of the call, function taking the repo and the value, value)
+    """
+    edit_kwargs = {"name": None}
+    calls = []
+    for setting_name in SETTINGS:
+        if setting_name not in diffs or getattr(settings, setting_name) is None:
+            continue
+        setter = SETTINGS[setting_name].get("set")
+        if callable(setter):
+            calls.append((setting_name, partial(setter, setting_name=setting_name), getattr(settings, setting_name)))
+        else:
+            attr_to_kwarg(setting_name, settings, edit_kwargs)
+    if len(edit_kwargs) > 1:
+        calls.insert(0, ("edit", lambda repo, new_value: repo.edit(**new_value), edit_kwargs))
+    return calls
+
+
 def update_settings(
     repo: Repository,
     settings: Settings,
     diffs: tuple[dict[str, list[str] | dict[str, Any]]],
 ) -> tuple[set[str], set[str]]:
+    """Apply only the calls ``plan_settings_update`` plans for ``diffs``, reporting each call issued"""
     errors = []
-    kwargs = {"name": None}
-
-    attr_to_kwarg("description", settings, kwargs)
-    attr_to_kwarg("homepage", settings, kwargs)
-    attr_to_kwarg("private", settings, kwargs)
-    attr_to_kwarg("has_issues", settings, kwargs)
-    attr_to_kwarg("has_projects", settings, kwargs)
-    attr_to_kwarg("has_wiki", settings, kwargs)
-    # attr_to_kwarg("has_downloads", settings, kwargs) -- this was removed from the schema
-    attr_to_kwarg("default_branch", settings, kwargs)
-    attr_to_kwarg("allow_squash_merge", settings, kwargs)
-    attr_to_kwarg("allow_merge_commit", settings, kwargs)
-    attr_to_kwarg("allow_rebase_merge", settings, kwargs)
-    attr_to_kwarg("delete_branch_on_merge", settings, kwargs)
-    repo.edit(**kwargs)
-
-    if settings.enable_automated_security_fixes is not None:
-        if settings.enable_automated_security_fixes:
-            repo.enable_automated_security_fixes()
+    messages = []
+    for call_name, call, new_value in plan_settings_update(settings, diffs):
+        call(repo, new_value=new_value)
+        if call_name == "edit":
+            messages.append(f"edit: {', '.join(key for key in new_value if key != 'name')}")
         else:
-            repo.disable_automated_security_fixes()
-
-    if settings.enable_vulnerability_alerts is not None:
-        if settings.enable_vulnerability_alerts:
-            repo.enable_vulnerability_alert()
-        else:
-            repo.disable_vulnerability_alert()
-
-    if settings.topics is not None:
-        repo.replace_topics(settings.topics)
-
-    return errors, []
+            messages.append(f"{call_name}: {new_value}")
+    return errors, messages
 
 
 def update(repo: Repository, setting_name: str, new_value: Any):
-    """[summary]
+    """Set one setting ``repo.edit`` takes
 
     Args:
-        repo (Repository): [description]
-        setting_name (str): [description]
-        new_value (Any): [description]
+        repo (Repository): Repository to update
+        setting_name (str): Name of the setting, as in Settings
+        new_value (Any): Value to set
     """
-    ...
+    repo.edit(name=None, **{setting_name: new_value})
 
 
 def set_topics(repo: Repository, setting_name: str, new_value: Any):
-    """[summary]
+    """Replace the topics of the repository
 
     Args:
-        repo (Repository): [description]
-        setting_name (str): [description]
-        new_value (Any): [description]
+        repo (Repository): Repository to update
+        setting_name (str): Always "topics"
+        new_value (Any): Topics to set
     """
-    ...
+    repo.replace_topics(new_value)
 
 
 def set_security_fixes(repo: Repository, setting_name: str, new_value: Any):
-    """[summary]
+    """Enable or disable automated security fixes
 
     Args:
-        repo (Repository): [description]
-        setting_name (str): [description]
-        new_value (Any): [description]
+        repo (Repository): Repository to update
+        setting_name (str): Always "enable_automated_security_fixes"
+        new_value (Any): True to enable, False to disable
     """
-    ...
+    if new_value:
+        repo.enable_automated_security_fixes()
+    else:
+        repo.disable_automated_security_fixes()
 
 
 def set_vuln_alerts(repo: Repository, setting_name: str, new_value: Any):
-    """[summary]
+    """Enable or disable vulnerability alerts
 
     Args:
-        repo (Repository): [description]
-        setting_name (str): [description]
-        new_value (Any): [description]
+        repo (Repository): Repository to update
+        setting_name (str): Always "enable_vulnerability_alerts"
+        new_value (Any): True to enable, False to disable
     """
-    ...
+    if new_value:
+        repo.enable_vulnerability_alert()
+    else:
+        repo.disable_vulnerability_alert()
 
 
 # "name_of_setting_from_repo_manager.schemas.settings.Settings": {
-#   Optional entry, a method to call on the repo object to get a setting.
+#   Optional entry, a method to call on the repo object to get a setting, or a function called with the repo.
 #   Default is the name of the setting
 #   If the value of repo.getatter(get) is a callable, we'll call it to get the result
 #   "get": "get_setting"
@@ -172,8 +271,8 @@ SETTINGS = {
     "allow_merge_commit": {},
     "allow_rebase_merge": {},
     "delete_branch_on_merge": {"set": ""},
-    # Checks set to none are for values that there are no api endpoints to get
-    # Like the security and vulnerability alerts
-    "enable_automated_security_fixes": {"get": None, "set": set_security_fixes},
-    "enable_vulnerability_alerts": {"get": None, "set": set_vuln_alerts},
+    # The security and vulnerability alerts have their own endpoints, read by these functions.
+    # Automated security fixes need vulnerability alerts, so the alerts are set first.
+    "enable_vulnerability_alerts": {"get": __vulnerability_alerts__, "set": set_vuln_alerts},
+    "enable_automated_security_fixes": {"get": __automated_security_fixes__, "set": set_security_fixes},
 }
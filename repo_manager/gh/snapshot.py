@@ -0,0 +1,340 @@
+"""Batched GraphQL snapshot of the repository state compared by the check_* functions.
+
+Settings, topics, labels, user collaborators, environment names and the configured
+branches with their protection rules are read for several repositories at once with one
+aliased GraphQL query, instead of one paginated REST listing (or one request per branch)
+per category and repository.  The results are turned into the same PyGithub objects the
+REST listings return, so the checks compare against them unchanged.
+
+A snapshot is only an optimisation: when a section cannot be read (missing permission,
+older GitHub Enterprise Server, network error) it is left as None and the check falls back
+to its REST listing, which reports the problem the way it always has.
+"""
+
+import threading
+from dataclasses import dataclass
+from typing import Any
+from urllib.parse import quote
+
+from actions_toolkit import core as actions_toolkit
+from github.Branch import Branch
+from github.BranchProtection import BranchProtection
+from github.Label import Label
+from github.NamedUser import NamedUser
+from github.Repository import Repository
+
+# Repositories per aliased query; keeps each query well under GitHub's node and timeout limits
+_REPOS_PER_QUERY = 10
+_PAGE_SIZE = 100
+
+# GraphQL collaborator role -> REST permissions flags
+_ROLE_PERMISSIONS = {
+    "ADMIN": {"admin": True, "maintain": True, "push": True, "triage": True, "pull": True},
+    "MAINTAIN": {"admin": False, "maintain": True, "push": True, "triage": True, "pull": True},
+    "WRITE": {"admin": False, "maintain": False, "push": True, "triage": True, "pull": True},
+    "TRIAGE": {"admin": False, "maintain": False, "push": False, "triage": True, "pull": True},
+    "READ": {"admin": False, "maintain": False, "push": False, "triage": False, "pull": True},
+}
+
+# Paginated connections in the snapshot and the fields read from each node
+_CONNECTIONS = {
+    "labels": "nodes { name color description }",
+    "collaborators": "edges { permission node { login } }",
+    "environments": "nodes { name }",
+}
+
+
+def __connection__(name: str, after: str | None = None) -> str:
+    """Selection for one page of a paginated connection, starting after the ``after`` cursor variable"""
+    args = f"first: {_PAGE_SIZE}" if after is None else f"first: {_PAGE_SIZE}, after: {after}"
+    return f"{name}({args}) {{ pageInfo {{ hasNextPage endCursor }} {_CONNECTIONS[name]} }}"
+
+
+# Fields of a branch protection rule, mapped to the REST shape in __branch_protection__
+_PROTECTION_RULE = f"""branchProtectionRule {{
+      requiresApprovingReviews
+      requiredApprovingReviewCount
+      dismissesStaleReviews
+      requiresCodeOwnerReviews
+      restrictsReviewDismissals
+      reviewDismissalAllowances(first: {_PAGE_SIZE}) {{
+        nodes {{ actor {{ __typename ... on User {{ login name }} ... on Team {{ slug name }} }} }}
+      }}
+      requiresStatusChecks
+      requiresStrictStatusChecks
+      requiredStatusCheckContexts
+      isAdminEnforced
+      requiresLinearHistory
+      allowsForcePushes
+      allowsDeletions
+      requiresConversationResolution
+      requiresCommitSignatures
+    }}"""
+
+
+def __branch_alias__(index: int) -> str:
+    return f"branch{index}"
+
+
+def __snapshot_fragment__(branch_count: int) -> str:
+    """The snapshot selection, reading ``branch_count`` branches passed as ``$branch{i}`` ref names"""
+    branches = "\n".join(
+        f"  {__branch_alias__(i)}: ref(qualifiedName: ${__branch_alias__(i)}) {{ name {_PROTECTION_RULE} }}"
+        for i in range(branch_count)
+    )
+    return f"""
+fragment RepoSnapshot on Repository {{
+  nameWithOwner
+  description
+  homepageUrl
+  isPrivate
+  hasIssuesEnabled
+  hasProjectsEnabled
+  hasWikiEnabled
+  squashMergeAllowed
+  mergeCommitAllowed
+  rebaseMergeAllowed
+  deleteBranchOnMerge
+  defaultBranchRef {{ name }}
+  repositoryTopics(first: {_PAGE_SIZE}) {{ nodes {{ topic {{ name }} }} }}
+  {__connection__("labels")}
+  {__connection__("collaborators")}
+  {__connection__("environments")}
+{branches}
+}}
+"""
+
+
+@dataclass
+class RepoSnapshot:
+    """State of one repository as read from GraphQL; None means 'not available, use REST'"""
+
+    settings: dict[str, Any] | None = None
+    labels: list[Label] | None = None
+    collaborators: list[NamedUser] | None = None
+    environment_names: set[str] | None = None
+    # configured branch name -> Branch, or None when the branch does not exist
+    branches: dict[str, Branch | None] | None = None
+    # protection of every protected branch in ``branches``
+    branch_protections: dict[str, BranchProtection] | None = None
+
+
+_snapshots: dict[str, RepoSnapshot] = {}
+_lock = threading.Lock()
+
+
+def get_snapshot(repo: Repository) -> RepoSnapshot | None:
+    """Return the snapshot prefetched for ``repo`` this run, if any"""
+    with _lock:
+        return _snapshots.get(repo.full_name)
+
+
+def __graphql__(repo: Repository, query: str, variables: dict[str, Any]) -> tuple[dict[str, Any], list[dict]]:
+    """POST a GraphQL query, returning the (possibly partial) data and any field errors.
+
+    Requester.graphql_query raises as soon as any field errors, which would throw away every
+    other repository and section in the batch, so the request is made directly.
+    """
+    _, response = repo._requester.requestJsonAndCheck(
+        "POST", repo._requester.graphql_url, input={"query": query, "variables": variables}
+    )
+    return response.get("data") or {}, response.get("errors") or []
+
+
+def __fetch_remaining_pages__(repo: Repository, name: str, connection: dict[str, Any]) -> list[dict]:
+    """Follow a connection past its first page, one query per additional page"""
+    items = list(connection.get("nodes") or connection.get("edges") or [])
+    page_info = connection["pageInfo"]
+    query = (
+        "query($owner: String!, $name: String!, $after: String) {\n"
+        "  repository(owner: $owner, name: $name) {\n"
+        f"    {__connection__(name, '$after')}\n"
+        "  }\n"
+        "}\n"
+    )
+    while page_info["hasNextPage"]:
+        data, errors = __graphql__(
+            repo, query, {"owner": repo.owner.login, "name": repo.name, "after": page_info["endCursor"]}
+        )
+        if errors:
+            raise RuntimeError(f"Unable to page through {name} of {repo.full_name}: {errors}")
+        page = data["repository"][name]
+        items.extend(page.get("nodes") or page.get("edges") or [])
+        page_info = page["pageInfo"]
+    return items
+
+
+def __branch_protection__(repo: Repository, protection_url: str, rule: dict[str, Any]) -> BranchProtection:
+    """Build the BranchProtection the REST API would return for a GraphQL branch protection rule"""
+    attributes = {
+        "url": protection_url,
+        "enforce_admins": {"enabled": rule["isAdminEnforced"]},
+        "required_linear_history": {"enabled": rule["requiresLinearHistory"]},
+        "allow_force_pushes": {"enabled": rule["allowsForcePushes"]},
+        "allow_deletions": {"enabled": rule["allowsDeletions"]},
+        "required_conversation_resolution": {"enabled": rule["requiresConversationResolution"]},
+        "required_signatures": {"enabled": rule["requiresCommitSignatures"]},
+        "required_pull_request_reviews": None,
+        "required_status_checks": None,
+    }
+    if rule["requiresApprovingReviews"]:
+        actors = [node["actor"] for node in rule["reviewDismissalAllowances"]["nodes"] if node["actor"]]
+        attributes["required_pull_request_reviews"] = {
+            "url": f"{protection_url}/required_pull_request_reviews",
+            "required_approving_review_count": rule["requiredApprovingReviewCount"],
+            "dismiss_stale_reviews": rule["dismissesStaleReviews"],
+            "require_code_owner_reviews": rule["requiresCodeOwnerReviews"],
+            "dismissal_restrictions": {
+                "users": [
+                    {"login": actor["login"], "name": actor["name"]}
+                    for actor in actors
+                    if actor["__typename"] == "User"
+                ],
+                "teams": [
+                    {"slug": actor["slug"], "name": actor["name"]} for actor in actors if actor["__typename"] == "Team"
+                ],
+            }
+            if rule["restrictsReviewDismissals"]
+            else None,
+        }
+    if rule["requiresStatusChecks"]:
+        attributes["required_status_checks"] = {
+            "url": f"{protection_url}/required_status_checks",
+            "strict": rule["requiresStrictStatusChecks"],
+            "contexts": list(rule["requiredStatusCheckContexts"] or []),
+        }
+    return BranchProtection(repo._requester, {}, attributes, completed=True)
+
+
+def __build_branches__(repo: Repository, data: dict[str, Any], branch_names: list[str], snapshot: RepoSnapshot):
+    snapshot.branches = {}
+    snapshot.branch_protections = {}
+    for i, name in enumerate(branch_names):
+        ref = data.get(__branch_alias__(i))
+        if ref is None:
+            snapshot.branches[name] = None
+            continue
+        protection_url = f"{repo.url}/branches/{quote(name, safe='')}/protection"
+        rule = ref["branchProtectionRule"]
+        snapshot.branches[name] = Branch(
+            repo._requester,
+            {},
+            {"name": name, "protected": rule is not None, "protection_url": protection_url},
+        )
+        if rule is not None:
+            snapshot.branch_protections[name] = __branch_protection__(repo, protection_url, rule)
+
+
+def __build_snapshot__(
+    repo: Repository, data: dict[str, Any], failed: set[str], branch_names: list[str] | None = None
+) -> RepoSnapshot:
+    """Turn one repository's GraphQL data into a snapshot, skipping sections that errored"""
+    snapshot = RepoSnapshot()
+    requester = repo._requester
+    branch_names = branch_names or []
+    branch_aliases = {__branch_alias__(i) for i in range(len(branch_names))}
+
+    # any failed field outside the paginated connections and branches makes the settings incomplete
+    if not failed - _CONNECTIONS.keys() - branch_aliases:
+        snapshot.settings = {
+            "description": data["description"],
+            "homepage": data["homepageUrl"],
+            "topics": [node["topic"]["name"] for node in data["repositoryTopics"]["nodes"]],
+            "private": data["isPrivate"],
+            "has_issues": data["hasIssuesEnabled"],
+            "has_projects": data["hasProjectsEnabled"],
+            "has_wiki": data["hasWikiEnabled"],
+            "default_branch": (data["defaultBranchRef"] or {}).get("name"),
+            "allow_squash_merge": data["squashMergeAllowed"],
+            "allow_merge_commit": data["mergeCommitAllowed"],
+            "allow_rebase_merge": data["rebaseMergeAllowed"],
+            "delete_branch_on_merge": data["deleteBranchOnMerge"],
+        }
+
+    if "labels" not in failed and data.get("labels") is not None:
+        snapshot.labels = [
+            Label(
+                requester,
+                {},
+                {**node, "url": f"{repo.url}/labels/{quote(node['name'])}"},
+                completed=True,
+            )
+            for node in __fetch_remaining_pages__(repo, "labels", data["labels"])
+        ]
+
+    if "collaborators" not in failed and data.get("collaborators") is not None:
+        snapshot.collaborators = [
+            NamedUser(
+                requester,
+                {},
+                {
+                    "login": edge["node"]["login"],
+                    "permissions": _ROLE_PERMISSIONS.get(edge["permission"], {}),
+                    "url": f"{requester.base_url}/users/{edge['node']['login']}",
+                },
+                completed=False,
+            )
+            for edge in __fetch_remaining_pages__(repo, "collaborators", data["collaborators"])
+        ]
+
+    if "environments" not in failed and data.get("environments") is not None:
+        snapshot.environment_names = {
+            node["name"] for node in __fetch_remaining_pages__(repo, "environments", data["environments"])
+        }
+
+    if branch_names and not failed & branch_aliases:
+        __build_branches__(repo, data, branch_names, snapshot)
+
+    return snapshot
+
+
+def prefetch_snapshots(repos: list[Repository], branch_names: list[str] | None = None) -> None:
+    """Read the snapshot of every repository, ``_REPOS_PER_QUERY`` repositories per GraphQL query.
+
+    Only the branches in ``branch_names`` are read, not every branch of the repository.
+    Errors are logged and leave the affected repositories (or sections) without a snapshot.
+    """
+    branch_names = list(branch_names or [])
+    fragment = __snapshot_fragment__(len(branch_names))
+    for start in range(0, len(repos), _REPOS_PER_QUERY):
+        batch = repos[start : start + _REPOS_PER_QUERY]
+        params = ", ".join(
+            [f"$o{i}: String!, $n{i}: String!" for i in range(len(batch))]
+            + [f"${__branch_alias__(i)}: String!" for i in range(len(branch_names))]
+        )
+        aliases = "\n".join(
+            f"  r{i}: repository(owner: $o{i}, name: $n{i}) {{ ...RepoSnapshot }}" for i in range(len(batch))
+        )
+        query = f"query({params}) {{\n{aliases}\n}}\n{fragment}"
+        variables = {__branch_alias__(i): f"refs/heads/{name}" for i, name in enumerate(branch_names)}
+        for i, repo in enumerate(batch):
+            variables[f"o{i}"] = repo.owner.login
+            variables[f"n{i}"] = repo.name
+        try:
+            data, errors = __graphql__(batch[0], query, variables)
+        except Exception as exc:
+            actions_toolkit.debug(f"GraphQL snapshot failed, falling back to REST: {exc}")
+            continue
+
+        # errors carry a path like ["r3", "collaborators"]; a path of just ["r3"] fails the whole repo
+        failed: dict[str, set[str]] = {}
+        for error in errors:
+            path = error.get("path") or []
+            actions_toolkit.debug(f"GraphQL snapshot error at {path}: {error.get('message')}")
+            if path:
+                failed.setdefault(path[0], set()).add(path[1] if len(path) > 1 else path[0])
+
+        for i, repo in enumerate(batch):
+            repo_data = data.get(f"r{i}")
+            if repo_data is None:
+                continue
+            try:
+                snapshot = __build_snapshot__(repo, repo_data, failed.get(f"r{i}", set()), branch_names)
+            except Exception as exc:
+                actions_toolkit.debug(f"Unable to build snapshot of {repo.full_name}, falling back to REST: {exc}")
+                continue
+            with _lock:
+                _snapshots[repo.full_name] = snapshot
+
+
+__all__ = ["RepoSnapshot", "get_snapshot", "prefetch_snapshots"]
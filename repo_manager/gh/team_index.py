@@ -0,0 +1,130 @@
+"""Per-run index of an organisation's teams by slug and by parent/child path.
+
+Team collaborators used to be resolved one at a time: the organisation was fetched again for
+every collaborator, and a nested team meant listing every child of its parent to find one
+slug.  The index is built once per organisation, reusing the team matrix when ``check_teams``
+already loaded it and otherwise from a paginated listing of just each team's id, slug, name
+and parent, and resolves ``slug`` or ``parent/slug`` in O(1).  The teams it returns are built
+from the index, so no further request is made until one of them is written to.
+"""
+
+import threading
+from dataclasses import dataclass
+
+from github.Organization import Organization
+from github.Team import Team
+
+from repo_manager.utils import get_org_by_name
+
+from .team_matrix import __graphql__, get_team_matrix
+
+_PAGE_SIZE = 100
+
+_TEAMS_QUERY = f"""query($org: String!, $after: String) {{
+  organization(login: $org) {{
+    teams(first: {_PAGE_SIZE}, after: $after) {{
+      pageInfo {{ hasNextPage endCursor }}
+      nodes {{ databaseId slug name parentTeam {{ slug }} }}
+    }}
+  }}
+}}
+"""
+
+
+@dataclass(frozen=True)
+class TeamRef:
+    """What the index knows about one team"""
+
+    id: int
+    slug: str
+    name: str
+    parent_slug: str | None
+
+
+def __list_teams__(org: Organization) -> list[TeamRef]:
+    """Every team of ``org``, without its members or repositories"""
+    teams = []
+    after = None
+    while True:
+        page = __graphql__(org, _TEAMS_QUERY, {"org": org.login, "after": after})["organization"]["teams"]
+        teams.extend(
+            TeamRef(node["databaseId"], node["slug"], node["name"], (node["parentTeam"] or {}).get("slug"))
+            for node in page["nodes"]
+        )
+        if not page["pageInfo"]["hasNextPage"]:
+            return teams
+        after = page["pageInfo"]["endCursor"]
+
+
+class TeamIndex:
+    """Thread-safe map of (org, slug) and (org, parent slug/slug) to a team"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._orgs: dict[str, tuple[Organization, dict[str, TeamRef]]] = {}
+        self._loading: dict[str, threading.Lock] = {}
+        self.loads = 0
+
+    def find(self, org_login: str, slug: str, parent_slug: str | None = None) -> TeamRef | None:
+        """The team ``slug`` of ``org_login``, which must be a direct child of ``parent_slug`` when one is given"""
+        _, paths = self._paths(org_login)
+        return paths.get(f"{parent_slug}/{slug}" if parent_slug else slug)
+
+    def get_team(self, org_login: str, slug: str, parent_slug: str | None = None) -> Team:
+        """A PyGithub team for ``slug``, built from the index.
+
+        A team the index does not know (created after it was built) is fetched on its own.
+        """
+        org, _ = self._paths(org_login)
+        state = self.find(org_login, slug, parent_slug)
+        if state is None:
+            team = org.get_team_by_slug(slug)
+            if parent_slug and (team.parent is None or team.parent.slug != parent_slug):
+                raise ValueError(f"Child team '{slug}' not found under parent '{parent_slug}'")
+            return team
+        return Team(
+            org._requester,
+            {},
+            {
+                "id": state.id,
+                "slug": state.slug,
+                "name": state.name,
+                "url": f"{org.url}/teams/{state.slug}",
+                "organization": {"login": org.login, "url": org.url},
+            },
+            completed=True,
+        )
+
+    def _paths(self, org_login: str) -> tuple[Organization, dict[str, TeamRef]]:
+        key = org_login.lower()
+        with self._lock:
+            if key in self._orgs:
+                return self._orgs[key]
+            loading = self._loading.setdefault(key, threading.Lock())
+        # one load per org: concurrent lookups wait for the first one
+        with loading:
+            with self._lock:
+                if key in self._orgs:
+                    return self._orgs[key]
+            org = get_org_by_name(org_login)
+            matrix = get_team_matrix(org)
+            if matrix is None:
+                teams = __list_teams__(org)
+            else:
+                teams = [TeamRef(team.id, team.slug, team.name, team.parent_slug) for team in matrix.values()]
+            paths = {team.slug: team for team in teams}
+            paths.update({f"{team.parent_slug}/{team.slug}": team for team in teams if team.parent_slug})
+            with self._lock:
+                self.loads += 1
+                self._orgs[key] = (org, paths)
+                return self._orgs[key]
+
+
+_team_index = TeamIndex()
+
+
+def get_team_index() -> TeamIndex:
+    return _team_index
+
+
+__all__ = ["TeamIndex", "TeamRef", "get_team_index"]
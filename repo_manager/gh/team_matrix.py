@@ -0,0 +1,177 @@
+"""Org-wide matrix of team settings, members, member roles and repository permissions.
+
+Checking a team through REST takes a listing of its members, another of its maintainers and
+a third of its repositories, each paginated, so an org with hundreds of teams needs well
+over a thousand requests per check.  The matrix reads every team of the org with its
+members (and their roles) and repositories (and the team's permission on each) in one
+paginated GraphQL query, 100 teams per page; only a team with more than 100 members or
+repositories needs follow-up pages.  ``check_teams`` then diffs every team in memory.
+
+Users about to be added to teams are resolved in bulk as well: one aliased GraphQL query
+returns the accounts for up to 100 logins, instead of one ``GET /users/{login}`` each.
+"""
+
+import threading
+from dataclasses import dataclass, field
+from typing import Any
+
+from github.NamedUser import NamedUser
+from github.Organization import Organization
+
+_PAGE_SIZE = 100
+
+# GraphQL team repository permission -> REST permission name
+_PERMISSIONS = {"ADMIN": "admin", "MAINTAIN": "maintain", "WRITE": "push", "TRIAGE": "triage", "READ": "pull"}
+# GraphQL team privacy -> REST privacy
+_PRIVACY = {"SECRET": "secret", "VISIBLE": "closed"}
+
+# Paginated connections of a team and the fields read from each edge
+_CONNECTIONS = {
+    "members": ("membership: ALL", "edges { role node { login } }"),
+    "repositories": (None, "edges { permission node { nameWithOwner } }"),
+}
+
+
+def __connection__(name: str, after: str | None = None) -> str:
+    """Selection for one page of a team's paginated connection, starting after the ``after`` cursor variable"""
+    extra, fields = _CONNECTIONS[name]
+    args = ", ".join(arg for arg in (f"first: {_PAGE_SIZE}", extra, after and f"after: {after}") if arg)
+    return f"{name}({args}) {{ pageInfo {{ hasNextPage endCursor }} {fields} }}"
+
+
+_TEAMS_QUERY = f"""query($org: String!, $after: String) {{
+  organization(login: $org) {{
+    teams(first: {_PAGE_SIZE}, after: $after) {{
+      pageInfo {{ hasNextPage endCursor }}
+      nodes {{
+        databaseId
+        slug
+        name
+        description
+        privacy
+        parentTeam {{ slug }}
+        {__connection__("members")}
+        {__connection__("repositories")}
+      }}
+    }}
+  }}
+}}
+"""
+
+
+@dataclass
+class TeamState:
+    """What the matrix knows about one team"""
+
+    id: int
+    slug: str
+    name: str
+    description: str | None
+    privacy: str
+    parent_slug: str | None
+    # login -> "member" | "maintainer"
+    members: dict[str, str] = field(default_factory=dict)
+    # repository full name -> "pull" | "triage" | "push" | "maintain" | "admin"
+    repositories: dict[str, str] = field(default_factory=dict)
+
+
+def __graphql__(org: Organization, query: str, variables: dict[str, Any]) -> dict[str, Any]:
+    _, response = org._requester.requestJsonAndCheck(
+        "POST", org._requester.graphql_url, input={"query": query, "variables": variables}
+    )
+    if response.get("errors"):
+        raise RuntimeError(f"Unable to read the teams of {org.login}: {response['errors']}")
+    return response["data"]
+
+
+def __remaining_edges__(org: Organization, slug: str, name: str, connection: dict[str, Any]) -> list[dict]:
+    """Every edge of a team connection, following it past its first page one query per page"""
+    edges = list(connection["edges"])
+    page_info = connection["pageInfo"]
+    query = (
+        "query($org: String!, $slug: String!, $after: String) {\n"
+        "  organization(login: $org) {\n"
+        f"    team(slug: $slug) {{ {__connection__(name, '$after')} }}\n"
+        "  }\n"
+        "}\n"
+    )
+    while page_info["hasNextPage"]:
+        data = __graphql__(org, query, {"org": org.login, "slug": slug, "after": page_info["endCursor"]})
+        page = data["organization"]["team"][name]
+        edges.extend(page["edges"])
+        page_info = page["pageInfo"]
+    return edges
+
+
+def __team_state__(org: Organization, node: dict[str, Any]) -> TeamState:
+    members = __remaining_edges__(org, node["slug"], "members", node["members"])
+    repositories = __remaining_edges__(org, node["slug"], "repositories", node["repositories"])
+    return TeamState(
+        id=node["databaseId"],
+        slug=node["slug"],
+        name=node["name"],
+        description=node["description"],
+        privacy=_PRIVACY.get(node["privacy"], node["privacy"].lower()),
+        parent_slug=(node["parentTeam"] or {}).get("slug"),
+        members={edge["node"]["login"]: edge["role"].lower() for edge in members},
+        repositories={
+            edge["node"]["nameWithOwner"]: _PERMISSIONS.get(edge["permission"], edge["permission"].lower())
+            for edge in repositories
+        },
+    )
+
+
+def load_team_matrix(org: Organization) -> dict[str, TeamState]:
+    """Every team of ``org`` by slug, with its members and repository permissions"""
+    teams: dict[str, TeamState] = {}
+    after = None
+    while True:
+        page = __graphql__(org, _TEAMS_QUERY, {"org": org.login, "after": after})["organization"]["teams"]
+        for node in page["nodes"]:
+            teams[node["slug"]] = __team_state__(org, node)
+        if not page["pageInfo"]["hasNextPage"]:
+            break
+        after = page["pageInfo"]["endCursor"]
+    with _lock:
+        _matrices[org.login] = teams
+    return teams
+
+
+def get_team_matrix(org: Organization) -> dict[str, TeamState] | None:
+    """The matrix loaded for ``org`` this run, if any"""
+    with _lock:
+        return _matrices.get(org.login)
+
+
+def resolve_users(org: Organization, logins: list[str]) -> dict[str, NamedUser]:
+    """The accounts of ``logins``, resolved with one aliased query per 100 logins; unknown logins are left out"""
+    users: dict[str, NamedUser] = {}
+    unique = list(dict.fromkeys(logins))
+    for start in range(0, len(unique), _PAGE_SIZE):
+        batch = unique[start : start + _PAGE_SIZE]
+        variables = {f"login{i}": login for i, login in enumerate(batch)}
+        query = (
+            "query("
+            + ", ".join(f"$login{i}: String!" for i in range(len(batch)))
+            + ") {\n"
+            + "\n".join(f"  user{i}: user(login: $login{i}) {{ login databaseId }}" for i in range(len(batch)))
+            + "\n}\n"
+        )
+        _, response = org._requester.requestJsonAndCheck(
+            "POST", org._requester.graphql_url, input={"query": query, "variables": variables}
+        )
+        # an unknown login is a field error (NOT_FOUND) with a null alias, not a failed query
+        for i in range(len(batch)):
+            user = (response.get("data") or {}).get(f"user{i}")
+            if user is not None:
+                users[batch[i]] = NamedUser(
+                    org._requester, {}, {"login": user["login"], "id": user["databaseId"]}, completed=True
+                )
+    return users
+
+
+_lock = threading.Lock()
+_matrices: dict[str, dict[str, TeamState]] = {}
+
+
+__all__ = ["TeamState", "get_team_matrix", "load_team_matrix", "resolve_users"]
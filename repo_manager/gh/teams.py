@@ -1,9 +1,14 @@
+import threading
+from functools import partial
 from typing import Any
 
 from actions_toolkit import core as actions_toolkit
 from github.Organization import Organization
 
+from repo_manager.gh.team_matrix import TeamState, get_team_matrix, load_team_matrix, resolve_users
 from repo_manager.schemas.team import Team, TeamMember, TeamRepository
+from repo_manager.utils import get_parallelism
+from repo_manager.utils.concurrency import run_concurrently
 
 
 def _name_to_slug(name: str) -> str:
@@ -14,38 +19,17 @@ def _resolve_repo_full_name(org_login: str, repo_name: str) -> str:
     return repo_name if "/" in repo_name else f"{org_login}/{repo_name}"
 
 
-def _get_team_repo_permission(repo) -> str:
-    perms = repo.permissions
-    if perms is None:
-        return "pull"
-    for level in ("admin", "maintain", "push", "triage"):
-        if getattr(perms, level, False):
-            return level
-    return "pull"
-
-
-def _diff_members(github_team, config_members: list[TeamMember]) -> dict[str, Any]:
-    try:
-        all_members = {m.login for m in github_team.get_members()}
-        maintainers = {m.login for m in github_team.get_members(role="maintainer")}
-    except Exception:
-        return {}
-
+def _diff_members(team: TeamState, config_members: list[TeamMember]) -> dict[str, Any]:
     missing, extra, wrong_role = [], [], {}
     for m in config_members:
         if m.exists is False:
-            if m.username in all_members:
+            if m.username in team.members:
                 extra.append(m.username)
             continue
-        if m.username not in all_members:
+        if m.username not in team.members:
             missing.append(m.username)
-        else:
-            is_maintainer = m.username in maintainers
-            if is_maintainer != (m.role.value == "maintainer"):
-                wrong_role[m.username] = {
-                    "expected": m.role.value,
-                    "found": "maintainer" if is_maintainer else "member",
-                }
+        elif team.members[m.username] != m.role.value:
+            wrong_role[m.username] = {"expected": m.role.value, "found": team.members[m.username]}
 
     diffs: dict[str, Any] = {}
     if missing:
@@ -57,25 +41,18 @@ def _diff_members(github_team, config_members: list[TeamMember]) -> dict[str, An
     return diffs
 
 
-def _diff_repos(org: Organization, github_team, config_repos: list[TeamRepository]) -> dict[str, Any]:
-    try:
-        actual_repos = {repo.full_name: repo for repo in github_team.get_repos()}
-    except Exception:
-        return {}
-
+def _diff_repos(org: Organization, team: TeamState, config_repos: list[TeamRepository]) -> dict[str, Any]:
     missing, extra, wrong_perm = [], [], {}
     for r in config_repos:
         full_name = _resolve_repo_full_name(org.login, r.name)
         if r.exists is False:
-            if full_name in actual_repos:
+            if full_name in team.repositories:
                 extra.append(full_name)
             continue
-        if full_name not in actual_repos:
+        if full_name not in team.repositories:
             missing.append(full_name)
-        else:
-            actual_perm = _get_team_repo_permission(actual_repos[full_name])
-            if actual_perm != r.permission:
-                wrong_perm[full_name] = {"expected": r.permission, "found": actual_perm}
+        elif team.repositories[full_name] != r.permission:
+            wrong_perm[full_name] = {"expected": r.permission, "found": team.repositories[full_name]}
 
     diffs: dict[str, Any] = {}
     if missing:
@@ -88,8 +65,12 @@ def _diff_repos(org: Organization, github_team, config_repos: list[TeamRepositor
 
 
 def check_teams(org: Organization, config_teams: list[Team]) -> tuple[bool, dict[str, Any] | None]:
-    """Check org teams against expected configuration."""
-    existing = {t.slug: t for t in org.get_teams()}
+    """Check org teams against expected configuration.
+
+    Every team, with its members and repository permissions, is read in a few GraphQL pages
+    (see ``team_matrix``) and diffed in memory.
+    """
+    existing = load_team_matrix(org)
 
     missing, extra, diff_map = [], [], {}
 
@@ -112,9 +93,8 @@ def check_teams(org: Organization, config_teams: list[Team]) -> tuple[bool, dict
         if match.privacy != cfg.privacy.value:
             diffs["privacy"] = {"expected": cfg.privacy.value, "found": match.privacy}
         if cfg.parent_team_slug is not None:
-            actual_parent = match.parent.slug if match.parent else None
-            if actual_parent != cfg.parent_team_slug:
-                diffs["parent_team_slug"] = {"expected": cfg.parent_team_slug, "found": actual_parent}
+            if match.parent_slug != cfg.parent_team_slug:
+                diffs["parent_team_slug"] = {"expected": cfg.parent_team_slug, "found": match.parent_slug}
         if cfg.members is not None:
             member_diffs = _diff_members(match, cfg.members)
             if member_diffs:
@@ -139,12 +119,15 @@ def check_teams(org: Organization, config_teams: list[Team]) -> tuple[bool, dict
 
 
 def _sync_members(org: Organization, github_team, members: list[TeamMember], errors: list) -> None:
-    from repo_manager.utils import get_client
-
-    gh_client = get_client()
+    users = resolve_users(org, [m.username for m in members])
     for m in members:
+        user = users.get(m.username)
+        if user is None:
+            errors.append(
+                {"type": "team-member-sync", "team": github_team.name, "member": m.username, "error": "User not found"}
+            )
+            continue
         try:
-            user = gh_client.get_user(m.username)
             if m.exists is False:
                 github_team.remove_membership(user)
                 actions_toolkit.info(f"Removed '{m.username}' from team '{github_team.name}'")
@@ -172,54 +155,131 @@ def _sync_repos(org: Organization, github_team, repos: list[TeamRepository], err
             errors.append({"type": "team-repo-sync", "team": github_team.name, "repo": full_name, "error": str(exc)})
 
 
+def _team_levels(missing: list[Team]) -> tuple[list[list[Team]], list[Team]]:
+    """Group teams to create into levels whose parents already exist or are created in an earlier level.
+
+    Teams whose parent chain loops back on itself never get a level and are returned on their own.
+    """
+    pending = {cfg.slug or _name_to_slug(cfg.name): cfg for cfg in missing}
+    levels = []
+    while pending:
+        level = [cfg for cfg in pending.values() if cfg.parent_team_slug not in pending]
+        if not level:
+            break
+        levels.append(level)
+        for cfg in level:
+            del pending[cfg.slug or _name_to_slug(cfg.name)]
+    return levels, list(pending.values())
+
+
+class _TeamIds:
+    """Thread-safe slug -> team ID map, seeded from the team matrix and filled in as teams are created"""
+
+    def __init__(self, org: Organization):
+        self.org = org
+        self._lock = threading.Lock()
+        self._ids = {slug: team.id for slug, team in (get_team_matrix(org) or {}).items()}
+        self._fetching: dict[str, threading.Lock] = {}
+
+    def get(self, slug: str) -> int:
+        with self._lock:
+            team_id = self._ids.get(slug)
+            if team_id is not None:
+                return team_id
+            fetching = self._fetching.setdefault(slug, threading.Lock())
+        # one fetch per parent: siblings created concurrently wait for the first one
+        with fetching:
+            with self._lock:
+                team_id = self._ids.get(slug)
+            if team_id is None:
+                team_id = self.org.get_team_by_slug(slug).id
+                self.add(team_id, slug)
+        return team_id
+
+    def add(self, team_id: int, *slugs: str) -> None:
+        with self._lock:
+            self._ids.update(dict.fromkeys(slugs, team_id))
+
+
+def _sync(sync, org: Organization, github_team, items: list) -> list[dict]:
+    errors: list[dict] = []
+    sync(org, github_team, items, errors)
+    return errors
+
+
 def update_teams(
     org: Organization,
     config_teams: list[Team],
     diffs: dict[str, Any],
 ) -> tuple[list[dict], list[str]]:
-    """Create, update, or delete teams to reconcile org state with config."""
+    """Create, update, or delete teams to reconcile org state with config.
+
+    Missing teams are created level by level down the parent/child hierarchy, every team of a
+    level concurrently; the IDs of created teams are kept for their children.  Member and
+    repository syncs of every team run concurrently once all teams exist.
+    """
     errors: list[dict] = []
     messages: list[str] = []
     config_by_name = {t.name: t for t in config_teams}
-
-    for name in diffs.get("missing", []):
+    ids = _TeamIds(org)
+    syncs: list[tuple[str, Any]] = []  # (team name, sync task), run once every team exists
+
+    def _queue_syncs(name: str, github_team, cfg: Team, team_diff: dict[str, Any] | None = None) -> None:
+        if cfg.members and (team_diff is None or "members" in team_diff):
+            syncs.append((name, partial(_sync, _sync_members, org, github_team, cfg.members)))
+        if cfg.repositories and (team_diff is None or "repositories" in team_diff):
+            syncs.append((name, partial(_sync, _sync_repos, org, github_team, cfg.repositories)))
+
+    def _create(cfg: Team):
+        create_kwargs: dict[str, Any] = {"name": cfg.name, "privacy": cfg.privacy.value}
+        if cfg.description:
+            create_kwargs["description"] = cfg.description
+        if cfg.parent_team_slug:
+            create_kwargs["parent_team_id"] = ids.get(cfg.parent_team_slug)
+        new_team = org.create_team(**create_kwargs)
+        ids.add(new_team.id, cfg.slug or _name_to_slug(cfg.name), new_team.slug)
+        actions_toolkit.info(f"Created team '{cfg.name}'")
+        return new_team
+
+    levels, cyclic = _team_levels([config_by_name[name] for name in diffs.get("missing", [])])
+    for cfg in cyclic:
+        errors.append(
+            {
+                "type": "team-create",
+                "name": cfg.name,
+                "error": f"Parent team '{cfg.parent_team_slug}' is part of a cycle",
+            }
+        )
+    for level in levels:
+        outcomes = run_concurrently([partial(_create, cfg) for cfg in level], max_workers=get_parallelism())
+        for cfg, (new_team, exc) in zip(level, outcomes):
+            if exc is not None:
+                errors.append({"type": "team-create", "name": cfg.name, "error": str(exc)})
+                continue
+            messages.append(f"Created team '{cfg.name}'")
+            _queue_syncs(cfg.name, new_team, cfg)
+
+    def _delete(name: str) -> None:
         cfg = config_by_name[name]
-        try:
-            create_kwargs: dict[str, Any] = {"name": cfg.name, "privacy": cfg.privacy.value}
-            if cfg.description:
-                create_kwargs["description"] = cfg.description
-            if cfg.parent_team_slug:
-                parent = org.get_team_by_slug(cfg.parent_team_slug)
-                create_kwargs["parent_team_id"] = parent.id
-            new_team = org.create_team(**create_kwargs)
-            actions_toolkit.info(f"Created team '{name}'")
-            messages.append(f"Created team '{name}'")
-            if cfg.members:
-                _sync_members(org, new_team, cfg.members, errors)
-            if cfg.repositories:
-                _sync_repos(org, new_team, cfg.repositories, errors)
-        except Exception as exc:
-            errors.append({"type": "team-create", "name": name, "error": str(exc)})
+        org.get_team_by_slug(cfg.slug or _name_to_slug(name)).delete()
+        actions_toolkit.info(f"Deleted team '{name}'")
 
-    for name in diffs.get("extra", []):
-        cfg = config_by_name[name]
-        slug = cfg.slug or _name_to_slug(name)
-        try:
-            team = org.get_team_by_slug(slug)
-            team.delete()
-            actions_toolkit.info(f"Deleted team '{name}'")
-            messages.append(f"Deleted team '{name}'")
-        except Exception as exc:
+    extra = diffs.get("extra", [])
+    outcomes = run_concurrently([partial(_delete, name) for name in extra], max_workers=get_parallelism())
+    for name, (_, exc) in zip(extra, outcomes):
+        if exc is not None:
             errors.append({"type": "team-delete", "name": name, "error": str(exc)})
+        else:
+            messages.append(f"Deleted team '{name}'")
 
-    for name, team_diff in diffs.get("diff", {}).items():
+    def _update(name: str, team_diff: dict[str, Any]) -> tuple[Any, list[dict], list[str]]:
         cfg = config_by_name[name]
-        slug = team_diff["_slug"]
+        team_errors: list[dict] = []
+        team_messages: list[str] = []
         try:
-            github_team = org.get_team_by_slug(slug)
+            github_team = org.get_team_by_slug(team_diff["_slug"])
         except Exception as exc:
-            errors.append({"type": "team-fetch", "name": name, "error": str(exc)})
-            continue
+            return None, [{"type": "team-fetch", "name": name, "error": str(exc)}], []
 
         update_kwargs: dict[str, Any] = {}
         if "description" in team_diff:
@@ -229,23 +289,41 @@ def update_teams(
         if "parent_team_slug" in team_diff:
             if cfg.parent_team_slug:
                 try:
-                    parent = org.get_team_by_slug(cfg.parent_team_slug)
-                    update_kwargs["parent_team_id"] = parent.id
+                    update_kwargs["parent_team_id"] = ids.get(cfg.parent_team_slug)
                 except Exception as exc:
-                    errors.append({"type": "team-parent-fetch", "name": name, "error": str(exc)})
+                    team_errors.append({"type": "team-parent-fetch", "name": name, "error": str(exc)})
             else:
                 update_kwargs["parent_team_id"] = None
 
         if update_kwargs:
             try:
                 github_team.edit(name=cfg.name, **update_kwargs)
-                messages.append(f"Updated team metadata for '{name}'")
+                team_messages.append(f"Updated team metadata for '{name}'")
             except Exception as exc:
-                errors.append({"type": "team-update", "name": name, "error": str(exc)})
+                team_errors.append({"type": "team-update", "name": name, "error": str(exc)})
 
-        if "members" in team_diff and cfg.members:
-            _sync_members(org, github_team, cfg.members, errors)
-        if "repositories" in team_diff and cfg.repositories:
-            _sync_repos(org, github_team, cfg.repositories, errors)
+        return github_team, team_errors, team_messages
+
+    changed = list(diffs.get("diff", {}).items())
+    outcomes = run_concurrently(
+        [partial(_update, name, team_diff) for name, team_diff in changed], max_workers=get_parallelism()
+    )
+    for (name, team_diff), (result, exc) in zip(changed, outcomes):
+        if exc is not None:
+            errors.append({"type": "team-update", "name": name, "error": str(exc)})
+            continue
+        github_team, team_errors, team_messages = result
+        errors.extend(team_errors)
+        messages.extend(team_messages)
+        if github_team is not None:
+            _queue_syncs(name, github_team, config_by_name[name], team_diff)
+
+    for (name, _), (sync_errors, exc) in zip(
+        syncs, run_concurrently([task for _, task in syncs], max_workers=get_parallelism())
+    ):
+        if exc is not None:
+            errors.append({"type": "team-sync", "name": name, "error": str(exc)})
+        else:
+            errors.extend(sync_errors)
 
     return errors, messages
@@ -0,0 +1,97 @@
+"""HTTP transport used by every PyGithub client this action creates.
+
+PyGithub keeps a single connection object per ``Requester`` and stores the pending
+request (verb, url, headers, ...) as attributes on it between ``request()`` and
+``getresponse()``.  That is fine for a single thread, but as soon as two categories
+are checked concurrently the second ``request()`` call overwrites the first one's
+URL.  The connection classes below keep the pending request in thread-local storage
+instead, so one persistent connection (and its keep-alive pool) can be shared safely.
+
+Every request goes through ``_send``, which is also where GETs are revalidated against
+the on-disk HTTP cache when one is configured (see ``http_cache``) and where requests are
+paced and retried according to GitHub's rate limits (see ``rate_limit``).
+"""
+
+import threading
+from typing import Any
+
+from github.Requester import (
+    HTTPRequestsConnectionClass,
+    HTTPSRequestsConnectionClass,
+    Requester,
+    RequestsResponse,
+)
+
+from .http_cache import get_http_cache
+from .rate_limit import get_scheduler
+
+
+class _ThreadSafeConnectionMixin:
+    """Store the pending request per thread and send it on ``getresponse()``."""
+
+    def _pending(self) -> threading.local:
+        # created lazily so we don't have to re-implement PyGithub's __init__
+        if "_local" not in self.__dict__:
+            self.__dict__["_local"] = threading.local()
+        return self.__dict__["_local"]
+
+    def request(
+        self,
+        verb: str,
+        url: str,
+        input: Any,
+        headers: dict[str, str],
+        stream: bool = False,
+    ) -> None:
+        self._pending().request = (verb, url, input, headers, stream)
+
+    def getresponse(self) -> RequestsResponse:
+        verb, url, input, headers, stream = self._pending().request
+        return self._send(verb, url, input, headers, stream)
+
+    def _send(self, verb: str, url: str, input: Any, headers: dict[str, str], stream: bool) -> RequestsResponse:
+        full_url = f"{self.protocol}://{self.host}:{self.port}{url}"
+        cache = get_http_cache()
+        entry = None
+        if cache is not None and verb == "GET" and not stream:
+            key = cache.key(full_url, headers)
+            entry = cache.lookup(key)
+            if entry is not None:
+                headers = {**headers, **cache.conditional_headers(entry)}
+        r = get_scheduler().run(
+            verb,
+            full_url,
+            lambda: getattr(self.session, verb.lower())(
+                full_url,
+                headers=headers,
+                data=input,
+                timeout=self.timeout,
+                verify=self.verify,
+                allow_redirects=False,
+                stream=stream,
+            ),
+            body=input,
+        )
+        if cache is not None and verb == "GET" and not stream:
+            if r.status_code == 304 and entry is not None:
+                r = cache.replay(key, entry, r)
+            else:
+                cache.store(key, r)
+        return RequestsResponse(r)
+
+
+class ThreadSafeHTTPConnection(_ThreadSafeConnectionMixin, HTTPRequestsConnectionClass): ...
+
+
+class ThreadSafeHTTPSConnection(_ThreadSafeConnectionMixin, HTTPSRequestsConnectionClass): ...
+
+
+def install_transport() -> None:
+    """Make every Requester created from now on use the thread-safe connection classes."""
+    Requester.injectConnectionClasses(ThreadSafeHTTPConnection, ThreadSafeHTTPSConnection)
+    # injectConnectionClasses is meant for tests and turns off connection reuse; our
+    # connection classes are safe to share, so keep one persistent connection per Requester
+    Requester._Requester__persist = True
+
+
+__all__ = ["install_transport", "ThreadSafeHTTPConnection", "ThreadSafeHTTPSConnection"]
@@ -11,6 +11,8 @@ from github.Repository import Repository
 from repo_manager.utils import get_permissions
 from repo_manager.schemas.secret import Secret
 
+from .object_store import get_object_store
+
 
 def __verify_variable_access__(repo: Repository) -> bool:
     """Verifies that the app has access to the secrets"""
@@ -20,11 +22,16 @@ def __verify_variable_access__(repo: Repository) -> bool:
     return True
 
 
+def __get_environment__(repo: Repository, name: str):
+    """The environment read by the check, fetched only if no check has read it yet"""
+    return get_object_store().get(repo, "environment", name, lambda: repo.get_environment(name))
+
+
 def __get_repo_variable_dict__(repo: Repository, path: str = "actions") -> dict[str, Any]:
     if path == "actions":
         return {variable.name: variable for variable in repo.get_variables()}
     else:
-        return {variable.name: variable for variable in repo.get_environment(path).get_variables()}
+        return {variable.name: variable for variable in __get_environment__(repo, path).get_variables()}
 
 
 def __update_variable__(repo: Repository, variable_name: str, value: str, path: str = "actions") -> bool:
@@ -66,10 +73,9 @@ def check_variables(repo: Repository, variables: list[Secret]) -> tuple[bool, di
     repo_dict = dict[str, Any]()
     if any(filter(lambda variable: variable.type == "actions", variables)):
         repo_dict.update(__get_repo_variable_dict__(repo))
-    if any(filter(lambda variable: variable.type not in {"actions"}, variables)):
-        first_variable = next(filter(lambda variable: variable.type not in {"actions"}, variables), None)
-        if first_variable is not None:
-            repo_dict.update(__get_repo_variable_dict__(repo, first_variable.type.replace("environments/", "")))
+    # each environment's variables come from that environment's own listing
+    for env_type in sorted({variable.type for variable in variables} - {"actions"}):
+        repo_dict.update(__get_repo_variable_dict__(repo, env_type.replace("environments/", "")))
     config_dict = {variable.key: variable for variable in variables}
     repo_variable_names = {variable for variable in repo_dict.keys()}
 
@@ -144,8 +150,8 @@ def update_variables(
                             repo.create_variable(variable, variables_dict[variable].value)
                         else:
                             try:
-                                repo.get_environment(
-                                    variables_dict[variable].type.replace("environments/", "")
+                                __get_environment__(
+                                    repo, variables_dict[variable].type.replace("environments/", "")
                                 ).create_variable(variable, variables_dict[variable].value)
                             except GithubException as exc:
                                 if exc.status in [409, 422]:
@@ -170,8 +176,8 @@ def update_variables(
                     if variables_dict[variable].type == "actions":
                         repo.delete_variable(variable)
                     else:
-                        repo.get_environment(
-                            variables_dict[variable].type.replace("environments/", "")
+                        __get_environment__(
+                            repo, variables_dict[variable].type.replace("environments/", "")
                         ).delete_variable(variable)
                     actions_toolkit.info(f"Deleted variable {variable}")
                 except Exception as exc:  # this should be tighter
@@ -2,6 +2,10 @@ import sys
 import json
 import requests
 
+from collections.abc import Callable
+from functools import partial
+from typing import Any
+
 from actions_toolkit import core as actions_toolkit
 from actions_toolkit.file_command import issue_file_command
 
@@ -12,10 +16,14 @@ from pydantic import ValidationError
 from yaml import YAMLError
 
 
-from repo_manager.utils import get_inputs
+from repo_manager.utils import get_inputs, get_parallelism
+from repo_manager.utils.concurrency import run_concurrently
 from repo_manager.utils.markdown import generate
+from repo_manager.gh.http_cache import get_http_cache
+from repo_manager.gh.rate_limit import api_category, get_scheduler
+from repo_manager.gh.snapshot import prefetch_snapshots
 from repo_manager.schemas import load_config
-from repo_manager.gh.settings import check_repo_settings, update_settings
+from repo_manager.gh.settings import check_repo_settings, scan_repo_settings, update_settings
 from repo_manager.gh.labels import check_repo_labels, update_labels
 from repo_manager.gh.collaborators import check_collaborators, update_collaborators
 from repo_manager.gh.branch_protections import check_repo_branch_protections, update_branch_protections
@@ -210,6 +218,230 @@ def _is_permission_error(exc: Exception) -> bool:
     return any(kw in msg for kw in ("403", "401", "forbidden", "not have access", "resource not accessible"))
 
 
+def _report_api_usage() -> None:
+    """Log the API requests spent per category and, when it is enabled, the HTTP cache hit rate."""
+    actions_toolkit.info(get_scheduler().report())
+    cache = get_http_cache()
+    if cache is not None:
+        actions_toolkit.info(cache.report())
+
+
+def _in_category(category: str, task: Callable[[], Any]) -> Callable[[], Any]:
+    """Wrap ``task`` so the API requests it makes are attributed to ``category``."""
+
+    def _run() -> Any:
+        with api_category(category):
+            return task()
+
+    return _run
+
+
+def _run_checks(
+    checks: list[tuple[Callable, str, Any]],
+    target_args: tuple,
+    inputs: dict[str, Any],
+    permission_warnings: list[str],
+    max_workers: int | None = None,
+    target_name: str | None = None,
+) -> tuple[bool, dict[str, Any]]:
+    """Run the configured checks concurrently and fold their results in declaration order.
+
+    Each category is an independent chain of API calls, so they are submitted to a pool of
+    ``parallelism`` workers.  Results, diffs and 401/403 permission warnings are processed in
+    the order the checks were given, so the diff dict is identical to a sequential run.  Any
+    other error is re-raised once every check has finished.
+
+    Args:
+        checks: (check function, category name, config section) triples; None sections are skipped
+        target_args: Leading positional args for every check (the repo, org, or enterprise requester + slug)
+        inputs: Validated action inputs
+        permission_warnings: Permission warnings found so far; appended to in place
+        max_workers: Overrides the ``parallelism`` input (fleet mode runs one repo per worker instead)
+        target_name: Prefixed to permission warnings when several targets share one summary
+    """
+    to_run = [(check, check_name, to_check) for check, check_name, to_check in checks if to_check is not None]
+    outcomes = run_concurrently(
+        [_in_category(check_name, partial(check, *target_args, to_check)) for check, check_name, to_check in to_run],
+        max_workers=get_parallelism() if max_workers is None else max_workers,
+    )
+
+    check_result = True
+    diffs = {}
+    for (_, check_name, _), (outcome, exc) in zip(to_run, outcomes):
+        if exc is not None:
+            if isinstance(exc, GithubException) and exc.status in (401, 403):
+                warning_msg = _format_permission_warning(check_name, exc)
+                if target_name is not None:
+                    warning_msg = f"{target_name}: {warning_msg}"
+                actions_toolkit.warning(warning_msg)
+                permission_warnings.append(warning_msg)
+                _token = inputs.get("token")
+                _api_url = inputs.get("github_server_url", "https://api.github.com")
+                if inputs.get("scope") == "repo" and _token:
+                    _debug_probe_endpoint(check_name, target_args[0].full_name, _token, _api_url)
+                continue
+            raise exc
+        this_check, this_diffs = outcome
+        check_result &= this_check
+        if this_diffs is not None:
+            diffs[check_name] = this_diffs
+    return check_result, diffs
+
+
+def _apply_updates(
+    updates: list[tuple[Callable, str, Any, Any]],
+    target_args: tuple,
+    errors: list,
+    messages: dict[str, Any],
+    permission_warnings: list[str],
+) -> None:
+    """Apply each category that has diffs, collecting errors, summaries and permission warnings in place.
+
+    Args:
+        updates: (update function, category name, config section, category diffs) tuples
+        target_args: Leading positional args for every update (the repo, org, or enterprise requester + slug)
+        errors: Errors found so far; appended to in place
+        messages: Summary messages by category; added to in place
+        permission_warnings: Permission warnings found so far; appended to in place
+    """
+    for update, update_name, to_update, categorical_diffs in updates:
+        if categorical_diffs is None:
+            continue
+        try:
+            with api_category(update_name):
+                application_errors, application_summary = update(*target_args, to_update, categorical_diffs)
+            if len(application_errors) > 0:
+                errors.append(application_errors)
+            if len(application_summary) > 0:
+                messages[update_name] = application_summary
+            else:
+                actions_toolkit.info(f"Synced {update_name}")
+        except Exception as exc:
+            if _is_permission_error(exc):
+                warning_msg = _format_permission_warning(update_name, exc)
+                actions_toolkit.warning(warning_msg)
+                permission_warnings.append(warning_msg)
+            else:
+                errors.append({"type": f"{update_name}-update", "error": f"{exc}"})
+
+
+def _repo_checks(config: Any) -> list[tuple[Callable, str, Any]]:
+    return [
+        (check_repo_settings, "settings", config.settings),
+        (check_collaborators, "collaborators", config.collaborators),
+        (check_repo_labels, "labels", config.labels),
+        (check_repo_branch_protections, "branch_protections", config.branch_protections),
+        (check_repo_rulesets, "rulesets", config.rulesets),
+        (check_repo_secrets, "secrets", config.secrets),
+        (check_variables, "variables", config.variables),
+        (check_repo_environments, "environments", config.environments),
+        (check_files, "files", config.batch_file_operations),
+    ]
+
+
+def _repo_updates(config: Any, diffs: dict[str, Any]) -> list[tuple[Callable, str, Any, Any]]:
+    return [
+        (update_settings, "settings", config.settings, diffs.get("settings", None)),
+        (update_collaborators, "collaborators", config.collaborators, diffs.get("collaborators", None)),
+        (update_labels, "labels", config.labels, diffs.get("labels", None)),
+        (update_branch_protections, "branch_protections", config.branch_protections, diffs.get("branch_protections")),
+        (update_rulesets, "rulesets", config.rulesets, diffs.get("rulesets", None)),
+        (update_secrets, "secrets", config.secrets, diffs.get("secrets", None)),
+        (update_variables, "variables", config.variables, diffs.get("variables", None)),
+        (update_environments, "environments", config.environments, diffs.get("environments", None)),
+        (update_files, "files", config.batch_file_operations, diffs.get("files", None)),
+    ]
+
+
+def _prefetch_snapshots(repos: list[Any], config: Any, scan: bool = False) -> None:
+    """Read the GraphQL snapshot of every repo up front when a category that uses it is configured.
+
+    With ``scan`` (fleet checks with ``settings_scan``) settings are first read from one
+    repository listing per owner; when settings are the only category using the snapshot, it
+    is then read only for the repositories the listing did not fully cover.
+    """
+    others = (config.labels, config.collaborators, config.environments, config.branch_protections)
+    if scan and config.settings is not None:
+        with api_category("settings"):
+            uncovered = scan_repo_settings(repos, config.settings)
+        if all(section is None for section in others):
+            repos = uncovered
+    if repos and any(section is not None for section in (config.settings, *others)):
+        branch_names = [bp.name for bp in config.branch_protections or []]
+        with api_category("snapshot"):
+            prefetch_snapshots(repos, branch_names)
+
+
+def _check_fleet(
+    repos: list[Any], config: Any, inputs: dict[str, Any], permission_warnings: list[str]
+) -> tuple[bool, dict[str, Any]]:
+    """Check every fleet repository against the same config, ``parallelism`` repositories at a time.
+
+    The config is parsed once and the client (and its connection pool) is shared by all workers.
+    Categories within a repository run one after another so the pool bounds the total number of
+    in-flight requests.  Diffs are keyed by the repository's full name; a repository that cannot
+    be checked is reported under its name instead of stopping the rest of the fleet.
+    """
+
+    def _check_repo(repo: Any) -> tuple[bool, dict[str, Any], list[str]]:
+        repo_warnings = []
+        result, repo_diffs = _run_checks(
+            _repo_checks(config), (repo,), inputs, repo_warnings, max_workers=1, target_name=repo.full_name
+        )
+        return result, repo_diffs, repo_warnings
+
+    _prefetch_snapshots(repos, config, scan=inputs.get("settings_scan") == "true")
+    outcomes = run_concurrently([partial(_check_repo, repo) for repo in repos], max_workers=get_parallelism())
+
+    check_result = True
+    diffs = {}
+    for repo, (outcome, exc) in zip(repos, outcomes):
+        if exc is not None:
+            actions_toolkit.warning(f"Unable to check {repo.full_name}: {exc}")
+            check_result = False
+            diffs[repo.full_name] = {"error": f"{exc}"}
+            continue
+        this_check, repo_diffs, repo_warnings = outcome
+        check_result &= this_check
+        permission_warnings.extend(repo_warnings)
+        if len(repo_diffs) > 0:
+            diffs[repo.full_name] = repo_diffs
+    actions_toolkit.info(f"Checked {len(repos)} repositories, {len(diffs)} with differences")
+    return check_result, diffs
+
+
+def _apply_fleet(
+    repos: list[Any],
+    config: Any,
+    diffs: dict[str, Any],
+    errors: list,
+    messages: dict[str, Any],
+    permission_warnings: list[str],
+) -> None:
+    """Apply the fleet diffs, ``parallelism`` repositories at a time, tagging errors with the repository name."""
+    to_apply = [repo for repo in repos if repo.full_name in diffs and "error" not in diffs[repo.full_name]]
+
+    def _apply_repo(repo: Any) -> tuple[list, dict[str, Any], list[str]]:
+        repo_errors, repo_messages, repo_warnings = [], {}, []
+        _apply_updates(_repo_updates(config, diffs[repo.full_name]), (repo,), repo_errors, repo_messages, repo_warnings)
+        return repo_errors, repo_messages, repo_warnings
+
+    outcomes = run_concurrently([partial(_apply_repo, repo) for repo in to_apply], max_workers=get_parallelism())
+
+    for repo, (outcome, exc) in zip(to_apply, outcomes):
+        if exc is not None:
+            errors.append({"repo": repo.full_name, "type": "update", "error": f"{exc}"})
+            continue
+        repo_errors, repo_messages, repo_warnings = outcome
+        if len(repo_errors) > 0:
+            errors.append({"repo": repo.full_name, "errors": repo_errors})
+        if len(repo_messages) > 0:
+            messages[repo.full_name] = [
+                f"{category}: {message}" for category, summary in repo_messages.items() for message in summary
+            ]
+        permission_warnings.extend(f"{repo.full_name}: {warning}" for warning in repo_warnings)
+
+
 def main():  # noqa: C901
     try:
         inputs = get_inputs()
@@ -244,70 +476,29 @@ def main():  # noqa: C901
     check_result = True
     diffs = {}
     permission_warnings = []
-    for check, to_check in (
-        {}
-        if inputs.get("scope") != "repo"
-        else {
-            check_repo_settings: ("settings", config.settings),
-            check_collaborators: ("collaborators", config.collaborators),
-            check_repo_labels: ("labels", config.labels),
-            check_repo_branch_protections: (
-                "branch_protections",
-                config.branch_protections,
-            ),
-            check_repo_rulesets: ("rulesets", config.rulesets),
-            check_repo_secrets: ("secrets", config.secrets),
-            check_variables: ("variables", config.variables),
-            check_repo_environments: ("environments", config.environments),
-            check_files: ("files", config.batch_file_operations),
-        }
-    ).items():
-        check_name, to_check = to_check
-        if to_check is not None:
-            try:
-                this_check, this_diffs = check(inputs["repo_object"], to_check)
-                check_result &= this_check
-                if this_diffs is not None:
-                    diffs[check_name] = this_diffs
-            except GithubException as exc:
-                if exc.status in (401, 403):
-                    warning_msg = _format_permission_warning(check_name, exc)
-                    actions_toolkit.warning(warning_msg)
-                    permission_warnings.append(warning_msg)
-                    _token = inputs.get("token")
-                    _repo = inputs.get("repo_object")
-                    _api_url = inputs.get("github_server_url", "https://api.github.com")
-                    if _token and _repo:
-                        _debug_probe_endpoint(check_name, _repo.full_name, _token, _api_url)
-                else:
-                    raise
+    if inputs.get("repo_objects") is not None:
+        check_result, diffs = _check_fleet(inputs["repo_objects"], config, inputs, permission_warnings)
+    elif inputs.get("scope") == "repo":
+        _prefetch_snapshots([inputs["repo_object"]], config)
+        check_result, diffs = _run_checks(_repo_checks(config), (inputs["repo_object"],), inputs, permission_warnings)
 
     # ------------------------------------------------------------------ #
     # Org-scope checks (only when scope='org')
     # ------------------------------------------------------------------ #
     org_object = inputs.get("org_object")
     if inputs.get("scope") == "org" and org_object is not None:
-        for check, to_check in {
-            check_org_settings: ("org_settings", config.org_settings),
-            check_teams: ("teams", config.teams),
-            check_org_rulesets: ("org_rulesets", config.org_rulesets),
-            check_org_secrets: ("org_secrets", config.org_secrets),
-            check_org_variables: ("org_variables", config.org_variables),
-        }.items():
-            check_name, to_check_val = to_check
-            if to_check_val is not None:
-                try:
-                    this_check, this_diffs = check(org_object, to_check_val)
-                    check_result &= this_check
-                    if this_diffs is not None:
-                        diffs[check_name] = this_diffs
-                except GithubException as exc:
-                    if exc.status in (401, 403):
-                        warning_msg = _format_permission_warning(check_name, exc)
-                        actions_toolkit.warning(warning_msg)
-                        permission_warnings.append(warning_msg)
-                    else:
-                        raise
+        check_result, diffs = _run_checks(
+            [
+                (check_org_settings, "org_settings", config.org_settings),
+                (check_teams, "teams", config.teams),
+                (check_org_rulesets, "org_rulesets", config.org_rulesets),
+                (check_org_secrets, "org_secrets", config.org_secrets),
+                (check_org_variables, "org_variables", config.org_variables),
+            ],
+            (org_object,),
+            inputs,
+            permission_warnings,
+        )
 
         if config.org_labels is not None:
             actions_toolkit.set_failed(
@@ -320,25 +511,15 @@ def main():  # noqa: C901
     # Enterprise-scope checks (only when scope='enterprise')
     # ------------------------------------------------------------------ #
     if inputs.get("scope") == "enterprise":
-        ent_requester = inputs.get("enterprise_requester")
-        ent_slug = inputs.get("enterprise_slug")
-        for check_fn, check_name, check_val in [
-            (check_enterprise_settings, "enterprise_settings", config.enterprise_settings),
-            (check_enterprise_rulesets, "enterprise_rulesets", config.enterprise_rulesets),
-        ]:
-            if check_val is not None:
-                try:
-                    this_check, this_diffs = check_fn(ent_requester, ent_slug, check_val)
-                    check_result &= this_check
-                    if this_diffs is not None:
-                        diffs[check_name] = this_diffs
-                except GithubException as exc:
-                    if exc.status in (401, 403):
-                        warning_msg = _format_permission_warning(check_name, exc)
-                        actions_toolkit.warning(warning_msg)
-                        permission_warnings.append(warning_msg)
-                    else:
-                        raise
+        check_result, diffs = _run_checks(
+            [
+                (check_enterprise_settings, "enterprise_settings", config.enterprise_settings),
+                (check_enterprise_rulesets, "enterprise_rulesets", config.enterprise_rulesets),
+            ],
+            (inputs.get("enterprise_requester"), inputs.get("enterprise_slug")),
+            inputs,
+            permission_warnings,
+        )
 
     actions_toolkit.debug(json_diff := json.dumps(diffs))
     actions_toolkit.set_output("diff", json_diff)
@@ -352,6 +533,7 @@ def main():  # noqa: C901
         return "\n".join(lines)
 
     if inputs["action"] == "check":
+        _report_api_usage()
         if not check_result:
             summary = _permission_warnings_section() + generate(diffs, {"open": "Differences found"})
             _set_step_summary(summary)
@@ -369,117 +551,56 @@ def main():  # noqa: C901
     if inputs["action"] == "apply":
         errors = []
         messages = {"open": "Changes applied"}
-        for update, to_update in (
-            {}
-            if inputs.get("scope") != "repo"
-            else {
-                update_settings: ("settings", config.settings, diffs.get("settings", None)),
-                update_collaborators: ("collaborators", config.collaborators, diffs.get("collaborators", None)),
-                update_labels: ("labels", config.labels, diffs.get("labels", None)),
-                update_branch_protections: (
-                    "branch_protections",
-                    config.branch_protections,
-                    diffs.get("branch_protections", None),
-                ),
-                update_rulesets: (
-                    "rulesets",
-                    config.rulesets,
-                    diffs.get("rulesets", None),
-                ),
-                update_secrets: ("secrets", config.secrets, diffs.get("secrets", None)),
-                update_variables: ("variables", config.variables, diffs.get("variables", None)),
-                update_environments: ("environments", config.environments, diffs.get("environments", None)),
-                update_files: ("files", config.batch_file_operations, diffs.get("files", None)),
-            }
-        ).items():
-            update_name, to_update, categorical_diffs = to_update
-            if categorical_diffs is not None:
-                try:
-                    application_errors, application_summary = update(
-                        inputs["repo_object"], to_update, categorical_diffs
-                    )
-                    if len(application_errors) > 0:
-                        errors.append(application_errors)
-                    if len(application_summary) > 0:
-                        messages[update_name] = application_summary
-                    else:
-                        actions_toolkit.info(f"Synced {update_name}")
-                except Exception as exc:
-                    if _is_permission_error(exc):
-                        warning_msg = _format_permission_warning(update_name, exc)
-                        actions_toolkit.warning(warning_msg)
-                        permission_warnings.append(warning_msg)
-                    else:
-                        errors.append({"type": f"{update_name}-update", "error": f"{exc}"})
+        if inputs.get("repo_objects") is not None:
+            _apply_fleet(inputs["repo_objects"], config, diffs, errors, messages, permission_warnings)
+        elif inputs.get("scope") == "repo":
+            _apply_updates(
+                _repo_updates(config, diffs), (inputs["repo_object"],), errors, messages, permission_warnings
+            )
 
         # ------------------------------------------------------------------ #
         # Org-scope apply (only when scope='org')
         # ------------------------------------------------------------------ #
         org_object = inputs.get("org_object")
         if inputs.get("scope") == "org" and org_object is not None:
-            for update, to_update in {
-                update_org_settings: ("org_settings", config.org_settings, diffs.get("org_settings", None)),
-                update_teams: ("teams", config.teams, diffs.get("teams", None)),
-                update_org_rulesets: ("org_rulesets", config.org_rulesets, diffs.get("org_rulesets", None)),
-                update_org_secrets: ("org_secrets", config.org_secrets, diffs.get("org_secrets", None)),
-                update_org_variables: ("org_variables", config.org_variables, diffs.get("org_variables", None)),
-            }.items():
-                update_name, to_update_val, categorical_diffs = to_update
-                if categorical_diffs is not None:
-                    try:
-                        application_errors, application_summary = update(org_object, to_update_val, categorical_diffs)
-                        if len(application_errors) > 0:
-                            errors.append(application_errors)
-                        if len(application_summary) > 0:
-                            messages[update_name] = application_summary
-                        else:
-                            actions_toolkit.info(f"Synced {update_name}")
-                    except Exception as exc:
-                        if _is_permission_error(exc):
-                            warning_msg = _format_permission_warning(update_name, exc)
-                            actions_toolkit.warning(warning_msg)
-                            permission_warnings.append(warning_msg)
-                        else:
-                            errors.append({"type": f"{update_name}-update", "error": f"{exc}"})
+            _apply_updates(
+                [
+                    (update_org_settings, "org_settings", config.org_settings, diffs.get("org_settings", None)),
+                    (update_teams, "teams", config.teams, diffs.get("teams", None)),
+                    (update_org_rulesets, "org_rulesets", config.org_rulesets, diffs.get("org_rulesets", None)),
+                    (update_org_secrets, "org_secrets", config.org_secrets, diffs.get("org_secrets", None)),
+                    (update_org_variables, "org_variables", config.org_variables, diffs.get("org_variables", None)),
+                ],
+                (org_object,),
+                errors,
+                messages,
+                permission_warnings,
+            )
 
         # ------------------------------------------------------------------ #
         # Enterprise-scope apply (only when scope='enterprise')
         # ------------------------------------------------------------------ #
         if inputs.get("scope") == "enterprise":
-            ent_requester = inputs.get("enterprise_requester")
-            ent_slug = inputs.get("enterprise_slug")
-            for update_fn, update_name, update_val, categorical_diffs in [
-                (
-                    update_enterprise_settings,
-                    "enterprise_settings",
-                    config.enterprise_settings,
-                    diffs.get("enterprise_settings"),
-                ),
-                (
-                    update_enterprise_rulesets,
-                    "enterprise_rulesets",
-                    config.enterprise_rulesets,
-                    diffs.get("enterprise_rulesets"),
-                ),
-            ]:
-                if categorical_diffs is not None:
-                    try:
-                        application_errors, application_summary = update_fn(
-                            ent_requester, ent_slug, update_val, categorical_diffs
-                        )
-                        if application_errors:
-                            errors.append(application_errors)
-                        if application_summary:
-                            messages[update_name] = application_summary
-                        else:
-                            actions_toolkit.info(f"Synced {update_name}")
-                    except Exception as exc:
-                        if _is_permission_error(exc):
-                            warning_msg = _format_permission_warning(update_name, exc)
-                            actions_toolkit.warning(warning_msg)
-                            permission_warnings.append(warning_msg)
-                        else:
-                            errors.append({"type": f"{update_name}-update", "error": f"{exc}"})
+            _apply_updates(
+                [
+                    (
+                        update_enterprise_settings,
+                        "enterprise_settings",
+                        config.enterprise_settings,
+                        diffs.get("enterprise_settings"),
+                    ),
+                    (
+                        update_enterprise_rulesets,
+                        "enterprise_rulesets",
+                        config.enterprise_rulesets,
+                        diffs.get("enterprise_rulesets"),
+                    ),
+                ],
+                (inputs.get("enterprise_requester"), inputs.get("enterprise_slug")),
+                errors,
+                messages,
+                permission_warnings,
+            )
 
         perm_section = _permission_warnings_section()
         if perm_section and len(messages) > 1:
@@ -489,6 +610,7 @@ def main():  # noqa: C901
         elif perm_section:
             _set_step_summary(perm_section)
 
+        _report_api_usage()
         if len(errors) > 0:
             actions_toolkit.error(json.dumps(errors))
             actions_toolkit.set_failed("Errors during apply")
@@ -2,7 +2,8 @@ from typing import Self
 
 from github import Github
 
-from repo_manager.utils import get_client, get_repo
+from repo_manager.gh.team_index import get_team_index
+from repo_manager.utils import get_client, get_owner
 
 from pydantic import BaseModel, ValidationInfo  # pylint: disable=E0611
 from pydantic import Field, field_validator, model_validator
@@ -43,26 +44,15 @@ class Collaborator(BaseModel):
         if action in ("check", "validate"):
             return self
 
-        client: Github = get_client()
         if self.type == "User":
+            client: Github = get_client()
             self.id = int(client.get_user(self.name).id)
         elif self.type == "Team":
-            org = get_repo().owner.login
+            org = get_owner()
             team_slug = self.name
             try:
-                if self.parent_team_slug:
-                    parent_team = client.get_organization(org).get_team_by_slug(self.parent_team_slug)
-                    github_object = None
-                    for child in parent_team.get_teams():
-                        if child.slug == team_slug:
-                            github_object = child
-                            break
-                    if github_object is None:
-                        raise ValueError(f"Child team '{team_slug}' not found under parent '{self.parent_team_slug}'")
-                else:
-                    github_object = client.get_organization(org).get_team_by_slug(team_slug)
-
-                self.repositories_url = github_object.repositories_url
+                github_object = get_team_index().get_team(org, team_slug, self.parent_team_slug)
+                self.repositories_url = f"{github_object.url}/repos"
                 self.id = github_object.id
             except Exception as e:
                 raise ValueError(f"Team '{team_slug}' not found in organization '{org}'. Error: {e}") from e
@@ -4,7 +4,7 @@ from github import Github
 from github.EnvironmentDeploymentBranchPolicy import EnvironmentDeploymentBranchPolicyParams
 from github.EnvironmentProtectionRuleReviewer import ReviewerParams
 
-from repo_manager.utils import get_client, get_repo
+from repo_manager.utils import get_client, get_owner
 
 from pydantic import BaseModel  # pylint: disable=E0611
 from pydantic import Field, field_validator, model_validator
@@ -33,7 +33,7 @@ class Reviewer(BaseModel):
             if self.name.count("/") == 1:
                 org, team = self.name.split("/")
             else:
-                org = get_repo().owner.login
+                org = get_owner()
                 team = self.name
             self.id = int(client.get_organization(org).get_team_by_slug(team).id)
         return self
@@ -1,4 +1,6 @@
 import os
+import threading
+from fnmatch import fnmatchcase
 from typing import Any
 import requests
 
@@ -6,11 +8,14 @@ from actions_toolkit import core as actions_toolkit
 
 from github import Github, Repository, Organization, Requester
 from github.Auth import AppInstallationAuth, Token
+from github.GithubException import UnknownObjectException
 
 # Needed to handle extracting certain attributes/fields from nested objects and lists
 from itertools import repeat
 
 from repo_manager.gh import get_github_client
+from repo_manager.gh.http_cache import configure_http_cache
+from repo_manager.gh.rate_limit import configure_scheduler
 
 from ._inputs import INPUTS
 
@@ -62,6 +67,12 @@ def __get_inputs__() -> dict:
         if kwargs["target"] not in (None, "", "self")
         else os.environ.get("GITHUB_REPOSITORY_OWNER", None)
     )
+    # The app installation and team IDs are resolved for one owner, so a fleet cannot span owners
+    if kwargs.get("targets"):
+        owners = list(dict.fromkeys(target.split("/")[0] for target in __parse_targets__(kwargs["targets"])))
+        if len({owner.lower() for owner in owners}) > 1:
+            actions_toolkit.set_failed(f"Error: every entry of 'targets' must have the same owner, got {owners}.")
+        kwargs["owner"] = owners[0] if owners else None
     # scope is resolved fully in validate_inputs; nothing to pre-compute here
     return kwargs
 
@@ -69,6 +80,12 @@ def __get_inputs__() -> dict:
 # inputs["app_id"], inputs["private_key"], inputs.get("owner", None), inputs.get("repo", None)
 
 
+def __parse_targets__(targets: str) -> list[str]:
+    """Split the multiline 'targets' input into entries, dropping # comments and blank lines"""
+    entries = [line.split("#", 1)[0].strip() for line in targets.splitlines()]
+    return [entry for entry in entries if entry]
+
+
 def __get_api_url__() -> str:
     global kwargs  # this never gets added to the dictionary
     kwargs = __get_inputs__() if "kwargs" not in globals() else kwargs
@@ -96,6 +113,17 @@ def __get_token_permissions__(requester: Requester) -> dict:
     return {}
 
 
+def __configure_http_cache__(identity: str) -> None:
+    global kwargs
+    try:
+        max_mb = float(kwargs.get("http_cache_max_mb") or 100)
+    except ValueError:
+        actions_toolkit.warning(f"Invalid http_cache_max_mb '{kwargs.get('http_cache_max_mb')}', falling back to 100")
+        max_mb = 100
+    cache = configure_http_cache(kwargs["cache_dir"], int(max_mb * 1024 * 1024), identity)
+    actions_toolkit.debug(f"HTTP cache enabled in {cache.directory} (max {max_mb} MiB)")
+
+
 def get_client() -> Github:
     global client
     if "client" in globals():
@@ -111,11 +139,19 @@ def get_client() -> Github:
         if isinstance(client._Github__requester.auth, AppInstallationAuth):
             kwargs["username"] = "x-access-token"
             kwargs["token"] = client._Github__requester.auth.token
+            # installation tokens rotate every run; the app + owner identify the same permissions
+            identity = f"app:{kwargs['app_id']}:{kwargs['owner']}"
         elif isinstance(client._Github__requester.auth, Token):
             kwargs["username"] = os.environ.get("GITHUB_ACTOR", None)
             permissions = __get_token_permissions__(client._Github__requester)
+            identity = f"token:{client._Github__requester.auth.token}"
         else:
             raise ValueError("Unknown authentication method")
+        if kwargs.get("cache_dir"):
+            __configure_http_cache__(identity)
+        configure_scheduler(
+            __positive_int_input__("max_concurrent_reads", 8), __positive_int_input__("max_concurrent_writes", 2)
+        )
     except Exception as exc:  # this should be tighter
         actions_toolkit.set_failed(f"Error while retrieving GitHub REST API Client from {api_url}. {exc}")
     actions_toolkit.debug(f"permissions: {permissions}")
@@ -148,6 +184,64 @@ def get_organization() -> Organization:
     return org
 
 
+def get_owner() -> str:
+    """Login of the user or organization that owns the target repo(s)"""
+    global kwargs
+    kwargs = __get_inputs__() if "kwargs" not in globals() else kwargs
+    return kwargs["owner"]
+
+
+_owner_repos: dict[str, list[Repository]] = {}
+_owner_repos_lock = threading.Lock()
+
+
+def get_owner_repos(owner: str) -> list[Repository]:
+    """Every repository of an org (or, failing that, a user), listed once per run and shared by its callers"""
+    global client
+    client = get_client() if "client" not in globals() else client
+    with _owner_repos_lock:
+        if owner.lower() in _owner_repos:
+            return _owner_repos[owner.lower()]
+    try:
+        listing = list(client.get_organization(owner).get_repos())
+    except UnknownObjectException:
+        listing = list(client.get_user(owner).get_repos())
+    with _owner_repos_lock:
+        return _owner_repos.setdefault(owner.lower(), listing)
+
+
+def get_fleet_repos(targets: list[str]) -> list[Repository]:
+    """Resolve fleet-mode targets into Repository objects.
+
+    Each target is either 'owner/repo' or 'owner/<glob>' (e.g. 'my-org/api-*', or 'my-org/*'
+    for every repository).  Globs are matched against one listing per owner and skip archived
+    repositories, which cannot be modified.  Duplicates are dropped, keeping the first occurrence.
+    """
+    global client
+    client = get_client() if "client" not in globals() else client
+    repos: dict[str, Repository] = {}
+    for target in targets:
+        if "/" not in target:
+            actions_toolkit.set_failed(f"Error: fleet target '{target}' must be 'owner/repo' or 'owner/<glob>'.")
+        owner, name = target.split("/", 1)
+        if any(c in name for c in "*?["):
+            try:
+                listing = get_owner_repos(owner)
+            except Exception as exc:  # this should be tighter
+                actions_toolkit.set_failed(f"Error while listing repositories of {owner} from Github. {exc}")
+            for repo in listing:
+                if fnmatchcase(repo.name, name) and not repo.archived:
+                    repos.setdefault(repo.full_name, repo)
+        elif target not in repos:
+            try:
+                repos[target] = client.get_repo(target)
+            except Exception as exc:  # this should be tighter
+                actions_toolkit.set_failed(f"Error while retrieving {target} from Github. {exc}")
+    if len(repos) == 0:
+        actions_toolkit.set_failed(f"Error: targets {targets} did not match any repositories.")
+    return list(repos.values())
+
+
 def get_org_by_name(org_login: str) -> Organization:
     """Fetch a GitHub Organization object by its login name."""
     global client
@@ -164,6 +258,22 @@ def get_permissions() -> set[str]:
     return permissions
 
 
+def __positive_int_input__(input_name: str, default: int) -> int:
+    """Read a numeric input, falling back to ``default`` (with a warning) when it is not a number"""
+    global kwargs
+    kwargs = __get_inputs__() if "kwargs" not in globals() else kwargs
+    try:
+        return max(int(kwargs.get(input_name) or default), 1)
+    except ValueError:
+        actions_toolkit.warning(f"Invalid {input_name} '{kwargs.get(input_name)}', falling back to {default}")
+        return default
+
+
+def get_parallelism() -> int:
+    """Number of concurrent workers to use, from the 'parallelism' input (default 4, minimum 1)"""
+    return __positive_int_input__("parallelism", 4)
+
+
 def get_inputs() -> dict[str, Any]:
     """Get inputs from our workflow, valudate them, and return as a dict
     Reads inputs from the dict INPUTS. This dict is generated from the actions.yml file.
@@ -198,9 +308,16 @@ def validate_inputs(parsed_inputs: dict[str, Any]) -> dict[str, Any]:
 
     scope = parsed_inputs.get("scope")
     target = parsed_inputs["target"]
+    fleet = bool(parsed_inputs.get("targets"))
 
+    if fleet:
+        # Fleet mode: 'targets' replaces target/scope and always manages repositories
+        if scope not in (None, "repo"):
+            actions_toolkit.set_failed(f"Error: 'targets' is only valid for scope='repo', got scope='{scope}'")
+        parsed_inputs["scope"] = "repo"
+        scope = "repo"
     # Resolve 'self' for repo scope
-    if target == "self":
+    elif target == "self":
         if scope not in (None, "repo"):
             actions_toolkit.set_failed(f"Error: target='self' is only valid for scope='repo', got scope='{scope}'")
         target = os.environ.get("GITHUB_REPOSITORY", None)
@@ -220,9 +337,14 @@ def validate_inputs(parsed_inputs: dict[str, Any]) -> dict[str, Any]:
             )
         parsed_inputs["scope"] = scope
 
-    if scope == "repo" and "/" not in target:
+    if scope == "repo" and not fleet and "/" not in target:
         actions_toolkit.set_failed(f"Error: scope='repo' requires target in 'owner/repo' format, got '{target}'.")
 
+    if (parsed_inputs.get("file_sync_engine") or "git") not in ("git", "api"):
+        actions_toolkit.set_failed(
+            f"Error: file_sync_engine must be 'git' or 'api', got '{parsed_inputs['file_sync_engine']}'."
+        )
+
     parsed_inputs["workspace_path"] = os.environ.get("RUNNER_WORKSPACE", None)
     if parsed_inputs["workspace_path"] is None:
         actions_toolkit.set_failed(
@@ -240,7 +362,12 @@ def validate_inputs(parsed_inputs: dict[str, Any]) -> dict[str, Any]:
     actions_toolkit.debug(f"github_server_url: {parsed_inputs['github_server_url']}")
     actions_toolkit.debug(f"github_workspace: {parsed_inputs['workspace_path']}")
 
-    if scope == "repo":
+    if fleet:
+        if parsed_inputs.get("repo_objects") is not None:
+            return parsed_inputs  # already resolved; get_inputs() is called again by some categories
+        parsed_inputs["repo_objects"] = get_fleet_repos(__parse_targets__(parsed_inputs["targets"]))
+        actions_toolkit.debug(f"Fleet targets: {[repo.full_name for repo in parsed_inputs['repo_objects']]}")
+    elif scope == "repo":
         parsed_inputs["repo_object"] = get_repo()
     elif scope == "org":
         parsed_inputs["org_object"] = get_org_by_name(target)
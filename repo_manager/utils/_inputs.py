@@ -22,6 +22,11 @@ INPUTS = {
         "description": "DEPRECATED: Use 'target' instead. Kept for backward compatibility.",
         "required": False,
     },
+    "targets": {
+        "description": "Fleet mode: newline-separated list of repositories to check/apply the same settings file to. Entries are 'owner/repo' or 'owner/<glob>' (e.g. 'my-org/api-*', or 'my-org/*' for every non-archived repo). Overrides 'target'.",
+        "required": False,
+        "multiline": True,
+    },
     "github_server_url": {
         "description": "Set a custom github server url for github api operations. Useful if you're running on GHE. Will try to autodiscover from env.GITHUB_SERVER_URL if left at default"
     },
@@ -42,5 +47,45 @@ INPUTS = {
         "description": "Fail the action if the repo settings differ from the settings file. Default is false. Note, this only applies if the action is set to 'check'",
         "default": False,
     },
+    "parallelism": {
+        "description": "Maximum number of settings categories (or, when 'targets' is set, repositories) checked concurrently. Default is 4. Set to 1 to check one at a time",
+        "default": "4",
+    },
+    "cache_dir": {
+        "description": "Directory for caches kept between runs (restore and save it with actions/cache). When set, GET responses are cached there and revalidated with ETags, so unchanged resources do not use rate limit, the clones used for file sync are kept there and fetched incrementally, and ruleset bodies are only fetched again once their updated_at changes. Leave empty to disable caching",
+        "required": False,
+    },
+    "http_cache_max_mb": {
+        "description": "Maximum size in MiB of the HTTP response cache in cache_dir. Least recently used entries are evicted beyond this. Default is 100",
+        "default": "100",
+    },
+    "max_concurrent_reads": {
+        "description": "Maximum number of read requests (GET and GraphQL queries) sent to GitHub at the same time. Default is 8",
+        "default": "8",
+    },
+    "max_concurrent_writes": {
+        "description": "Maximum number of mutating requests (POST, PUT, PATCH, DELETE) sent to GitHub at the same time. GitHub's secondary rate limits penalise concurrent writes, so keep this low. Default is 2",
+        "default": "2",
+    },
+    "file_sync_engine": {
+        "description": "How files are synced: 'git' clones the target repo and pushes the sync branch, 'api' compares blob SHAs against one recursive tree fetch and writes the changed blobs, one tree and one commit through the Git Data API without a clone. Default is git",
+        "default": "git",
+    },
+    "secret_fingerprint_key": {
+        "description": "Key for fingerprinting applied secret values. When set, a keyed HMAC of each secret value written is stored with the secret's updated_at, and secrets that still match are neither reported as drift nor re-encrypted and re-PUT. Leave empty to always treat existing secrets as changed",
+        "required": False,
+    },
+    "secret_fingerprint_store": {
+        "description": "Where secret fingerprints are kept: 'variable' stores them in the REPO_MANAGER_SECRET_FINGERPRINTS Actions variable of each repository, anything else is the path of a local JSON state file (persist it with actions/cache). Default is variable",
+        "default": "variable",
+    },
+    "repo_index_ttl_minutes": {
+        "description": "Minutes an organisation's repository listing kept in cache_dir stays valid. Org secrets and variables with selected repositories resolve repository names from that one listing instead of one request per name. Default is 60",
+        "default": "60",
+    },
+    "settings_scan": {
+        "description": "Fleet mode: 'true' reads the settings of every 'targets' repository from one listing of all repositories of their owner instead of reading each repository. That listing covers the owner's whole repository list, so enable it when the fleet is a large share of the owner's repositories. Glob targets already list their owner, and that listing is reused. Default is false",
+        "default": "false",
+    },
 }
 ###END_INPUT_AUTOMATION###
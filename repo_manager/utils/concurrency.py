@@ -0,0 +1,29 @@
+import contextvars
+from collections.abc import Callable, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+
+def run_concurrently(
+    tasks: Sequence[Callable[[], Any]], max_workers: int = 1
+) -> list[tuple[Any | None, BaseException | None]]:
+    """Run zero-argument callables on a bounded thread pool.
+
+    Results come back in the same order as ``tasks`` as ``(result, exception)`` pairs so
+    callers can keep their existing, ordered error handling.  Each task runs in a copy
+    of the caller's context, so context variables set by the caller are visible to it.
+    With ``max_workers <= 1`` (or a single task) everything runs inline.
+    """
+
+    def _capture(task: Callable[[], Any]) -> tuple[Any | None, BaseException | None]:
+        try:
+            return task(), None
+        except Exception as exc:
+            return None, exc
+
+    if max_workers <= 1 or len(tasks) <= 1:
+        return [_capture(task) for task in tasks]
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(tasks)), thread_name_prefix="repo-manager") as pool:
+        futures = [pool.submit(contextvars.copy_context().run, _capture, task) for task in tasks]
+        return [future.result() for future in futures]
@@ -0,0 +1,61 @@
+from unittest.mock import MagicMock
+
+from github.Repository import Repository
+
+from repo_manager.gh import collaborators, team_index
+from repo_manager.gh.collaborators import update_collaborators
+from repo_manager.gh.team_index import TeamIndex
+from repo_manager.schemas.collaborator import Collaborator
+
+
+def _team(database_id, slug, parent=None):
+    return {
+        "databaseId": database_id,
+        "slug": slug,
+        "name": slug.title(),
+        "parentTeam": {"slug": parent} if parent else None,
+    }
+
+
+def test_team_collaborators_are_resolved_from_one_index(monkeypatch):
+    org = MagicMock(login="indexed", url="https://api.github.com/orgs/indexed")
+    org._requester.graphql_url = "https://api.github.com/graphql"
+    teams = {"pageInfo": {"hasNextPage": False, "endCursor": None}}
+    teams["nodes"] = [_team(1, "platform"), _team(2, "sre", parent="platform"), _team(3, "docs")]
+    org._requester.requestJsonAndCheck.return_value = ({}, {"data": {"organization": {"teams": teams}}})
+    org._requester.requestJson.return_value = (204, {}, None)
+    get_org_by_name = MagicMock(return_value=org)
+    monkeypatch.setattr(team_index, "get_org_by_name", get_org_by_name)
+    index = TeamIndex()
+    monkeypatch.setattr(collaborators, "get_team_index", lambda: index)
+
+    repo = MagicMock(spec=Repository, full_name="indexed/api", _identity="indexed/api")
+    repo.owner.login = "indexed"
+    config = [
+        Collaborator.model_validate(
+            {"type": "team", "name": "sre", "permission": "push", "parent_team_slug": "platform"},
+            context={"action": "check"},
+        ),
+        Collaborator.model_validate(
+            {"type": "team", "name": "docs", "permission": "pull", "exists": False}, context={"action": "check"}
+        ),
+        Collaborator.model_validate(
+            {"type": "team", "name": "platform", "permission": "admin"}, context={"action": "check"}
+        ),
+    ]
+    diffs = {"missing": {"Teams": ["sre"]}, "extra": {"Teams": ["docs"]}, "diff": {"Teams": ["platform"]}}
+
+    assert update_collaborators(repo, config, diffs) == ([], [])
+
+    get_org_by_name.assert_called_once_with("indexed")
+    assert index.loads == 1
+    # one slim listing: the index never reads members or repositories
+    listing = org._requester.requestJsonAndCheck.call_args_list[0]
+    assert "members" not in listing.kwargs["input"]["query"]
+    org.get_team_by_slug.assert_not_called()
+    assert [c.args[:2] for c in org._requester.requestJson.call_args_list] == [
+        ("PUT", f"{org.url}/teams/sre/repos/indexed/api"),
+        ("PUT", f"{org.url}/teams/platform/repos/indexed/api"),
+    ]
+    assert org._requester.requestJsonAndCheck.call_args.args == ("DELETE", f"{org.url}/teams/docs/repos/indexed/api")
+    assert index.find("indexed", "sre", "docs") is None
@@ -0,0 +1,56 @@
+from unittest.mock import MagicMock, patch
+
+from repo_manager.gh.environments import check_repo_environments
+from repo_manager.schemas.environment import Environment
+
+
+def _environment(name, variables):
+    environment = MagicMock(protection_rules=[], deployment_branch_policy=None)
+    environment.name = name
+    listed = []
+    for key, value in variables.items():
+        variable = MagicMock(value=value)
+        variable.name = key
+        listed.append(variable)
+    environment.get_variables.return_value = listed
+    return environment
+
+
+def test_each_environment_is_diffed_against_its_own_listings():
+    repo = MagicMock(full_name="o/env-pipeline", id=7)
+    environments = {
+        "staging": _environment("staging", {"URL": "https://staging"}),
+        "production": _environment("production", {"URL": "https://old"}),
+    }
+    repo.get_environments.return_value = list(environments.values())
+    repo.get_environment.side_effect = environments.__getitem__
+    secrets_by_env = {"staging": ["TOKEN"], "production": []}
+    repo._requester.requestJsonAndCheck.side_effect = lambda verb, url: (
+        {},
+        {"secrets": [{"name": name} for name in secrets_by_env[url.split("/")[4]]]},
+    )
+    config = [
+        Environment(
+            name=name,
+            secrets=[{"key": "TOKEN", "value": "t"}],
+            variables=[{"key": "URL", "value": "https://staging" if name == "staging" else "https://prod"}],
+        )
+        for name in environments
+    ]
+
+    with (
+        patch("repo_manager.gh.environments.get_snapshot", return_value=None),
+        patch("repo_manager.gh.secrets.get_secret_fingerprints", return_value=None),
+    ):
+        success, diff = check_repo_environments(repo, config)
+
+    assert success is False
+    assert diff == {
+        "diff": {
+            "staging": {"secrets": {"diff": ["TOKEN"]}},
+            "production": {
+                "secrets": {"missing": ["TOKEN"]},
+                "variables": {"diff": {"URL": "URL -- Expected: https://prod Found: https://old"}},
+            },
+        }
+    }
@@ -0,0 +1,355 @@
+import subprocess
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+from git import Remote
+
+from repo_manager.gh import files, git_data
+from repo_manager.schemas.file import BranchFiles, FileConfig
+
+
+def test_sparse_paths_cover_dest_and_remote_sources():
+    branches = [
+        BranchFiles(
+            files=[
+                FileConfig(src_file="local/workflow.yml", dest_file=Path(".github/workflows/ci.yml")),
+                FileConfig(src_file="remote://docs/old.md", dest_file=Path("docs/new.md"), move=True),
+                FileConfig(src_file="remote://./[draft].md", dest_file=Path("draft.md")),
+            ]
+        )
+    ]
+
+    assert files.__sparse_paths__(branches) == [
+        "/.github/workflows/ci.yml",
+        "/\\[draft\\].md",
+        "/docs/new.md",
+        "/docs/old.md",
+        "/draft.md",
+    ]
+
+
+def _git(cwd, *args):
+    subprocess.run(
+        ["git", "-c", "user.name=t", "-c", "user.email=t@t", *args], cwd=cwd, check=True, capture_output=True
+    )
+
+
+def test_cached_clone_is_sparse_and_reused(tmp_path):
+    source = tmp_path / "source"
+    (source / "docs").mkdir(parents=True)
+    (source / "docs" / "a.md").write_text("a")
+    (source / "src.py").write_text("b")
+    _git(tmp_path, "init", "-q", "-b", "main", str(source))
+    _git(source, "add", "-A")
+    _git(source, "commit", "-qm", "init")
+    _git(tmp_path, "clone", "-q", "--bare", str(source), "origin.git")
+    _git(tmp_path / "origin.git", "config", "uploadpack.allowFilter", "true")
+    repo = MagicMock(full_name="o/source", clone_url=(tmp_path / "origin.git").as_uri())
+    repo.name, repo.owner.login = "source", "o"
+    inputs = {"cache_dir": str(tmp_path / "cache"), "workspace_path": str(tmp_path), "username": "u", "token": "t"}
+
+    with patch.object(files, "get_inputs", return_value=inputs):
+        clone = files.__clone_repo__(repo, "main", ["/docs/a.md"])
+        clone.create_head("repomgr/updates-to-main")
+        again = files.__clone_repo__(repo, "main", ["/docs/a.md"])
+
+    root = tmp_path / "cache" / "git" / "o" / "source"
+    assert Path(again.working_tree_dir) == root
+    assert (root / "docs" / "a.md").exists() and not (root / "src.py").exists()
+    assert [head.name for head in again.heads] == ["main"]
+    assert "t@" not in (root / ".git" / "config").read_text()
+
+
+def _element(path, content):
+    return MagicMock(path=path, type="blob", mode="100644", sha=git_data.blob_sha(content))
+
+
+def test_api_engine_plans_one_commit_and_reports_git_style_stats(tmp_path, monkeypatch):
+    monkeypatch.setenv("GITHUB_WORKSPACE", str(tmp_path))
+    (tmp_path / "same.txt").write_bytes(b"same\n")
+    (tmp_path / "new.txt").write_bytes(b"a\nb\n")
+    (tmp_path / "edit.txt").write_bytes(b"one\nthree\n")
+    blobs = {"same.txt": b"same\n", "edit.txt": b"one\ntwo\n", "old.txt": b"x\ny\nz\n"}
+    by_sha = {git_data.blob_sha(content): content for content in blobs.values()}
+    repo = MagicMock(full_name="o/api-engine")
+    repo.get_git_ref.return_value.object.sha = "base"
+    repo.get_git_tree.return_value.truncated = False
+    repo.get_git_tree.return_value.tree = [_element(path, content) for path, content in blobs.items()]
+    repo.get_git_blob.side_effect = lambda sha: MagicMock(encoding="utf-8", content=by_sha[sha].decode())
+    branch = BranchFiles(
+        target_branch="main",
+        commit_msg="chore: sync",
+        files=[
+            FileConfig(src_file="same.txt", dest_file=Path("same.txt")),
+            FileConfig(src_file="new.txt", dest_file=Path("new.txt")),
+            FileConfig(src_file="edit.txt", dest_file=Path("edit.txt")),
+            FileConfig(dest_file=Path("old.txt"), exists=False),
+        ],
+    )
+
+    success, diffs = files.__check_branch_via_api__(repo, branch)
+
+    assert success is False
+    assert diffs == {
+        "extra": {"old.txt": {"insertions": 0, "deletions": 3, "lines": 3}},
+        "missing": {"new.txt": {"insertions": 2, "deletions": 0, "lines": 2}},
+        "diff": {"edit.txt": {"insertions": 1, "deletions": 1, "lines": 2}},
+    }
+    repo.create_git_blob.return_value.sha = "uploaded"
+    repo.create_git_commit.return_value.sha = "commit"
+
+    assert files.__update_branch_via_api__(repo, branch) == ("commit", "chore(update): sync")
+    assert repo.create_git_blob.call_count == 2
+    repo.create_git_tree.assert_called_once()
+    repo.get_git_tree.assert_called_once()
+    # the sync branch already existed (every ref lookup succeeded), so it is fast-forwarded
+    repo.get_git_ref.return_value.edit.assert_called_once_with("commit")
+
+
+def test_both_engines_skip_source_versions_already_synced(tmp_path, monkeypatch):
+    workspace, dest = tmp_path / "workspace", tmp_path / "dest"
+    _git(tmp_path, "init", "-q", "-b", "main", str(workspace))
+    (workspace / "ci.yml").write_text("upstream\n")
+    _git(workspace, "add", "-A")
+    _git(workspace, "commit", "-qm", "ci template")
+    source_sha = files.Repo(workspace).head.commit.hexsha
+    (workspace / "new.yml").write_text("a\nb\n")
+    _git(workspace, "add", "-A")
+    _git(workspace, "commit", "-qm", "new template")
+    # ci.yml was synced from this source version before and then changed downstream on purpose
+    _git(tmp_path, "init", "-q", "-b", "main", str(dest))
+    (dest / "ci.yml").write_text("downstream\n")
+    _git(dest, "add", "-A")
+    _git(dest, "commit", "-qm", f"chore(update): sync [synced-from-sha:{source_sha}]")
+    for name in ("AUTHOR", "COMMITTER"):
+        monkeypatch.setenv(f"GIT_{name}_NAME", "t")
+        monkeypatch.setenv(f"GIT_{name}_EMAIL", "t@t")
+    monkeypatch.setenv("GITHUB_WORKSPACE", str(workspace))
+    monkeypatch.setattr(files, "_synced_sha_index", files.SyncedShaIndex())
+    config = [FileConfig(src_file=name, dest_file=Path(name)) for name in ("ci.yml", "new.yml")]
+
+    dest_repo = files.Repo(dest)
+    repo = MagicMock(full_name="o/dest", clone_url=dest.as_uri())
+    repo.get_git_ref.side_effect = lambda ref: (
+        None if "repomgr" in ref else MagicMock(ref=ref, object=MagicMock(sha=dest_repo.head.commit.hexsha))
+    )
+    repo.get_git_tree.return_value.truncated = False
+    repo.get_git_tree.return_value.tree = [_element("ci.yml", b"downstream\n")]
+    repo.get_commits.side_effect = lambda sha: [MagicMock(commit=c) for c in dest_repo.iter_commits(sha)]
+    api_success, api_diffs = files.__check_branch_via_api__(repo, BranchFiles(target_branch="main", files=config))
+    git_success, git_diffs = files.__check_files__(dest_repo, "chore: sync", config)
+
+    assert api_success is git_success is False
+    assert {kind: set(paths) for kind, paths in api_diffs.items()} == {"missing": {"new.yml"}}
+    assert {kind: set(paths) for kind, paths in git_diffs.items()} == {"missing": {"new.yml"}}
+    assert api_diffs["missing"]["new.yml"] == {
+        key: value for key, value in git_diffs["missing"]["new.yml"].items() if key != "change_type"
+    }
+
+
+def test_each_repo_targets_its_own_default_branch_without_touching_the_config():
+    shared = [BranchFiles(files=[]), BranchFiles(target_branch="release", files=[])]
+
+    main = files.__resolve_target_branches__(MagicMock(default_branch="main"), shared)
+    trunk = files.__resolve_target_branches__(MagicMock(default_branch="trunk"), shared)
+
+    assert [branch.target_branch for branch in main] == ["main", "release"]
+    assert [branch.target_branch for branch in trunk] == ["trunk", "release"]
+    assert shared[0].target_branch is None
+
+
+def test_synced_sha_index_is_incremental_and_resumes_from_the_cache(tmp_path):
+    work = tmp_path / "dest"
+    _git(tmp_path, "init", "-q", "-b", "main", str(work))
+    _git(work, "commit", "-q", "--allow-empty", "-m", "chore(update): sync [synced-from-sha:aaa111]")
+    dest_repo = files.Repo(work)
+    index = files.SyncedShaIndex(tmp_path / "cache")
+
+    assert index.contains(dest_repo, "main", "aaa111")
+    assert not index.contains(dest_repo, "main", "bbb222")
+
+    _git(work, "commit", "-q", "--allow-empty", "-m", "chore(update): sync [synced-from-sha:bbb222]")
+    with patch.object(index, "_read_markers", wraps=index._read_markers) as read_markers:
+        assert index.contains(dest_repo, "main", "bbb222")
+    # only the new commit was read
+    assert read_markers.call_args.args[1].endswith(f"..{dest_repo.head.commit.hexsha}")
+
+    resumed = files.SyncedShaIndex(tmp_path / "cache")
+    with patch.object(resumed, "_read_markers") as read_markers:
+        assert resumed.contains(dest_repo, "main", "aaa111")
+    read_markers.assert_not_called()
+
+
+def test_source_shas_are_resolved_in_one_history_walk(tmp_path):
+    source = tmp_path / "templates"
+    _git(tmp_path, "init", "-q", "-b", "main", str(source))
+    (source / "a.yml").write_text("a")
+    (source / "b [1].yml").write_text("b")
+    _git(source, "add", "-A")
+    _git(source, "commit", "-qm", "first")
+    (source / "a.yml").write_text("a2")
+    _git(source, "commit", "-qam", "second")
+    (source / "untracked.yml").write_text("c")
+    head = files.Repo(source).head.commit
+    resolver = files.SourceShaResolver()
+
+    resolver.resolve([source / "a.yml", source / "b [1].yml", source / "untracked.yml"])
+    with patch.object(resolver, "_repo_for") as repo_for:
+        assert resolver.get(source / "a.yml") == head.hexsha
+        assert resolver.get(source / "b [1].yml") == head.parents[0].hexsha
+        assert resolver.get(source / "untracked.yml") is None
+    repo_for.assert_not_called()
+
+
+def test_source_shas_of_merged_changes_match_git_log(tmp_path):
+    source = tmp_path / "templates"
+    _git(tmp_path, "init", "-q", "-b", "main", str(source))
+    (source / "a.yml").write_text("a")
+    _git(source, "add", "-A")
+    _git(source, "commit", "-qm", "first")
+    _git(source, "checkout", "-qb", "feature")
+    (source / "a.yml").write_text("a2")
+    _git(source, "commit", "-qam", "feature")
+    _git(source, "checkout", "-q", "main")
+    _git(source, "merge", "-q", "--no-ff", "-m", "merge", "feature")
+    resolver = files.SourceShaResolver()
+
+    # markers written by earlier runs hold what a per-file `git log -n1` returns: the branch commit
+    expected = files.Repo(source).git.log("-n1", "--format=%H", "--", "a.yml")
+    assert expected == files.Repo(source).commit("feature").hexsha
+    assert resolver.get(source / "a.yml") == expected
+
+
+def test_unchanged_files_are_not_written_and_git_is_not_run(tmp_path, monkeypatch):
+    monkeypatch.setenv("GITHUB_WORKSPACE", str(tmp_path / "workspace"))
+    (tmp_path / "workspace").mkdir()
+    (tmp_path / "workspace" / "ci.yml").write_text("on: push\n")
+    (tmp_path / "workspace" / "new.yml").write_text("a\nb\n")
+    dest = tmp_path / "dest"
+    dest.mkdir()
+    (dest / "ci.yml").write_text("on: push\n")
+    dest_repo = MagicMock(working_tree_dir=str(dest))
+    config = [FileConfig(src_file="ci.yml", dest_file=Path("ci.yml"))]
+    mtime = (dest / "ci.yml").stat().st_mtime_ns
+
+    assert files.__check_files__(dest_repo, "chore: sync", config) == (True, None)
+    assert (dest / "ci.yml").stat().st_mtime_ns == mtime
+    dest_repo.git.add.assert_not_called()
+    dest_repo.index.diff.assert_not_called()
+
+    # a new file is written and committed alone, with stats computed without git
+    config.append(FileConfig(src_file="new.yml", dest_file=Path("new.yml")))
+    dest_repo.git.log.return_value = ""
+    dest_repo.git.rev_parse.return_value = "tip"
+    success, diffs = files.__check_files__(dest_repo, "chore: sync", config)
+    assert success is False
+    assert diffs["missing"]["new.yml"] == {"insertions": 2, "deletions": 0, "lines": 2, "change_type": "A"}
+    dest_repo.git.add.assert_called_once_with("-A", "--", "new.yml")
+
+
+def test_branches_are_checked_in_worktrees_and_pushed_together(tmp_path):
+    source = tmp_path / "source"
+    source.mkdir()
+    (source / "ci.yml").write_text("a")
+    _git(tmp_path, "init", "-q", "-b", "main", str(source))
+    _git(source, "add", "-A")
+    _git(source, "commit", "-qm", "init")
+    _git(source, "branch", "dev")
+    _git(tmp_path, "clone", "-q", "--bare", str(source), "origin.git")
+    _git(tmp_path / "origin.git", "config", "uploadpack.allowFilter", "true")
+    repo = MagicMock(full_name="o/source", clone_url=(tmp_path / "origin.git").as_uri(), default_branch="main")
+    repo.name, repo.owner.login = "source", "o"
+    inputs = {
+        "repo": "o/source",
+        "cache_dir": str(tmp_path / "cache"),
+        "workspace_path": str(tmp_path),
+        "username": "u",
+        "token": "t",
+    }
+    branches = [
+        BranchFiles(target_branch=target, commit_msg="chore: sync", files=[FileConfig(src_file="ci.yml")])
+        for target in ("main", "dev")
+    ]
+
+    checked = set()
+
+    def commit_in_worktree(worktree, commit_msg, file_config):
+        checked.add(worktree.active_branch.name)
+        Path(worktree.working_tree_dir, "ci.yml").write_text(worktree.active_branch.name)
+        worktree.git.add("-A")
+        worktree.git.commit(
+            "-m",
+            commit_msg,
+            env={
+                "GIT_COMMITTER_NAME": "t",
+                "GIT_COMMITTER_EMAIL": "t@t",
+                "GIT_AUTHOR_NAME": "t",
+                "GIT_AUTHOR_EMAIL": "t@t",
+            },
+        )
+        return False, {"diff": {"ci.yml": {}}}
+
+    with (
+        patch.object(files, "get_inputs", return_value=inputs),
+        patch.object(files, "__expect_source_shas__"),
+        patch.object(files, "__check_files__", side_effect=commit_in_worktree),
+        patch.object(files, "__open_or_update_pull__", return_value=MagicMock(number=1, html_url="u")) as pull,
+        patch.object(Remote, "push", autospec=True, side_effect=Remote.push) as push,
+    ):
+        success, diffs = files.check_files(repo, branches)
+        assert success is False and set(diffs) == {"main", "dev"}
+        errors, messages = files.update_files(repo, branches, diffs)
+
+    assert errors == [] and len(messages) == 2 and pull.call_count == 2
+    assert checked == {"repomgr/updates-to-main", "repomgr/updates-to-dev"}
+    push.assert_called_once()
+    origin = subprocess.run(
+        ["git", "for-each-ref", "--format=%(refname:short)", "refs/heads/repomgr"],
+        cwd=tmp_path / "origin.git",
+        capture_output=True,
+        text=True,
+    ).stdout.split()
+    assert sorted(origin) == ["repomgr/updates-to-dev", "repomgr/updates-to-main"]
+    assert not files.__worktrees_dir__(files.Repo(tmp_path / "cache" / "git" / "o" / "source")).exists()
+
+
+def test_failed_check_removes_every_worktree(tmp_path):
+    source = tmp_path / "source"
+    source.mkdir()
+    (source / "ci.yml").write_text("a")
+    _git(tmp_path, "init", "-q", "-b", "main", str(source))
+    _git(source, "add", "-A")
+    _git(source, "commit", "-qm", "init")
+    _git(source, "branch", "dev")
+    _git(tmp_path, "clone", "-q", "--bare", str(source), "origin.git")
+    repo = MagicMock(full_name="o/source", clone_url=(tmp_path / "origin.git").as_uri(), default_branch="main")
+    repo.name, repo.owner.login = "source", "o"
+    inputs = {
+        "repo": "o/source",
+        "cache_dir": str(tmp_path / "cache"),
+        "workspace_path": str(tmp_path),
+        "username": "u",
+        "token": "t",
+    }
+    branches = [
+        BranchFiles(target_branch=target, commit_msg="chore: sync", files=[FileConfig(src_file="ci.yml")])
+        for target in ("main", "dev")
+    ]
+
+    def check(worktree, commit_msg, file_config):
+        if worktree.active_branch.name.endswith("dev"):
+            raise ValueError("unreadable source")
+        return True, None
+
+    with (
+        patch.object(files, "get_inputs", return_value=inputs),
+        patch.object(files, "__expect_source_shas__"),
+        patch.object(files, "__check_files__", side_effect=check),
+        pytest.raises(ValueError, match="unreadable source"),
+    ):
+        files.check_files(repo, branches)
+
+    cached = files.Repo(tmp_path / "cache" / "git" / "o" / "source")
+    assert not files.__worktrees_dir__(cached).exists()
+    assert "repomgr" not in cached.git.worktree("list")
@@ -0,0 +1,55 @@
+import os
+
+import requests
+
+from repo_manager.gh.http_cache import HttpCache
+
+
+def _response(status: int, body: str = "", **headers) -> requests.Response:
+    response = requests.Response()
+    response.status_code = status
+    response.url = "https://api.github.com/repos/o/r/labels"
+    response.encoding = "utf-8"
+    response._content = body.encode()
+    response.headers.update(headers)
+    return response
+
+
+def test_not_modified_is_served_from_disk(tmp_path):
+    cache = HttpCache(tmp_path, 10_000, "identity")
+    key = cache.key("https://api.github.com/repos/o/r/labels", {"Accept": "application/json"})
+    cache.store(key, _response(200, '[{"name": "bug"}]', ETag='"v1"', **{"X-RateLimit-Remaining": "10"}))
+
+    entry = cache.lookup(key)
+    assert cache.conditional_headers(entry) == {"If-None-Match": '"v1"'}
+
+    replayed = cache.replay(key, entry, _response(304, ETag='"v1"', **{"X-RateLimit-Remaining": "9"}))
+    assert replayed.status_code == 200
+    assert replayed.text == '[{"name": "bug"}]'
+    assert replayed.headers["X-RateLimit-Remaining"] == "9"
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_keys_differ_by_identity(tmp_path):
+    url = "https://api.github.com/repos/o/r"
+    assert HttpCache(tmp_path, 1, "a").key(url, {}) != HttpCache(tmp_path, 1, "b").key(url, {})
+
+
+def test_responses_without_validators_are_not_stored(tmp_path):
+    cache = HttpCache(tmp_path, 10_000, "identity")
+    cache.store("k", _response(200, "{}"))
+
+    assert cache.lookup("k") is None
+
+
+def test_oldest_entries_are_evicted_past_the_limit(tmp_path):
+    cache = HttpCache(tmp_path, 10_000, "identity")
+    for i in range(4):
+        cache.store(f"k{i}", _response(200, "x" * 50, ETag=f'"{i}"'))
+        os.utime(tmp_path / f"k{i}.json", (i, i))
+
+    cache.max_bytes = (tmp_path / "k0.json").stat().st_size * 3
+    cache.store("k4", _response(200, "x" * 50, ETag='"4"'))
+
+    assert cache.evictions == 3
+    assert [cache.lookup(f"k{i}") is not None for i in range(5)] == [False, False, False, True, True]
@@ -74,3 +74,44 @@ def test_rename_to_existing_name_delete_failure_is_reported():
     assert len(errors) == 1
     assert errors[0]["type"] == "label-delete"
     assert errors[0]["name"] == "old"
+
+
+def test_deletes_and_renames_run_before_creates_and_errors_keep_their_format():
+    calls = []
+    repo, labels = _make_repo(existing_names=["stale", "old", "broken"])
+    labels["stale"].delete.side_effect = lambda: calls.append("delete stale")
+    labels["old"].edit.side_effect = lambda *args: calls.append("rename old")
+    labels["broken"].edit.side_effect = Exception("Validation Failed")
+    repo.create_label.side_effect = lambda *args: calls.append(f"create {args[0]}")
+    config = [
+        Label(name="stale", exists=False),
+        Label(name="old", new_name="new"),
+        Label(name="broken", color="000000"),
+        Label(name="stale-replacement", color="00ff00"),
+    ]
+    diffs = {
+        "missing": ["stale-replacement"],
+        "diff": {"old": {"name": {"expected": "new", "found": "old"}}, "broken": {"color": {}}},
+        "extra": ["stale"],
+    }
+
+    errors, _ = update_labels(repo, config, diffs)
+
+    assert calls.index("create stale-replacement") > max(calls.index("delete stale"), calls.index("rename old"))
+    assert errors == [{"type": "label-update", "name": "broken", "error": "Validation Failed"}]
+
+
+def test_rename_chain_renames_in_dependency_order():
+    # "a" -> "b" while "b" -> "c": "b" is freed first, so "a" is renamed rather than deleted
+    calls = []
+    repo, labels = _make_repo(existing_names=["a", "b"])
+    labels["a"].edit.side_effect = lambda *args: calls.append(f"rename a to {args[0]}")
+    labels["b"].edit.side_effect = lambda *args: calls.append(f"rename b to {args[0]}")
+    config = [Label(name="a", new_name="b"), Label(name="b", new_name="c")]
+    diffs = {"diff": {"a": {"name": {"expected": "b", "found": "a"}}, "b": {"name": {"expected": "c", "found": "b"}}}}
+
+    errors, _ = update_labels(repo, config, diffs)
+
+    assert errors == []
+    assert calls == ["rename b to c", "rename a to b"]
+    labels["a"].delete.assert_not_called()
@@ -0,0 +1,51 @@
+from unittest.mock import MagicMock
+
+from repo_manager.gh.labels import check_repo_labels, update_labels
+from repo_manager.gh.object_store import ObjectStore
+from repo_manager.schemas import Label
+
+
+def _repo(full_name="o/r"):
+    repo = MagicMock()
+    repo.full_name = full_name
+    return repo
+
+
+def test_complete_listing_knows_missing_keys_until_invalidated():
+    store = ObjectStore()
+    repo = _repo()
+    store.put_all(repo, "label", {"bug": "bug-label"})
+
+    assert store.lookup(repo, "label", "bug") == (True, "bug-label")
+    assert store.lookup(repo, "label", "docs") == (True, None)
+    assert store.lookup(_repo("o/other"), "label", "bug") == (False, None)
+
+    store.invalidate(repo, "label", "docs")
+    assert store.lookup(repo, "label", "docs") == (False, None)
+    store.put(repo, "label", "docs", "docs-label")
+    assert store.lookup(repo, "label", "docs") == (True, "docs-label")
+
+
+def test_get_fetches_once():
+    store = ObjectStore()
+    repo = _repo()
+    fetch = MagicMock(return_value="prod-env")
+
+    assert store.get(repo, "environment", "prod", fetch) == "prod-env"
+    assert store.get(repo, "environment", "prod", fetch) == "prod-env"
+    fetch.assert_called_once()
+
+
+def test_label_apply_reuses_the_labels_read_by_the_check():
+    old = MagicMock(color="ffffff", description="")
+    old.name = "old"
+    repo = _repo("o/labels-reuse")
+    repo.get_labels.return_value = [old]
+    config = [Label(name="old", new_name="new", color="ff00ff")]
+
+    _, diffs = check_repo_labels(repo, config)
+    errors, _ = update_labels(repo, config, diffs)
+
+    assert errors == []
+    old.edit.assert_called_once()
+    repo.get_label.assert_not_called()
@@ -0,0 +1,81 @@
+from base64 import b64decode
+from unittest.mock import MagicMock, patch
+
+from github.GithubException import GithubException
+from nacl.encoding import Base64Encoder
+from nacl.public import PrivateKey, SealedBox
+
+from repo_manager.gh import public_keys
+from repo_manager.gh.org_secrets import update_org_secrets
+from repo_manager.gh.public_keys import PublicKeyCache
+from repo_manager.gh.secrets import update_secrets
+from repo_manager.schemas.org_settings import OrgSecret
+from repo_manager.schemas.secret import Secret
+
+
+def _requester(keys):
+    """A requester serving one key pair per scope and recording every PUT"""
+    private = {url: PrivateKey.generate() for url in keys}
+    puts = {}
+
+    def request(verb, url, input=None):
+        if verb == "GET":
+            return {}, {"key_id": keys[url], "key": private[url].public_key.encode(Base64Encoder).decode()}
+        if verb == "PUT":
+            puts[url] = input
+        return {}, {}
+
+    requester = MagicMock()
+    requester.requestJsonAndCheck.side_effect = request
+    return requester, private, puts
+
+
+def test_repo_and_environment_secrets_fetch_each_key_once():
+    repo = MagicMock(full_name="o/r", id=7)
+    repo._requester, private, puts = _requester(
+        {"/repos/o/r/actions/secrets/public-key": "a", "/repositories/7/environments/prod/secrets/public-key": "e"}
+    )
+    secrets = [Secret(key=f"S{i}", value=f"v{i}") for i in range(5)]
+    secrets += [Secret(key=f"E{i}", value=f"e{i}", type="environments/prod") for i in range(5)]
+
+    with (
+        patch.object(public_keys, "_public_keys", PublicKeyCache()) as cache,
+        patch("repo_manager.gh.secrets.get_secret_fingerprints", return_value=None),
+    ):
+        errors, _ = update_secrets(repo, secrets, {"missing": [secret.key for secret in secrets]})
+
+    assert errors == []
+    assert cache.fetches == 2
+    assert len(puts) == 10
+    sealed = puts["/repositories/7/environments/prod/secrets/E3"]
+    assert sealed["key_id"] == "e"
+    box = SealedBox(private["/repositories/7/environments/prod/secrets/public-key"])
+    assert box.decrypt(b64decode(sealed["encrypted_value"])) == b"e3"
+
+
+def test_org_secrets_share_the_org_key_and_refetch_a_rotated_one():
+    org = MagicMock(login="o")
+    org._requester, private, puts = _requester({"/orgs/o/actions/secrets/public-key": "k"})
+    rejected = []
+    request = org._requester.requestJsonAndCheck.side_effect
+
+    def reject_first_put(verb, url, input=None):
+        if verb == "PUT" and not rejected:
+            rejected.append(url)
+            raise GithubException(422, {"message": "Bad key"}, None)
+        return request(verb, url, input)
+
+    org._requester.requestJsonAndCheck.side_effect = reject_first_put
+    secrets = [OrgSecret(key=f"S{i}", value=f"v{i}") for i in range(3)]
+
+    with patch.object(public_keys, "_public_keys", PublicKeyCache()) as cache:
+        errors, messages = update_org_secrets(
+            org, secrets, {"missing": [{"name": s.key, "type": "actions"} for s in secrets]}
+        )
+
+    assert errors == [] and len(messages) == 3
+    assert cache.fetches == 2
+    assert sorted(puts) == [f"/orgs/o/actions/secrets/S{i}" for i in range(3)]
+    assert puts["/orgs/o/actions/secrets/S0"]["visibility"] == "all"
+    box = SealedBox(private["/orgs/o/actions/secrets/public-key"])
+    assert [box.decrypt(b64decode(puts[url]["encrypted_value"])) for url in sorted(puts)] == [b"v0", b"v1", b"v2"]
@@ -0,0 +1,74 @@
+import json
+import time
+
+import requests
+
+from repo_manager.gh import rate_limit
+from repo_manager.gh.rate_limit import RateLimitScheduler, api_category
+
+
+def _response(status: int, body: str = "", **headers) -> requests.Response:
+    response = requests.Response()
+    response.status_code = status
+    response._content = body.encode()
+    response.headers.update(headers)
+    return response
+
+
+def test_retry_after_is_honoured(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(rate_limit.time, "sleep", sleeps.append)
+    responses = iter([_response(429, **{"Retry-After": "7"}), _response(200)])
+    scheduler = RateLimitScheduler()
+
+    with api_category("labels"):
+        response = scheduler.run("POST", "https://api.github.com/repos/o/r/labels", lambda: next(responses))
+
+    assert response.status_code == 200
+    assert len(sleeps) == 1 and 6 <= sleeps[0] <= 7
+    assert scheduler.usage["labels"] == {"reads": 0, "writes": 2, "not_modified": 0, "rate_limited": 1}
+
+
+def test_permission_errors_are_not_retried():
+    scheduler = RateLimitScheduler()
+    calls = []
+
+    def send():
+        calls.append(1)
+        return _response(
+            403, '{"message": "Resource not accessible by integration"}', **{"X-RateLimit-Remaining": "10"}
+        )
+
+    assert scheduler.run("GET", "https://api.github.com/repos/o/r", send).status_code == 403
+    assert len(calls) == 1
+
+
+def test_secondary_limit_without_retry_after_waits_a_minute():
+    response = _response(403, '{"message": "You have exceeded a secondary rate limit"}')
+
+    assert RateLimitScheduler._retry_delay(response) == 60
+
+
+def test_low_budget_is_spread_until_reset(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(rate_limit.time, "sleep", sleeps.append)
+    reset = str(int(time.time()) + 100)
+    scheduler = RateLimitScheduler()
+    low = _response(200, **{"X-RateLimit-Remaining": "10", "X-RateLimit-Limit": "5000", "X-RateLimit-Reset": reset})
+
+    scheduler.run("GET", "https://api.github.com/repos/o/r", lambda: low)
+    assert sleeps == []  # nothing known about the budget before the first response
+    scheduler.run("GET", "https://api.github.com/repos/o/r", lambda: low)
+
+    assert len(sleeps) == 1 and 9 <= sleeps[0] <= 10
+    assert scheduler.usage["other"]["reads"] == 2
+
+
+def test_graphql_mutations_take_write_slots():
+    scheduler = RateLimitScheduler()
+    url = "https://api.github.com/graphql"
+
+    scheduler.run("POST", url, lambda: _response(200), body=json.dumps({"query": "query { viewer { login } }"}))
+    scheduler.run("POST", url, lambda: _response(200), body=json.dumps({"query": "# add\n mutation { addStar }"}))
+
+    assert scheduler.usage["other"] == {"reads": 1, "writes": 1, "not_modified": 0, "rate_limited": 0}
@@ -0,0 +1,47 @@
+from unittest.mock import MagicMock
+
+from repo_manager.gh.repo_index import RepoIndex
+
+
+def _org(pages, login="acme"):
+    """An org whose /orgs/{org}/repos listing is served in ``pages``, linked with rel="next" """
+    org = MagicMock(login=login)
+
+    def request(verb, url, parameters=None, input=None):
+        if url.startswith("/repos/"):
+            return {}, {"id": 999}
+        page = int(url.rsplit("page=", 1)[1]) if "page=" in url else 0
+        link = (
+            f'<https://api.github.com/orgs/{login}/repos?page={page + 1}>; rel="next"' if page + 1 < len(pages) else ""
+        )
+        return {"link": link}, [{"name": name, "id": repo_id} for name, repo_id in pages[page].items()]
+
+    org._requester.requestJsonAndCheck.side_effect = request
+    return org
+
+
+def test_one_listing_serves_every_lookup(tmp_path):
+    org = _org([{"api": 1, "Web": 2}, {"docs": 3}])
+    index = RepoIndex(tmp_path)
+
+    assert index.resolve(org, ["api", "web", "acme/docs"]) == [1, 2, 3]
+    assert index.resolve(org, ["docs", "api"]) == [3, 1]
+    assert index.listings == 1 and index.lookups == 0
+    assert org._requester.requestJsonAndCheck.call_args_list[0].kwargs["parameters"]["per_page"] == 100
+
+    # another owner's repository is resolved on its own
+    assert index.resolve(org, ["other/tool"]) == [999]
+    assert index.lookups == 1
+
+
+def test_listing_is_reused_from_disk_until_a_name_is_missing(tmp_path):
+    RepoIndex(tmp_path).resolve(_org([{"api": 1}]), ["api"])
+
+    org = _org([{"api": 1, "new": 4}])
+    cached = RepoIndex(tmp_path)
+    assert cached.resolve(org, ["api"]) == [1]
+    assert cached.listings == 0
+    assert cached.resolve(org, ["new", "api"]) == [4, 1]
+    assert cached.listings == 1
+
+    assert RepoIndex(tmp_path, ttl=0).resolve(org, ["api"]) == [1]
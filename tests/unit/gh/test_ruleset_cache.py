@@ -0,0 +1,70 @@
+from unittest.mock import MagicMock, patch
+
+from repo_manager.gh.org_rulesets import check_org_rulesets
+from repo_manager.gh.ruleset_cache import RulesetCache
+from repo_manager.schemas.ruleset import Ruleset
+
+
+def _org(rulesets):
+    """An org serving ``rulesets`` (id -> body) from its listing and detail endpoints"""
+    org = MagicMock(login="acme", url="https://api.github.com/orgs/acme")
+
+    def request(verb, url):
+        if url.endswith("/rulesets"):
+            return {}, [{k: body[k] for k in ("id", "name", "updated_at")} for body in rulesets.values()]
+        return {}, rulesets[int(url.rsplit("/", 1)[1])]
+
+    org._requester.requestJsonAndCheck.side_effect = request
+    return org
+
+
+def _body(ruleset_id, name, updated_at, enforcement="active"):
+    return {
+        "id": ruleset_id,
+        "name": name,
+        "updated_at": updated_at,
+        "target": "branch",
+        "enforcement": enforcement,
+        "rules": [{"type": "deletion"}],
+    }
+
+
+def _detail_gets(org):
+    return [c.args[1] for c in org._requester.requestJsonAndCheck.call_args_list if not c.args[1].endswith("/rulesets")]
+
+
+def test_bodies_are_refetched_only_when_updated_at_moves(tmp_path):
+    config = [
+        Ruleset(name=name, target="branch", enforcement="active", rules=[{"type": "deletion"}]) for name in ("a", "b")
+    ]
+    rulesets = {1: _body(1, "a", "2026-01-01T00:00:00Z"), 2: _body(2, "b", "2026-01-01T00:00:00Z")}
+
+    org = _org(rulesets)
+    with patch("repo_manager.gh.org_rulesets.get_ruleset_cache", return_value=RulesetCache(tmp_path)):
+        assert check_org_rulesets(org, config) == (True, None)
+    assert len(_detail_gets(org)) == 2
+
+    # a later run: only the ruleset that changed is fetched, the other comes from cache_dir
+    rulesets[2] = _body(2, "b", "2026-02-01T00:00:00Z", enforcement="disabled")
+    org = _org(rulesets)
+    cache = RulesetCache(tmp_path)
+    with patch("repo_manager.gh.org_rulesets.get_ruleset_cache", return_value=cache):
+        success, diff = check_org_rulesets(org, config)
+    assert _detail_gets(org) == ["https://api.github.com/orgs/acme/rulesets/2"]
+    assert cache.hits == 1 and cache.fetches == 1
+    assert success is False and list(diff["diff"]) == ["b"]
+    assert diff["diff"]["b"]["enforcement"] == {"expected": "active", "found": "disabled"}
+
+
+def test_bodies_on_disk_are_not_shared_between_identities(tmp_path):
+    config = [Ruleset(name="a", target="branch", enforcement="active", rules=[{"type": "deletion"}])]
+    rulesets = {1: _body(1, "a", "2026-01-01T00:00:00Z")}
+
+    with patch("repo_manager.gh.org_rulesets.get_ruleset_cache", return_value=RulesetCache(tmp_path, "admin")):
+        assert check_org_rulesets(_org(rulesets), config) == (True, None)
+
+    # another token may not see the same fields, so it fetches the body itself
+    org = _org(rulesets)
+    with patch("repo_manager.gh.org_rulesets.get_ruleset_cache", return_value=RulesetCache(tmp_path, "reader")):
+        assert check_org_rulesets(org, config) == (True, None)
+    assert _detail_gets(org) == ["https://api.github.com/orgs/acme/rulesets/1"]
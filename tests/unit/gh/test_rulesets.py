@@ -0,0 +1,57 @@
+from repo_manager.gh.rulesets import _canonical_hash, _canonical_ruleset, _diff_ruleset, _ruleset_to_api_payload
+from repo_manager.schemas.ruleset import Ruleset
+
+
+def _config():
+    return Ruleset(
+        name="main",
+        target="branch",
+        enforcement="active",
+        conditions={"ref_name": {"include": ["refs/heads/main"], "exclude": []}},
+        bypass_actors=[{"actor_id": 1, "actor_type": "OrganizationAdmin", "bypass_mode": "always"}],
+        rules=[
+            {"type": "deletion"},
+            {"type": "required_status_checks", "parameters": {"required_status_checks": [{"context": "ci"}]}},
+        ],
+    )
+
+
+def _actual(checks):
+    return {
+        "id": 4,
+        "name": "main",
+        "target": "branch",
+        "enforcement": "active",
+        "updated_at": "2026-01-01T00:00:00Z",
+        "conditions": {
+            "ref_name": {"include": ["refs/heads/**/main"], "exclude": []},
+            "repository_name": {"include": ["~ALL"], "exclude": []},
+        },
+        "bypass_actors": [{"actor_id": None, "actor_type": "OrganizationAdmin", "bypass_mode": "always"}],
+        "rules": [
+            {"type": "code_quality"},
+            {
+                "type": "required_status_checks",
+                "parameters": {"required_status_checks": checks, "strict_required_status_checks_policy": False},
+            },
+            {"type": "deletion"},
+        ],
+    }
+
+
+def test_github_normalisation_hashes_equal_to_the_config():
+    config = _config()
+    actual = _actual([{"context": "ci", "integration_id": None}])
+    payload = _ruleset_to_api_payload(config)
+
+    assert _canonical_hash(_canonical_ruleset(payload)) == _canonical_hash(_canonical_ruleset(payload, actual))
+    assert _diff_ruleset(config, actual) == {}
+
+
+def test_a_changed_rule_is_diffed_by_key():
+    actual = _actual([{"context": "lint"}])
+
+    diffs = _diff_ruleset(_config(), actual)
+
+    assert list(diffs) == ["rules"]
+    assert diffs["rules"]["found"] == actual["rules"]
@@ -0,0 +1,76 @@
+from unittest.mock import MagicMock
+
+from github.GithubException import UnknownObjectException
+from nacl.encoding import Base64Encoder
+from nacl.public import PrivateKey
+
+from repo_manager.gh import secret_fingerprints
+from repo_manager.gh.secret_fingerprints import FINGERPRINT_VARIABLE, SecretFingerprintStore
+from repo_manager.gh.secrets import check_repo_secrets, update_secrets
+from repo_manager.schemas.secret import Secret
+
+
+def _repo(full_name="o/r"):
+    repo = MagicMock()
+    repo.full_name = full_name
+    return repo
+
+
+def test_fingerprints_round_trip_through_the_state_file(tmp_path):
+    state = tmp_path / "state" / "fingerprints.json"
+    store = SecretFingerprintStore("key", state)
+    repo = _repo()
+    store.record(repo, "actions", "TOKEN", "s3cret", "2026-01-01T00:00:00Z")
+    store.save(repo)
+
+    assert "s3cret" not in state.read_text()
+    again = SecretFingerprintStore("key", state)
+    assert again.matches(repo, "actions", "TOKEN", "s3cret", "2026-01-01T00:00:00Z")
+    assert not again.matches(repo, "actions", "TOKEN", "changed", "2026-01-01T00:00:00Z")
+    assert not again.matches(repo, "actions", "TOKEN", "s3cret", "2026-02-01T00:00:00Z")
+    assert not again.matches(repo, "dependabot", "TOKEN", "s3cret", "2026-01-01T00:00:00Z")
+    assert not SecretFingerprintStore("other-key", state).matches(
+        repo, "actions", "TOKEN", "s3cret", "2026-01-01T00:00:00Z"
+    )
+
+
+def test_unchanged_secrets_are_not_drift_and_writes_are_fingerprinted():
+    store = SecretFingerprintStore("key")
+    secret_fingerprints.configure_secret_fingerprints(store)
+    try:
+        repo = _repo()
+        repo._requester.auth = None
+        listed = {"SAME": "2026-01-01T00:00:00Z", "NEW_VALUE": "2026-01-01T00:00:00Z"}
+        repo.get_secrets.return_value = [MagicMock(updated_at=at) for at in listed.values()]
+        for listing, name in zip(repo.get_secrets.return_value, listed):
+            listing.name = name
+        stored = {"SAME": "v1", "NEW_VALUE": "old"}
+        store._records["o/r"] = {
+            f"actions/{name}": {"hmac": store.fingerprint("actions", name, value), "updated_at": listed[name]}
+            for name, value in stored.items()
+        }
+        secrets = [Secret(key="SAME", value="v1"), Secret(key="NEW_VALUE", value="v2")]
+
+        assert check_repo_secrets(repo, secrets) == (False, {"diff": ["NEW_VALUE"]})
+
+        key = PrivateKey.generate().public_key.encode(Base64Encoder).decode()
+
+        def request(verb, url, input=None):
+            if verb == "GET" and url.endswith(f"/{FINGERPRINT_VARIABLE}"):
+                raise UnknownObjectException(404, None, None)
+            if url.endswith("/public-key"):
+                return {}, {"key_id": "k1", "key": key}
+            return {}, {"updated_at": "2026-03-01T00:00:00Z"}
+
+        repo._requester.requestJsonAndCheck.side_effect = request
+        assert update_secrets(repo, secrets, {"diff": ["NEW_VALUE"]}) == ([], [])
+        assert [c.args for c in repo._requester.requestJsonAndCheck.call_args_list if c.args[0] == "PUT"] == [
+            ("PUT", "/repos/o/r/actions/secrets/NEW_VALUE")
+        ]
+        assert store.matches(repo, "actions", "NEW_VALUE", "v2", "2026-03-01T00:00:00Z")
+        verb, url = repo._requester.requestJsonAndCheck.call_args.args
+        assert (verb, url) == ("POST", "/repos/o/r/actions/variables")
+        assert "v2" not in repo._requester.requestJsonAndCheck.call_args.kwargs["input"]["value"]
+    finally:
+        secret_fingerprints.configure_secret_fingerprints(None)
+        secret_fingerprints._configured = False
@@ -0,0 +1,95 @@
+from unittest.mock import MagicMock
+
+from repo_manager.gh import settings as settings_module
+from repo_manager.gh.settings import check_repo_settings, scan_repo_settings, update_settings
+from repo_manager.schemas.settings import Settings
+
+
+def _repo(requester, name, owner="scanned"):
+    repo = MagicMock(full_name=f"{owner}/{name}", url=f"https://api.github.com/repos/{owner}/{name}")
+    repo.owner.login = owner
+    repo._requester = requester
+    return repo
+
+
+def test_fleet_settings_are_checked_from_the_owner_listing(monkeypatch):
+    requester = MagicMock()
+    rows = [
+        {"full_name": "scanned/api", "description": "API", "topics": ["svc"], "allow_squash_merge": True},
+        {"full_name": "scanned/web", "description": "Old", "topics": []},
+    ]
+    # the listing get_fleet_repos fetched to expand the targets
+    get_owner_repos = MagicMock(return_value=[MagicMock(full_name=row["full_name"], _rawData=row) for row in rows])
+    monkeypatch.setattr(settings_module, "get_owner_repos", get_owner_repos)
+    requester.requestJson.side_effect = lambda verb, url: (204 if "/api/" in url else 404, {}, None)
+    api, web = _repo(requester, "api"), _repo(requester, "web")
+
+    settings = Settings(description="API", topics=["svc"], enable_vulnerability_alerts=True)
+    assert scan_repo_settings([api, web], settings) == []
+    get_owner_repos.assert_called_once_with("scanned")
+
+    assert check_repo_settings(api, settings) == (True, None)
+    assert check_repo_settings(web, settings) == (
+        False,
+        {
+            "description": {"expected": "API", "found": "Old"},
+            "topics": {"expected": ["svc"], "found": []},
+            "enable_vulnerability_alerts": {"expected": True, "found": False},
+        },
+    )
+    # no request of its own, only the vulnerability alerts the listing lacks
+    requester.requestJsonAndCheck.assert_not_called()
+    assert [c.args[1] for c in requester.requestJson.call_args_list] == [
+        f"{api.url}/vulnerability-alerts",
+        f"{web.url}/vulnerability-alerts",
+    ]
+    api.get_topics.assert_not_called()
+
+    # a setting missing from a listed repository leaves it to the snapshot
+    assert scan_repo_settings([api, web], Settings(allow_squash_merge=True)) == [web]
+
+
+def test_only_drifted_settings_are_written():
+    repo = MagicMock()
+    settings = Settings(
+        description="API",
+        topics=["svc"],
+        has_wiki=False,
+        enable_vulnerability_alerts=True,
+        enable_automated_security_fixes=True,
+    )
+    diffs = {"description": {"expected": "API", "found": "Old"}}
+
+    assert update_settings(repo, settings, diffs) == ([], ["edit: description"])
+    repo.edit.assert_called_once_with(name=None, description="API")
+    repo.replace_topics.assert_not_called()
+    repo.enable_vulnerability_alert.assert_not_called()
+    repo.enable_automated_security_fixes.assert_not_called()
+
+    repo.reset_mock()
+    diffs = {
+        "topics": {"expected": ["svc"], "found": []},
+        "enable_vulnerability_alerts": {"expected": True, "found": False},
+    }
+    assert update_settings(repo, settings, diffs) == ([], ["topics: ['svc']", "enable_vulnerability_alerts: True"])
+    repo.edit.assert_not_called()
+    repo.replace_topics.assert_called_once_with(["svc"])
+    repo.enable_vulnerability_alert.assert_called_once_with()
+
+
+def test_vulnerability_alerts_are_enabled_before_automated_security_fixes():
+    repo = MagicMock()
+    settings = Settings(enable_vulnerability_alerts=True, enable_automated_security_fixes=True)
+    diffs = {
+        "enable_automated_security_fixes": {"expected": True, "found": False},
+        "enable_vulnerability_alerts": {"expected": True, "found": False},
+    }
+
+    assert update_settings(repo, settings, diffs) == (
+        [],
+        ["enable_vulnerability_alerts: True", "enable_automated_security_fixes: True"],
+    )
+    assert [name for name, *_ in repo.method_calls] == [
+        "enable_vulnerability_alert",
+        "enable_automated_security_fixes",
+    ]
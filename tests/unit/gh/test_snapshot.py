@@ -0,0 +1,131 @@
+from unittest.mock import MagicMock
+
+from repo_manager.gh import snapshot
+from repo_manager.gh.snapshot import get_snapshot, prefetch_snapshots
+
+
+def _repo(full_name):
+    repo = MagicMock()
+    repo.full_name = full_name
+    repo.owner.login, repo.name = full_name.split("/")
+    repo.url = f"https://api.github.com/repos/{full_name}"
+    repo._requester.base_url = "https://api.github.com"
+    repo._requester.is_not_lazy = True
+    return repo
+
+
+def _repo_data(**overrides):
+    data = {
+        "nameWithOwner": "o/r",
+        "description": "desc",
+        "homepageUrl": None,
+        "isPrivate": True,
+        "hasIssuesEnabled": True,
+        "hasProjectsEnabled": False,
+        "hasWikiEnabled": False,
+        "squashMergeAllowed": True,
+        "mergeCommitAllowed": False,
+        "rebaseMergeAllowed": False,
+        "deleteBranchOnMerge": True,
+        "defaultBranchRef": {"name": "main"},
+        "repositoryTopics": {"nodes": [{"topic": {"name": "python"}}]},
+        "labels": {
+            "pageInfo": {"hasNextPage": False, "endCursor": None},
+            "nodes": [{"name": "bug", "color": "d73a4a", "description": "Something isn't working"}],
+        },
+        "collaborators": {
+            "pageInfo": {"hasNextPage": False, "endCursor": None},
+            "edges": [{"permission": "WRITE", "node": {"login": "octocat"}}],
+        },
+        "environments": {"pageInfo": {"hasNextPage": False, "endCursor": None}, "nodes": [{"name": "prod"}]},
+    }
+    data.update(overrides)
+    return data
+
+
+def test_one_query_per_batch_builds_rest_shaped_objects(monkeypatch):
+    monkeypatch.setattr(snapshot, "_snapshots", {})
+    repos = [_repo("o/a"), _repo("o/b")]
+    requester = repos[0]._requester
+    requester.requestJsonAndCheck.return_value = ({}, {"data": {"r0": _repo_data(), "r1": _repo_data()}})
+
+    prefetch_snapshots(repos)
+
+    assert requester.requestJsonAndCheck.call_count == 1
+    found = get_snapshot(repos[1])
+    assert found.settings["default_branch"] == "main"
+    assert found.settings["topics"] == ["python"]
+    assert [(label.name, label.color) for label in found.labels] == [("bug", "d73a4a")]
+    user = found.collaborators[0]
+    assert user.login == "octocat"
+    assert (user.permissions.push, user.permissions.admin) == (True, False)
+    assert found.environment_names == {"prod"}
+
+
+def test_sections_with_errors_fall_back_to_rest(monkeypatch):
+    monkeypatch.setattr(snapshot, "_snapshots", {})
+    repo = _repo("o/a")
+    repo._requester.requestJsonAndCheck.return_value = (
+        {},
+        {
+            "data": {"r0": _repo_data(collaborators=None)},
+            "errors": [{"path": ["r0", "collaborators"], "message": "Must have push access"}],
+        },
+    )
+
+    prefetch_snapshots([repo])
+
+    found = get_snapshot(repo)
+    assert found.collaborators is None
+    assert found.settings is not None and found.labels is not None
+
+
+def test_configured_branches_and_protections_are_read_in_the_same_query(monkeypatch):
+    monkeypatch.setattr(snapshot, "_snapshots", {})
+    repo = _repo("o/a")
+    rule = {
+        "requiresApprovingReviews": True,
+        "requiredApprovingReviewCount": 2,
+        "dismissesStaleReviews": True,
+        "requiresCodeOwnerReviews": False,
+        "restrictsReviewDismissals": True,
+        "reviewDismissalAllowances": {
+            "nodes": [
+                {"actor": {"__typename": "User", "login": "octocat", "name": "The Octocat"}},
+                {"actor": {"__typename": "Team", "slug": "admins", "name": "Admins"}},
+            ]
+        },
+        "requiresStatusChecks": True,
+        "requiresStrictStatusChecks": False,
+        "requiredStatusCheckContexts": ["test", "lint"],
+        "isAdminEnforced": True,
+        "requiresLinearHistory": False,
+        "allowsForcePushes": False,
+        "allowsDeletions": False,
+        "requiresConversationResolution": True,
+        "requiresCommitSignatures": False,
+    }
+    data = _repo_data(
+        branch0={"name": "main", "branchProtectionRule": rule},
+        branch1={"name": "dev", "branchProtectionRule": None},
+        branch2=None,
+    )
+    repo._requester.requestJsonAndCheck.return_value = ({}, {"data": {"r0": data}})
+
+    prefetch_snapshots([repo], ["main", "dev", "gone"])
+
+    _, kwargs = repo._requester.requestJsonAndCheck.call_args
+    assert kwargs["input"]["variables"]["branch1"] == "refs/heads/dev"
+    found = get_snapshot(repo)
+    assert found.branches["gone"] is None
+    assert (found.branches["main"].protected, found.branches["dev"].protected) == (True, False)
+    assert found.branches["main"].protection_url == "https://api.github.com/repos/o/a/branches/main/protection"
+    protection = found.branch_protections["main"]
+    assert protection.enforce_admins is True
+    assert protection.required_conversation_resolution is True
+    assert protection.required_pull_request_reviews.required_approving_review_count == 2
+    assert [user.name for user in protection.required_pull_request_reviews.dismissal_users] == ["The Octocat"]
+    assert [team.slug for team in protection.required_pull_request_reviews.dismissal_teams] == ["admins"]
+    assert protection.required_status_checks.contexts == ["test", "lint"]
+    assert "dev" not in found.branch_protections
+    repo._requester.requestJsonAndCheck.assert_called_once()
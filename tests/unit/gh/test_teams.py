@@ -0,0 +1,147 @@
+from unittest.mock import MagicMock
+
+from repo_manager.gh.teams import _sync_members, check_teams, update_teams
+from repo_manager.schemas.team import Team, TeamMember, TeamRepository
+
+
+def _page(edges, cursor=None):
+    return {"pageInfo": {"hasNextPage": cursor is not None, "endCursor": cursor}, "edges": edges}
+
+
+def _org(login="acme"):
+    """An org whose teams are served from GraphQL: core (members over two pages) and docs (second teams page)"""
+    core = {
+        "databaseId": 1,
+        "slug": "core",
+        "name": "Core",
+        "description": "Core team",
+        "privacy": "VISIBLE",
+        "parentTeam": None,
+        "members": _page([{"role": "MAINTAINER", "node": {"login": "alice"}}], cursor="m1"),
+        "repositories": _page([{"permission": "WRITE", "node": {"nameWithOwner": "acme/api"}}]),
+    }
+    docs = {
+        "databaseId": 2,
+        "slug": "docs",
+        "name": "Docs",
+        "description": None,
+        "privacy": "SECRET",
+        "parentTeam": {"slug": "core"},
+        "members": _page([]),
+        "repositories": _page([{"permission": "READ", "node": {"nameWithOwner": "acme/site"}}]),
+    }
+    org = MagicMock(login=login)
+    org._requester.graphql_url = "https://api.github.com/graphql"
+
+    def request(verb, url, parameters=None, input=None):
+        query, variables = input["query"], input["variables"]
+        if "team(slug: $slug)" in query:
+            assert variables == {"org": login, "slug": "core", "after": "m1"}
+            members = _page([{"role": "MEMBER", "node": {"login": "bob"}}])
+            return {}, {"data": {"organization": {"team": {"members": members}}}}
+        if "teams(" in query:
+            nodes, cursor = ([core], "t1") if variables["after"] is None else ([docs], None)
+            teams = {"pageInfo": {"hasNextPage": cursor is not None, "endCursor": cursor}, "nodes": nodes}
+            return {}, {"data": {"organization": {"teams": teams}}}
+        users = {
+            f"user{var[5:]}": None if value == "ghost" else {"login": value, "databaseId": 100 + int(var[5:])}
+            for var, value in variables.items()
+        }
+        return {}, {"data": users, "errors": [{"type": "NOT_FOUND"}] if None in users.values() else None}
+
+    org._requester.requestJsonAndCheck.side_effect = request
+    return org
+
+
+def test_every_team_is_diffed_against_the_matrix():
+    org = _org()
+    config = [
+        Team(
+            name="Core",
+            description="Core team",
+            members=[TeamMember(username="alice", role="maintainer"), TeamMember(username="bob", role="maintainer")],
+            repositories=[TeamRepository(name="api", permission="push"), TeamRepository(name="web")],
+        ),
+        Team(
+            name="Docs",
+            privacy="secret",
+            parent_team_slug="core",
+            repositories=[TeamRepository(name="site", permission="triage")],
+        ),
+        Team(name="New"),
+    ]
+
+    assert check_teams(org, config) == (
+        False,
+        {
+            "missing": ["New"],
+            "diff": {
+                "Core": {
+                    "members": {"wrong_role": {"bob": {"expected": "maintainer", "found": "member"}}},
+                    "repositories": {"missing": ["acme/web"]},
+                    "_slug": "core",
+                },
+                "Docs": {
+                    "repositories": {"wrong_permission": {"acme/site": {"expected": "triage", "found": "pull"}}},
+                    "_slug": "docs",
+                },
+            },
+        },
+    )
+    # two team pages and one extra members page, no per-team REST listings
+    assert org._requester.requestJsonAndCheck.call_count == 3
+    org.get_teams.assert_not_called()
+
+
+def test_members_are_resolved_in_one_query():
+    org = _org()
+    team = MagicMock()
+    team.name = "Core"
+    errors = []
+    members = [
+        TeamMember(username="alice", role="maintainer"),
+        TeamMember(username="ghost"),
+        TeamMember(username="bob"),
+    ]
+
+    _sync_members(org, team, members, errors)
+
+    assert org._requester.requestJsonAndCheck.call_count == 1
+    assert [(c.args[0].login, c.kwargs["role"]) for c in team.add_membership.call_args_list] == [
+        ("alice", "maintainer"),
+        ("bob", "member"),
+    ]
+    assert errors == [{"type": "team-member-sync", "team": "Core", "member": "ghost", "error": "User not found"}]
+
+
+def test_new_hierarchy_is_created_level_by_level():
+    org = MagicMock(login="newco")
+    org.get_team_by_slug.return_value = MagicMock(id=1)
+    created = {}
+
+    def create_team(name, privacy, parent_team_id=None):
+        team = MagicMock(id=100 + len(created), slug=name.lower())
+        team.name = name
+        created[name] = (team.id, parent_team_id)
+        return team
+
+    org.create_team.side_effect = create_team
+    config = [
+        Team(name="Leaf", parent_team_slug="mid", repositories=[TeamRepository(name="api")]),
+        Team(name="Mid", parent_team_slug="top"),
+        Team(name="Top", parent_team_slug="core"),
+        Team(name="Sibling", parent_team_slug="core"),
+        Team(name="Loop", parent_team_slug="loop"),
+    ]
+
+    errors, messages = update_teams(org, config, {"missing": [t.name for t in config]})
+
+    assert [c.kwargs["name"] for c in org.create_team.call_args_list][2:] == ["Mid", "Leaf"]
+    assert created["Top"][1] == created["Sibling"][1] == 1
+    assert created["Mid"][1] == created["Top"][0]
+    assert created["Leaf"][1] == created["Mid"][0]
+    # the existing parent is fetched once; the created ones come from the ID cache
+    org.get_team_by_slug.assert_called_once_with("core")
+    assert errors == [{"type": "team-create", "name": "Loop", "error": "Parent team 'loop' is part of a cycle"}]
+    assert messages == [f"Created team '{name}'" for name in ("Top", "Sibling", "Mid", "Leaf")]
+    assert org._requester.requestJsonAndCheck.call_args.args == ("PUT", f"{org.url}/teams/leaf/repos/newco/api")
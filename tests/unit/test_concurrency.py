@@ -0,0 +1,35 @@
+import time
+
+from repo_manager.utils.concurrency import run_concurrently
+
+
+def test_results_keep_task_order():
+    def task(i):
+        def _run():
+            time.sleep(0.01 * (5 - i))  # later tasks finish first
+            return i
+
+        return _run
+
+    outcomes = run_concurrently([task(i) for i in range(5)], max_workers=5)
+
+    assert [result for result, _ in outcomes] == [0, 1, 2, 3, 4]
+    assert all(exc is None for _, exc in outcomes)
+
+
+def test_exceptions_are_returned_not_raised():
+    def boom():
+        raise ValueError("boom")
+
+    outcomes = run_concurrently([lambda: 1, boom, lambda: 3], max_workers=3)
+
+    assert outcomes[0] == (1, None)
+    assert outcomes[1][0] is None
+    assert isinstance(outcomes[1][1], ValueError)
+    assert outcomes[2] == (3, None)
+
+
+def test_single_worker_runs_inline():
+    outcomes = run_concurrently([lambda: "a", lambda: "b"], max_workers=1)
+
+    assert outcomes == [("a", None), ("b", None)]
@@ -0,0 +1,35 @@
+from unittest.mock import MagicMock
+
+import repo_manager.utils as utils
+from repo_manager.utils import __parse_targets__, get_fleet_repos
+
+
+def _repo(full_name, archived=False):
+    repo = MagicMock()
+    repo.full_name = full_name
+    repo.name = full_name.split("/")[1]
+    repo.archived = archived
+    return repo
+
+
+def test_parse_targets_skips_comments_and_blanks():
+    targets = "my-org/website\n\n  my-org/api-*   # all apis\n# my-org/*\n"
+
+    assert __parse_targets__(targets) == ["my-org/website", "my-org/api-*"]
+
+
+def test_fleet_repos_expand_globs_from_one_listing(monkeypatch):
+    listing = [_repo("my-org/api-users"), _repo("my-org/api-old", archived=True), _repo("my-org/website")]
+    client = MagicMock()
+    client.get_organization.return_value.get_repos.return_value = listing
+    client.get_repo.side_effect = lambda name: _repo(name)
+    monkeypatch.setattr(utils, "client", client, raising=False)
+    monkeypatch.setattr(utils, "_owner_repos", {})
+
+    repos = get_fleet_repos(["my-org/api-*", "my-org/a*", "my-org/api-users", "other/tool"])
+
+    assert [repo.full_name for repo in repos] == ["my-org/api-users", "other/tool"]
+    # later readers of the owner's listing (the settings scan) share it
+    assert utils.get_owner_repos("My-Org") == listing
+    client.get_organization.assert_called_once_with("my-org")
+    client.get_repo.assert_called_once_with("other/tool")